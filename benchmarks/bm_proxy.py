@@ -0,0 +1,155 @@
+##############################################################################
+#
+# Copyright (c) 2026 Zope Foundation and Contributors.
+# All Rights Reserved.
+#
+# This software is subject to the provisions of the Zope Public License,
+# Version 2.1 (ZPL).  A copy of the ZPL should accompany this distribution.
+# THIS SOFTWARE IS PROVIDED "AS IS" AND ANY AND ALL EXPRESS OR IMPLIED
+# WARRANTIES ARE DISCLAIMED, INCLUDING, BUT NOT LIMITED TO, THE IMPLIED
+# WARRANTIES OF TITLE, MERCHANTABILITY, AGAINST INFRINGEMENT, AND FITNESS
+# FOR A PARTICULAR PURPOSE.
+#
+##############################################################################
+"""Benchmarks for the overhead of proxies.
+
+Every operation is timed on an unproxied object (``object``) and through
+``ProxyBase``, ``PyProxyBase`` and ``SpecificationDecoratorBase``, so the
+results can be compared with the baseline and with each other.
+
+Run them with ``tox -e benchmark`` or directly; all arguments are passed
+on to pyperf::
+
+    $ python benchmarks/bm_proxy.py --fast -o before.json
+    $ python benchmarks/bm_proxy.py --fast -o after.json
+    $ python -m pyperf compare_to before.json after.json --table
+
+``--impl`` and ``--op`` (both repeatable) restrict the run to some
+implementations or operations.
+"""
+import pyperf
+from zope.interface import providedBy
+
+import zope.proxy
+from zope.proxy.decorator import SpecificationDecoratorBase
+
+
+class Sample:
+
+    attr = 1
+
+    def method(self):
+        return 1
+
+
+def function(*args, **kw):
+    return 1
+
+
+def _noproxy(obj):
+    return obj
+
+
+#: name -> (wrapper, isProxy, queryInnerProxy, removeAllProxies)
+IMPLEMENTATIONS = {
+    'object': (
+        _noproxy,
+        zope.proxy.isProxy,
+        zope.proxy.queryInnerProxy,
+        zope.proxy.removeAllProxies,
+    ),
+    'ProxyBase': (
+        zope.proxy.ProxyBase,
+        zope.proxy.isProxy,
+        zope.proxy.queryInnerProxy,
+        zope.proxy.removeAllProxies,
+    ),
+    'PyProxyBase': (
+        zope.proxy.PyProxyBase,
+        zope.proxy.py_isProxy,
+        zope.proxy.py_queryInnerProxy,
+        zope.proxy.py_removeAllProxies,
+    ),
+    'SpecificationDecoratorBase': (
+        SpecificationDecoratorBase,
+        zope.proxy.isProxy,
+        zope.proxy.queryInnerProxy,
+        zope.proxy.removeAllProxies,
+    ),
+}
+
+#: (name, setup, statement); ``wrap`` is the implementation under test.
+OPERATIONS = [
+    ('getattr', 'obj = wrap(Sample())', 'obj.attr'),
+    ('setattr', 'obj = wrap(Sample())', 'obj.attr = 2'),
+    ('method', 'obj = wrap(Sample())', 'obj.method()'),
+    ('call', 'obj = wrap(function)', 'obj()'),
+    ('call_args', 'obj = wrap(function)', 'obj(1, 2, key=3)'),
+    ('eq', 'obj = wrap(1)', 'obj == 1'),
+    ('lt', 'obj = wrap(1)', 'obj < 2'),
+    ('hash', 'obj = wrap("key")', 'hash(obj)'),
+    ('bool', 'obj = wrap(1)', 'bool(obj)'),
+    ('iter', 'obj = wrap(list(range(10)))', 'for x in obj: pass'),
+    ('next', 'obj = wrap(itertools.repeat(1))', 'next(obj)'),
+    ('add', 'obj = wrap(1)', 'obj + 1'),
+    ('radd', 'obj = wrap(1)', '1 + obj'),
+    ('mul', 'obj = wrap(2.0)', 'obj * 3'),
+    ('iadd', 'obj = wrap([])', 'obj += ()'),
+    ('len', 'obj = wrap([1, 2, 3])', 'len(obj)'),
+    ('getitem', 'obj = wrap([1, 2, 3])', 'obj[1]'),
+    ('bisect', 'obj = wrap(list(range(100)))', 'bisect.bisect(obj, 50)'),
+    ('getitem_dict', 'obj = wrap({"key": 1})', 'obj["key"]'),
+    ('contains', 'obj = wrap([1, 2, 3])', '3 in obj'),
+    ('providedBy', 'obj = wrap(Sample())', 'providedBy(obj)'),
+    ('isProxy', 'obj = wrap(Sample())', 'isProxy(obj)'),
+    ('queryInnerProxy', 'obj = wrap(Sample())', 'queryInnerProxy(obj)'),
+    ('removeAllProxies', 'obj = wrap(Sample())', 'removeAllProxies(obj)'),
+    ('create', 'sample = Sample()', 'wrap(sample)'),
+]
+
+
+def add_cmdline_args(cmd, args):
+    for impl in args.impl or ():
+        cmd.extend(('--impl', impl))
+    for op in args.op or ():
+        cmd.extend(('--op', op))
+
+
+def main():
+    runner = pyperf.Runner(add_cmdline_args=add_cmdline_args)
+    runner.argparser.add_argument(
+        '--impl', action='append', choices=sorted(IMPLEMENTATIONS),
+        help='only benchmark this implementation (repeatable)')
+    runner.argparser.add_argument(
+        '--op', action='append',
+        choices=sorted(name for name, _, _ in OPERATIONS),
+        help='only benchmark this operation (repeatable)')
+    args = runner.parse_args()
+
+    runner.metadata['zope.proxy C extension'] = str(
+        zope.proxy.ProxyBase is not zope.proxy.PyProxyBase)
+
+    for op, setup, stmt in OPERATIONS:
+        if args.op and op not in args.op:
+            continue
+        for impl, helpers in IMPLEMENTATIONS.items():
+            if args.impl and impl not in args.impl:
+                continue
+            wrap, isProxy, queryInnerProxy, removeAllProxies = helpers
+            runner.timeit(
+                f'{op} [{impl}]',
+                stmt=stmt,
+                setup='import bisect\nimport itertools\n' + setup,
+                globals={
+                    'Sample': Sample,
+                    'function': function,
+                    'providedBy': providedBy,
+                    'wrap': wrap,
+                    'isProxy': isProxy,
+                    'queryInnerProxy': queryInnerProxy,
+                    'removeAllProxies': removeAllProxies,
+                })
+
+
+if __name__ == '__main__':
+    main()
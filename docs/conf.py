@@ -26,6 +26,16 @@ extensions = [
 templates_path = ['_templates']
 exclude_patterns = []
 
+# Used by ``:skipif:`` options of doctests; Python classes can only
+# provide buffers as of Python 3.12 (PEP 688).
+doctest_global_setup = '''
+import sys
+import zope.proxy
+buffers_forwarded = (
+    sys.version_info >= (3, 12)
+    or zope.proxy.BufferProxyBase is not zope.proxy.PyBufferProxyBase)
+'''
+
 
 # -- Options for HTML output -------------------------------------------------
 # https://www.sphinx-doc.org/en/master/usage/configuration.html#options-for-html-output
@@ -13,9 +13,15 @@
 ##############################################################################
 """More convenience functions for dealing with proxies.
 """
+import collections
+import functools
+import itertools
 import operator
 import os
 import pickle
+import threading
+import time
+import weakref
 
 from zope.interface import moduleProvides
 
@@ -36,21 +42,120 @@ def ProxyIterator(p):
 _MARKER = object()
 
 
-def _WrapperType_Lookup(type_, name):
+def _WrapperType_FindIndexInMRO(type_, name):
     """
     Looks up information in class dictionaries in MRO
     order, ignoring the proxy type itself.
 
-    Returns the first found object, or _MARKER
+    Returns the index in the MRO of the first class that has it,
+    or -1
     """
-
-    for base in type_.mro():
+    for index, base in enumerate(type_.__mro__):
         if base is AbstractPyProxyBase:
             continue
-        res = base.__dict__.get(name, _MARKER)
-        if res is not _MARKER:
-            return res
-    return _MARKER
+        if name in base.__dict__:
+            return index
+    return -1
+
+
+def _WrapperType_FindInMRO(type_, name):
+    """
+    Looks up information in class dictionaries in MRO
+    order, ignoring the proxy type itself.
+
+    Returns the first found object, or _MARKER
+    """
+    index = _WrapperType_FindIndexInMRO(type_, name)
+    if index < 0:
+        return _MARKER
+    return type_.__mro__[index].__dict__[name]
+
+
+# Each proxy class lazily gets its own ``{name: index}`` cache of
+# _WrapperType_FindIndexInMRO results.  The caches are kept outside
+# of the classes, so that they can't hide attributes of the proxied
+# objects.  They hold indexes rather than the descriptors themselves,
+# so that they don't keep the descriptors (and through them, the
+# classes) alive.  They are discarded by _ProxyMetaclass whenever a
+# proxy class (or one of its bases) is changed.  Classes with non-proxy
+# classes in their MRO can't be watched that way, so they get a cache
+# of None and always walk the MRO.
+#
+# Most names looked up are not found (and are then looked up on the
+# proxied object), and there is no end to those, so a cache is cleared
+# when it's full.
+#
+# The caches are keyed by the ids of the classes, which is faster than a
+# WeakKeyDictionary.  Weak references to the classes discard their caches
+# when the classes go away, before the ids can be reused.
+_LOOKUP_CACHE_SIZE = 1024
+_lookup_caches = {}
+_lookup_cache_refs = {}
+
+
+def _new_lookup_cache(type_):
+    if all(isinstance(base, _ProxyMetaclass) for base in type_.__mro__[:-1]):
+        cache = {}
+    else:
+        cache = None
+    key = id(type_)
+    if key not in _lookup_cache_refs:
+        def discard(ref):
+            _lookup_caches.pop(key, None)
+            _lookup_cache_refs.pop(key, None)
+        _lookup_cache_refs[key] = weakref.ref(type_, discard)
+    _lookup_caches[key] = cache
+    return cache
+
+
+def _clear_lookup_caches(type_):
+    todo = [type_]
+    while todo:
+        klass = todo.pop()
+        _lookup_caches.pop(id(klass), None)
+        todo.extend(klass.__subclasses__())
+
+
+def _WrapperType_Lookup(type_, name):
+    """
+    Looks up information in class dictionaries in MRO
+    order, ignoring the proxy type itself, using the
+    lookup cache of *type_*.
+
+    Returns the first found object, or _MARKER
+    """
+    try:
+        cache = _lookup_caches[id(type_)]
+    except KeyError:
+        cache = _new_lookup_cache(type_)
+    if cache is None:
+        return _WrapperType_FindInMRO(type_, name)
+    try:
+        index = cache[name]
+    except KeyError:
+        index = _WrapperType_FindIndexInMRO(type_, name)
+        if len(cache) >= _LOOKUP_CACHE_SIZE:
+            cache.clear()
+        cache[name] = index
+    if index < 0:
+        return _MARKER
+    try:
+        return type_.__mro__[index].__dict__[name]
+    except (IndexError, KeyError):
+        # Another thread changed the class since we looked.
+        return _WrapperType_FindInMRO(type_, name)
+
+
+# {proxy class: reducer} for py_registerProxyReducer
+_proxy_reducers = {}
+
+
+def _reduce_proxy(proxy):
+    for base in type(proxy).__mro__:
+        reducer = _proxy_reducers.get(base)
+        if reducer is not None:
+            return reducer(proxy)
+    raise pickle.PicklingError
 
 
 def _get_wrapped(self):
@@ -60,6 +165,13 @@ def _get_wrapped(self):
     return super(AbstractPyProxyBase, self).__getattribute__('_wrapped')
 
 
+# How AbstractPyProxyBase gets and sets the attributes of the wrapped
+# object; replaced by py_enableStats() to time that.
+_forward_getattr = getattr
+_forward_setattr = setattr
+_forward_delattr = delattr
+
+
 class _EmptyInterfaceDescriptor:
     """A descriptor for the attributes used on the class by the
     Python implementation of `zope.interface`.
@@ -90,6 +202,14 @@ class _ProxyMetaclass(type):
     # for Py2/Py3 compatibility.
     __implemented__ = _EmptyInterfaceDescriptor()
 
+    def __setattr__(cls, name, value):
+        type.__setattr__(cls, name, value)
+        _clear_lookup_caches(cls)
+
+    def __delattr__(cls, name):
+        type.__delattr__(cls, name)
+        _clear_lookup_caches(cls)
+
 
 class AbstractPyProxyBase:
     """
@@ -123,11 +243,17 @@ class AbstractPyProxyBase:
     def __str__(self):
         return str(self._wrapped)
 
-    def __reduce__(self):  # pragma: no cover  (__reduce_ex__ prevents normal)
-        raise pickle.PicklingError
+    def __bytes__(self):
+        return bytes(self._wrapped)
+
+    def __format__(self, format_spec):
+        return format(self._wrapped, format_spec)
+
+    def __reduce__(self):
+        return _reduce_proxy(self)
 
     def __reduce_ex__(self, proto):
-        raise pickle.PicklingError
+        return _reduce_proxy(self)
 
     # Rich comparison protocol
     def __lt__(self, other):
@@ -166,7 +292,7 @@ class AbstractPyProxyBase:
             # __class__ and __module__ are special cased in the C
             # implementation, because we will always find them on the
             # type of this object if we are being subclassed
-            return getattr(_get_wrapped(self), name)
+            return _forward_getattr(_get_wrapped(self), name)
 
         if name in ('__reduce__', '__reduce_ex__'):
             # These things we specifically override and no one
@@ -178,14 +304,14 @@ class AbstractPyProxyBase:
         descriptor = _WrapperType_Lookup(type_self, name)
         if descriptor is _MARKER:
             # Nothing in the class, go straight to the wrapped object
-            return getattr(_get_wrapped(self), name)
+            return _forward_getattr(_get_wrapped(self), name)
 
         if hasattr(descriptor, '__get__'):
             if not hasattr(descriptor, '__set__'):
                 # Non-data-descriptor: call through to the wrapped object
                 # to see if it's there
                 try:
-                    return getattr(_get_wrapped(self), name)
+                    return _forward_getattr(_get_wrapped(self), name)
                 except AttributeError:
                     pass
             # Data-descriptor on this type. Call it
@@ -205,20 +331,24 @@ class AbstractPyProxyBase:
         if descriptor is _MARKER or not hasattr(descriptor, '__set__'):
             # Nothing in the class that's a descriptor,
             # go straight to the wrapped object
-            return setattr(self._wrapped, name, value)
+            return _forward_setattr(self._wrapped, name, value)
 
         return object.__setattr__(self, name, value)
 
     def __delattr__(self, name):
         if name == '_wrapped':
             raise AttributeError()
-        delattr(self._wrapped, name)
+        _forward_delattr(self._wrapped, name)
 
     # Container protocols
 
     def __len__(self):
         return len(self._wrapped)
 
+    def __length_hint__(self):
+        hint = operator.length_hint(self._wrapped, -1)
+        return NotImplemented if hint < 0 else hint
+
     def __getitem__(self, key):
         return self._wrapped[key]
 
@@ -233,21 +363,34 @@ class AbstractPyProxyBase:
         # time.
         return iter(self._wrapped)
 
-    def next(self):
-        # Called when we wrap an iterator itself.
-        return next(self._wrapped)
-
     def __next__(self):
-        return self._wrapped.__next__()
+        # Called when we wrap an iterator itself.  The builtin uses the
+        # iterator's slot directly, without looking up a bound method.
+        return next(self._wrapped)
+    next = __next__
 
-    # Python 2.7 won't let the C wrapper support __reversed__
-    # Uncomment this when the supported Python versions do
-    # def __reversed__(self):
-    #    return reversed(self._wrapped)
+    def __reversed__(self):
+        return reversed(self._wrapped)
 
     def __contains__(self, item):
         return item in self._wrapped
 
+    # Async protocols
+    def __await__(self):
+        wrapped = self._wrapped
+        try:
+            await_ = type(wrapped).__await__
+        except AttributeError:
+            raise TypeError("object %s can't be used in 'await' expression"
+                            % type(wrapped).__name__)
+        return await_(wrapped)
+
+    def __aiter__(self):
+        return aiter(self._wrapped)
+
+    def __anext__(self):
+        return anext(self._wrapped)
+
     # Numeric protocol:  unary operators
     def __neg__(self):
         return -self._wrapped
@@ -296,6 +439,9 @@ class AbstractPyProxyBase:
     def __divmod__(self, other):
         return divmod(self._wrapped, other)
 
+    def __matmul__(self, other):
+        return self._wrapped @ other
+
     def __pow__(self, other, modulus=None):
         if modulus is None:
             return pow(self._wrapped, other)
@@ -322,6 +468,9 @@ class AbstractPyProxyBase:
     def __rdivmod__(self, other):
         return divmod(other, self._wrapped)
 
+    def __rmatmul__(self, other):
+        return other @ self._wrapped
+
     def __rpow__(self, other, modulus=None):
         if modulus is None:
             return pow(other, self._wrapped)
@@ -384,6 +533,10 @@ class AbstractPyProxyBase:
         self._wrapped %= other
         return self
 
+    def __imatmul__(self, other):
+        self._wrapped @= other
+        return self
+
     def __ilshift__(self, other):
         self._wrapped <<= other
         return self
@@ -423,6 +576,86 @@ class PyProxyBase(AbstractPyProxyBase):
     __slots__ = ('_wrapped', )
 
 
+class PyWeakrefableProxyBase(PyProxyBase):
+    """Reference implementation of a proxy that can be weakly referenced.
+    """
+    __slots__ = ('__weakref__', )
+
+
+class PyBufferProxyBase(PyProxyBase):
+    """Reference implementation of a proxy that also forwards the buffer
+    protocol.  Python classes can only provide buffers as of Python 3.12
+    (PEP 688).
+    """
+    __slots__ = ()
+
+    def __buffer__(self, flags):
+        return memoryview(self._wrapped)
+
+    def __release_buffer__(self, buffer):
+        buffer.release()
+
+
+_wrapped_slot = PyProxyBase.__dict__['_wrapped']
+
+
+def _check_factory(factory):
+    if not callable(factory):
+        raise TypeError('expected callable factory, got %s'
+                        % type(factory).__name__)
+
+
+class PyLazyProxyBase(PyProxyBase):
+    """Reference implementation of a proxy that creates the proxied
+    object by calling a factory the first time it is needed.
+    """
+    __slots__ = ('_factory', )
+
+    def __new__(cls, factory):
+        _check_factory(factory)
+        inst = super(AbstractPyProxyBase, cls).__new__(cls)
+        inst._factory = factory
+        return inst
+
+    def __init__(self, factory):
+        # If this isn't the factory we got in __new__, start over.
+        if _factory_slot.__get__(self) is not factory:
+            _check_factory(factory)
+            _factory_slot.__set__(self, factory)
+            try:
+                _wrapped_slot.__delete__(self)
+            except AttributeError:
+                pass
+
+    @property
+    def _wrapped(self):
+        try:
+            return _wrapped_slot.__get__(self)
+        except AttributeError:
+            pass
+        factory = _factory_slot.__get__(self)
+        if factory is None:
+            raise AttributeError('_wrapped')
+        obj = factory()
+        try:
+            # The factory may have materialized (or repointed) this
+            # proxy already; the first object stored wins.
+            return _wrapped_slot.__get__(self)
+        except AttributeError:
+            pass
+        _wrapped_slot.__set__(self, obj)
+        _factory_slot.__set__(self, None)
+        return obj
+
+    @_wrapped.setter
+    def _wrapped(self, value):
+        _wrapped_slot.__set__(self, value)
+        _factory_slot.__set__(self, None)
+
+
+_factory_slot = PyLazyProxyBase.__dict__['_factory']
+
+
 def py_getProxiedObject(obj):
     if isinstance(obj, PyProxyBase):
         return obj._wrapped
@@ -479,6 +712,267 @@ def py_removeAllProxies(obj):
     return obj
 
 
+def py_removeAllProxiesMany(iterable):
+    return [py_removeAllProxies(obj) for obj in iterable]
+
+
+def py_removeAllProxiesInPlace(objects):
+    if not isinstance(objects, list):
+        raise TypeError('expected list, got %s' % type(objects).__name__)
+    objects[:] = [py_removeAllProxies(obj) for obj in objects]
+
+
+def py_callMethod(obj, name, /, *args, **kw):
+    return getattr(obj, name)(*args, **kw)
+
+
+# {(proxy class, id(obj)): proxy}; a live proxy keeps obj alive, so
+# the id can't be reused while the entry exists.
+_interned_proxies = weakref.WeakValueDictionary()
+
+
+def py_internProxy(proxytype, obj):
+    if not (isinstance(proxytype, type) and
+            issubclass(proxytype, PyProxyBase)):
+        raise TypeError('expected proxy type, got %r' % (proxytype,))
+    key = (proxytype, id(obj))
+    proxy = _interned_proxies.get(key)
+    if proxy is not None and py_getProxiedObject(proxy) is obj:
+        return proxy
+    proxy = proxytype(obj)
+    _interned_proxies[key] = proxy
+    return proxy
+
+
+def py_wrapMany(proxytype, iterable):
+    if not (isinstance(proxytype, type) and
+            issubclass(proxytype, PyProxyBase)):
+        raise TypeError('expected proxy type, got %r' % (proxytype,))
+    return [proxytype(obj) for obj in iterable]
+
+
+def py_registerProxyReducer(proxytype, reducer):
+    if not (isinstance(proxytype, type) and
+            issubclass(proxytype, PyProxyBase)):
+        raise TypeError('expected proxy type, got %r' % (proxytype,))
+    if reducer is None:
+        _proxy_reducers.pop(proxytype, None)
+    elif not callable(reducer):
+        raise TypeError('expected callable reducer, got %s'
+                        % type(reducer).__name__)
+    else:
+        _proxy_reducers[proxytype] = reducer
+
+
+# The methods of AbstractPyProxyBase counted by py_enableStats(), with
+# the names of the slots the C implementation counts for them.
+_STAT_METHODS = {
+    '__getattribute__': 'getattro',
+    '__setattr__': 'setattro',
+    '__delattr__': 'setattro',
+    '__call__': 'call',
+    '__lt__': 'richcompare',
+    '__le__': 'richcompare',
+    '__eq__': 'richcompare',
+    '__ne__': 'richcompare',
+    '__gt__': 'richcompare',
+    '__ge__': 'richcompare',
+    '__hash__': 'hash',
+    '__str__': 'str',
+    '__repr__': 'repr',
+    '__iter__': 'iter',
+    '__next__': 'iternext',
+    '__bool__': 'bool',
+    '__len__': 'len',
+    '__contains__': 'contains',
+    '__getitem__': 'getitem',
+    '__setitem__': 'setitem',
+    '__delitem__': 'setitem',
+    '__await__': 'await',
+    '__aiter__': 'aiter',
+    '__anext__': 'anext',
+}
+for _stat in ('neg', 'pos', 'abs', 'invert', 'int', 'float', 'index'):
+    _STAT_METHODS['__%s__' % _stat] = _stat
+for _stat in ('add', 'sub', 'mul', 'mod', 'divmod', 'pow', 'lshift',
+              'rshift', 'and', 'xor', 'or', 'floordiv', 'truediv',
+              'matmul'):
+    _STAT_METHODS['__%s__' % _stat] = _stat
+    _STAT_METHODS['__r%s__' % _stat] = _stat
+    if _stat != 'divmod':
+        _STAT_METHODS['__i%s__' % _stat] = 'i' + _stat
+del _stat
+
+# {(proxy class, slot name): count}
+_stats = collections.Counter()
+# {method name: uncounted method} while counting
+_uncounted_methods = {}
+
+# Record every _sample_interval'th attribute looked up, if not 0
+_sample_interval = 0
+_attribute_accesses = itertools.count()
+# {(proxy class, name, 'proxy' or 'wrapped'): count}, bounded
+_attribute_samples = {}
+_ATTRIBUTE_SAMPLES_MAX = 1024
+
+# The methods timed by py_enableStats(timing=True)
+_TIMED_METHODS = ('__getattribute__', '__setattr__', '__delattr__',
+                  '__call__')
+# {(proxy class, slot name): [nanoseconds, nanoseconds in the wrapped
+# object]}
+_timings = collections.defaultdict(lambda: [0, 0])
+# Per thread, the nanoseconds spent in the wrapped object by the timed
+# methods being run, innermost last
+_timing = threading.local()
+
+
+def _attribute_resolution(proxy, name):
+    # Where AbstractPyProxyBase.__getattribute__ found *name*, following
+    # the same steps.
+    if name in ('__class__', '__module__'):
+        return 'wrapped'
+    if name in ('__reduce__', '__reduce_ex__'):
+        return 'proxy'
+    descriptor = _WrapperType_Lookup(type(proxy), name)
+    if descriptor is _MARKER:
+        return 'wrapped'
+    if (hasattr(descriptor, '__get__')
+            and not hasattr(descriptor, '__set__')
+            and hasattr(proxy._wrapped, name)):
+        return 'wrapped'
+    return 'proxy'
+
+
+def _sample_attribute(proxy, name):
+    key = (type(proxy), name, _attribute_resolution(proxy, name))
+    if key in _attribute_samples:
+        _attribute_samples[key] += 1
+    elif len(_attribute_samples) < _ATTRIBUTE_SAMPLES_MAX:
+        _attribute_samples[key] = 1
+
+
+def _wrapped_times():
+    try:
+        return _timing.wrapped_times
+    except AttributeError:
+        wrapped_times = _timing.wrapped_times = []
+        return wrapped_times
+
+
+def _timed_forward(func, /, *args, **kw):
+    # Call func, which operates on the wrapped object, adding the time
+    # to the innermost timed method.
+    start = time.perf_counter_ns()
+    try:
+        return func(*args, **kw)
+    finally:
+        wrapped_times = _wrapped_times()
+        if wrapped_times:
+            wrapped_times[-1] += time.perf_counter_ns() - start
+
+
+def _timed_call(self, *args, **kw):
+    return _timed_forward(self._wrapped, *args, **kw)
+
+
+def _timed_method(method, stat):
+    def timed(self, *args, **kw):
+        if stat in ('getattro', 'setattro') and args[0] == '_wrapped':
+            return method(self, *args, **kw)
+        wrapped_times = _wrapped_times()
+        wrapped_times.append(0)
+        start = time.perf_counter_ns()
+        try:
+            return method(self, *args, **kw)
+        finally:
+            timing = _timings[type(self), stat]
+            timing[0] += time.perf_counter_ns() - start
+            timing[1] += wrapped_times.pop()
+    return functools.wraps(method)(timed)
+
+
+def _counting_method(method, stat):
+    if stat == 'getattro':
+        def counting(self, name):
+            # The methods of the proxy access this all the time.
+            if name == '_wrapped':
+                return method(self, name)
+            _stats[type(self), stat] += 1
+            res = method(self, name)
+            if (_sample_interval
+                    and next(_attribute_accesses) % _sample_interval == 0):
+                _sample_attribute(self, name)
+            return res
+    elif stat == 'setattro':
+        def counting(self, name, *args):
+            if name != '_wrapped':
+                _stats[type(self), stat] += 1
+            return method(self, name, *args)
+    else:
+        def counting(self, *args, **kw):
+            _stats[type(self), stat] += 1
+            return method(self, *args, **kw)
+    return functools.wraps(method)(counting)
+
+
+def py_enableStats(sample_interval=0, timing=False):
+    global _sample_interval
+    global _forward_getattr, _forward_setattr, _forward_delattr
+    if sample_interval < 0:
+        raise ValueError('sample_interval must not be negative')
+    _sample_interval = sample_interval
+    # Replacing the methods, rather than checking a flag in them, keeps
+    # the proxies as fast as before while not counting.
+    py_disableStats()
+    for name, stat in _STAT_METHODS.items():
+        method = _uncounted_methods[name] = AbstractPyProxyBase.__dict__[name]
+        if timing and name in _TIMED_METHODS:
+            if name == '__call__':
+                method = functools.wraps(method)(_timed_call)
+            method = _timed_method(method, stat)
+        setattr(AbstractPyProxyBase, name, _counting_method(method, stat))
+    if timing:
+        _forward_getattr = functools.partial(_timed_forward, getattr)
+        _forward_setattr = functools.partial(_timed_forward, setattr)
+        _forward_delattr = functools.partial(_timed_forward, delattr)
+
+
+def py_disableStats():
+    global _forward_getattr, _forward_setattr, _forward_delattr
+    while _uncounted_methods:
+        name, method = _uncounted_methods.popitem()
+        setattr(AbstractPyProxyBase, name, method)
+    _forward_getattr = getattr
+    _forward_setattr = setattr
+    _forward_delattr = delattr
+
+
+def py_getStats():
+    stats = {}
+    for (proxytype, stat), count in list(_stats.items()):
+        stats.setdefault(proxytype, {})[stat] = count
+    return stats
+
+
+def py_getTimings():
+    timings = {}
+    for (proxytype, stat), (elapsed, in_wrapped) in list(_timings.items()):
+        timings.setdefault(proxytype, {})[stat] = (elapsed, in_wrapped)
+    return timings
+
+
+def py_getAttributeSamples():
+    return dict(_attribute_samples)
+
+
+def py_resetStats():
+    global _attribute_accesses
+    _stats.clear()
+    _timings.clear()
+    _attribute_samples.clear()
+    _attribute_accesses = itertools.count()
+
+
 _c_available = False
 if not int(os.environ.get('PURE_PYTHON', '0')):
     try:  # pragma: no cover
@@ -498,18 +992,34 @@ if _c_available:  # pragma: no cover
     # Python API:  not used in this module
     # API for proxy-using C extensions.
     from zope.proxy._zope_proxy_proxy import _CAPI  # noqa: F401 unused
+    from zope.proxy._zope_proxy_proxy import BufferProxyBase
+    from zope.proxy._zope_proxy_proxy import LazyProxyBase
     from zope.proxy._zope_proxy_proxy import ProxyBase
+    from zope.proxy._zope_proxy_proxy import callMethod
+    from zope.proxy._zope_proxy_proxy import disableStats
+    from zope.proxy._zope_proxy_proxy import enableStats
+    from zope.proxy._zope_proxy_proxy import getAttributeSamples
     from zope.proxy._zope_proxy_proxy import getProxiedObject
+    from zope.proxy._zope_proxy_proxy import getStats
+    from zope.proxy._zope_proxy_proxy import getTimings
+    from zope.proxy._zope_proxy_proxy import internProxy
     from zope.proxy._zope_proxy_proxy import isProxy
     from zope.proxy._zope_proxy_proxy import queryInnerProxy
     from zope.proxy._zope_proxy_proxy import queryProxy
+    from zope.proxy._zope_proxy_proxy import registerProxyReducer
     from zope.proxy._zope_proxy_proxy import removeAllProxies
+    from zope.proxy._zope_proxy_proxy import removeAllProxiesInPlace
+    from zope.proxy._zope_proxy_proxy import removeAllProxiesMany
+    from zope.proxy._zope_proxy_proxy import resetStats
     from zope.proxy._zope_proxy_proxy import sameProxiedObjects
     from zope.proxy._zope_proxy_proxy import setProxiedObject
+    from zope.proxy._zope_proxy_proxy import wrapMany
 
 else:
     # no C extension available, fall back
     ProxyBase = PyProxyBase
+    LazyProxyBase = PyLazyProxyBase
+    BufferProxyBase = PyBufferProxyBase
     getProxiedObject = py_getProxiedObject
     setProxiedObject = py_setProxiedObject
     isProxy = py_isProxy
@@ -517,6 +1027,49 @@ else:
     queryProxy = py_queryProxy
     queryInnerProxy = py_queryInnerProxy
     removeAllProxies = py_removeAllProxies
+    removeAllProxiesMany = py_removeAllProxiesMany
+    removeAllProxiesInPlace = py_removeAllProxiesInPlace
+    callMethod = py_callMethod
+    internProxy = py_internProxy
+    wrapMany = py_wrapMany
+    registerProxyReducer = py_registerProxyReducer
+    enableStats = py_enableStats
+    disableStats = py_disableStats
+    getStats = py_getStats
+    getTimings = py_getTimings
+    getAttributeSamples = py_getAttributeSamples
+    resetStats = py_resetStats
+
+
+def getOverhead(timings=None):
+    if timings is None:
+        timings = getTimings()
+    overhead = {}
+    for proxytype, slots in timings.items():
+        elapsed = sum(elapsed for elapsed, in_wrapped in slots.values())
+        in_wrapped = sum(in_wrapped for elapsed, in_wrapped in slots.values())
+        overhead[proxytype] = (elapsed - in_wrapped, in_wrapped)
+    return overhead
+
+
+# Count from the start, for processes we can't change to call
+# enableStats().
+if int(os.environ.get('ZOPE_PROXY_STATS', '0')):
+    enableStats()
+
+
+if _c_available:  # pragma: no cover
+    class WeakrefableProxyBase(ProxyBase):
+        __slots__ = ('__weakref__', )
+        # A class statement always puts a __doc__ into the class
+        # dictionary, which would hide the one of the proxied object.
+        __doc__ = property(lambda self: getProxiedObject(self).__doc__)
+
+    # Only tp_weaklistoffset is needed to be weakly referenced, and
+    # ProxyBase forwards __weakref__ too.
+    del WeakrefableProxyBase.__weakref__
+else:
+    WeakrefableProxyBase = PyWeakrefableProxyBase
 
 
 def non_overridable(func):
@@ -26,28 +26,570 @@
 
 #include "Python.h"
 #include "modsupport.h"
+#include <stddef.h>
+
+#if PY_VERSION_HEX < 0x030C0000
+#include "structmember.h"
+#define Py_T_PYSSIZET T_PYSSIZET
+#define Py_READONLY READONLY
+#endif
 
 #define PROXY_MODULE
 #include "proxy.h"
 
 static PyTypeObject ProxyType;
 
+static PyObject *
+wrap_new(PyTypeObject *type, PyObject *args, PyObject *kwds);
+static PyObject *
+lazy_new(PyTypeObject *type, PyObject *args, PyObject *kwds);
+
+/* Whether type is or derives from the type whose tp_new is new.
+ *
+ * Each module object has its own LazyProxyBase type, but they all share
+ * lazy_new(), and their subclasses either inherit it or still have it
+ * in their MRO.  Checking this way needs no module state, which binary
+ * operators (that don't know which operand is the proxy) couldn't get.
+ */
+static int
+derives_from(PyTypeObject *type, newfunc new)
+{
+    PyObject *mro;
+    Py_ssize_t i, n;
+
+    if (type->tp_new == new)
+        return 1;
+    mro = type->tp_mro;
+    if (mro == NULL)
+        return 0;
+    n = PyTuple_GET_SIZE(mro);
+    for (i = 1; i < n; i++)
+        if (((PyTypeObject *)PyTuple_GET_ITEM(mro, i))->tp_new == new)
+            return 1;
+    return 0;
+}
+
 #define Proxy_Check(wrapper)   (PyObject_TypeCheck((wrapper), &ProxyType))
+#define LazyProxy_Check(wrapper) \
+        (derives_from(Py_TYPE(wrapper), lazy_new))
+
+
+/*
+ *   Free-threading support.
+ *
+ *   The object a proxy points to can be replaced (by setProxiedObject(),
+ *   __init__ or the factory of a lazy proxy) while other threads use the
+ *   proxy.  So it is only read and replaced inside a critical section
+ *   on the proxy, and the slots work with strong references to it.
+ *   With the GIL, critical sections are no-ops.
+ */
+#if PY_VERSION_HEX < 0x030D0000
+#define Py_BEGIN_CRITICAL_SECTION(op) {
+#define Py_END_CRITICAL_SECTION() }
+
+static int
+PyDict_GetItemRef(PyObject *mp, PyObject *key, PyObject **result)
+{
+    PyObject *item = PyDict_GetItemWithError(mp, key);
+
+    *result = Py_XNewRef(item);
+    if (item != NULL)
+        return 1;
+    return PyErr_Occurred() ? -1 : 0;
+}
+
+static int
+PyDict_SetDefaultRef(PyObject *mp, PyObject *key, PyObject *default_value,
+                     PyObject **result)
+{
+    PyObject *item = PyDict_SetDefault(mp, key, default_value);
+
+    *result = Py_XNewRef(item);
+    if (item == NULL)
+        return -1;
+    return item != default_value;
+}
+
+static PyObject *
+PyList_GetItemRef(PyObject *list, Py_ssize_t i)
+{
+    return Py_XNewRef(PyList_GetItem(list, i));
+}
+#endif
+
+#if PY_VERSION_HEX < 0x030B0000
+static PyObject *
+PyType_GetModuleByDef(PyTypeObject *type, PyModuleDef *def)
+{
+    PyObject *mro = type->tp_mro;
+    Py_ssize_t i;
+
+    for (i = 0; i < PyTuple_GET_SIZE(mro); i++) {
+        PyTypeObject *base = (PyTypeObject *)PyTuple_GET_ITEM(mro, i);
+        PyObject *module;
+
+        if (!PyType_HasFeature(base, Py_TPFLAGS_HEAPTYPE))
+            continue;
+        module = ((PyHeapTypeObject *)base)->ht_module;
+        if (module != NULL && PyModule_GetDef(module) == def)
+            return module;
+    }
+    PyErr_Format(PyExc_TypeError,
+                 "PyType_GetModuleByDef: No superclass of '%s' has "
+                 "the given module", type->tp_name);
+    return NULL;
+}
+#endif
+
+/*
+ *   Shared and module state.
+ *
+ *   ProxyBase is a static type, as it always was: C extensions (like
+ *   zope.security) derive static types from it, which CPython doesn't
+ *   allow for heap types.  So there is one ProxyBase per process, and
+ *   what its slots and the C API use is shared as well.  It is set up
+ *   by the first import and kept for the life of the process.
+ *
+ *   The types added since (LazyProxyBase, BufferProxyBase and the
+ *   decorator types) are heap types created by each module object,
+ *   which keeps them and what they use in its state.
+ */
+
+#define LOOKUP_CACHE_SIZE_EXP 10
+#define LOOKUP_CACHE_SIZE (1 << LOOKUP_CACHE_SIZE_EXP)
+
+typedef struct {
+    PyInterpreterState *interp;
+    unsigned int version;
+    PyObject *name;             /* strong reference */
+    PyObject *value;            /* borrowed reference, NULL if not found */
+} lookup_cache_entry;
+
+typedef struct {
+    int initialized;
+    PyObject *str__class__;
+    PyObject *str__module__;
+    PyObject *str__reduce__;
+    PyObject *str__reduce_ex__;
+    PyObject *str_proxy;
+    PyObject *str_wrapped;
+    PyObject *interned_proxies;
+    PyObject *reducers;         /* {proxy type: reducer} */
+    PyObject *stats;            /* {proxy type: capsule of counts} */
+    /* {(proxy type, name, "proxy" or "wrapped"): count} */
+    PyObject *attribute_samples;
+    Py_ssize_t attribute_accesses;
+    ProxyInterface capi;
+#ifndef Py_GIL_DISABLED
+    lookup_cache_entry lookup_cache[LOOKUP_CACHE_SIZE];
+#endif
+} shared_state;
+
+static shared_state shared;
+
+typedef struct {
+    PyTypeObject *LazyProxyType;
+    PyTypeObject *BufferProxyType;
+    PyTypeObject *DecoratorSpecificationDescriptorType;
+    PyTypeObject *SpecificationDecoratorType;
+    PyObject *str_decorator_specs;
+    PyObject *str_data;
+    PyObject *str_setdefault;
+    /* Imported from zope.interface.declarations. */
+    PyObject *zi_providedBy;
+    PyObject *zi_getObjectSpecification;
+    PyObject *zi_ObjectSpecification;
+    PyObject *zi_ProvidesClass;
+    PyObject *WeakValueDictionary;
+} module_state;
+
+static struct PyModuleDef moduledef;
+
+static inline module_state *
+get_module_state(PyObject *module)
+{
+    return (module_state *)PyModule_GetState(module);
+}
+
+/* The state of the module that defined type or one of its bases;
+ * sets an exception and returns NULL if there is none.
+ */
+static inline module_state *
+type_state(PyTypeObject *type)
+{
+    PyObject *module = PyType_GetModuleByDef(type, &moduledef);
+
+    return module == NULL ? NULL : get_module_state(module);
+}
+
+
+/*
+ *   Statistics.
+ *
+ *   Opt-in counts of the calls to the slots of proxies, per proxy type,
+ *   to find out which protocols proxies spend their time in.  The slots
+ *   that run code of the proxy class (attribute access and calls) can
+ *   also be timed, separating the time spent in the proxied object from
+ *   the overhead of the proxy.
+ */
+
+#define PROXY_STATS(X) \
+    X(getattro) X(setattro) X(call) X(richcompare) X(hash) X(str) \
+    X(repr) X(iter) X(iternext) X(bool) X(len) X(contains) X(getitem) \
+    X(setitem) X(add) X(sub) X(mul) X(mod) X(divmod) X(pow) X(lshift) \
+    X(rshift) X(and) X(xor) X(or) X(floordiv) X(truediv) X(matmul) \
+    X(neg) X(pos) X(abs) X(invert) X(int) X(float) X(index) X(iadd) \
+    X(isub) X(imul) X(imod) X(ipow) X(ilshift) X(irshift) X(iand) \
+    X(ixor) X(ior) X(ifloordiv) X(itruediv) X(imatmul) X(item) \
+    X(ass_item) X(concat) X(repeat) X(iconcat) X(irepeat) X(getbuffer) \
+    X(await) X(aiter) X(anext) X(send)
+
+typedef enum {
+#define STAT_ENUM(NAME) STAT_##NAME,
+    PROXY_STATS(STAT_ENUM)
+#undef STAT_ENUM
+    STAT_COUNT
+} proxy_stat;
+
+static const char *const stat_names[] = {
+#define STAT_NAME(NAME) #NAME,
+    PROXY_STATS(STAT_NAME)
+#undef STAT_NAME
+};
 
+#if PY_VERSION_HEX < 0x030D0000
+typedef _PyTime_t PyTime_t;
+
+static inline int
+PyTime_PerfCounterRaw(PyTime_t *result)
+{
+    *result = _PyTime_GetPerfCounter();
+    return 0;
+}
+#endif
+
+/* The statistics of a proxy type, kept in a capsule.  Times are in
+ * nanoseconds.
+ */
+typedef struct {
+    Py_ssize_t counts[STAT_COUNT];
+    PyTime_t times[STAT_COUNT];
+    PyTime_t wrapped_times[STAT_COUNT];  /* in the proxied object */
+} proxy_stats;
+
+/* Unlike the counts, which are kept in the module state, the switch is
+ * process-wide, so that slots can test it without looking the module
+ * state up.  So is the interval of attribute samples that goes with it.
+ */
+static int stats_enabled = 0;
+static int stats_timing = 0;
+static Py_ssize_t stats_sample_interval = 0;
+
+/* The number of different (proxy type, name, resolution) samples kept. */
+#define ATTRIBUTE_SAMPLES_MAX 1024
+
+#if PY_VERSION_HEX < 0x030B0000
+#define Py_NO_INLINE _Py_NO_INLINE
+#endif
+
+#ifdef Py_GIL_DISABLED
+#define STATS_ENABLED() _Py_atomic_load_int_relaxed(&stats_enabled)
+#define STATS_ENABLE(ON) _Py_atomic_store_int_relaxed(&stats_enabled, (ON))
+#define STAT_INCREMENT(COUNT) _Py_atomic_add_ssize(&(COUNT), 1)
+#define STAT_LOAD(COUNT) _Py_atomic_load_ssize_relaxed(&(COUNT))
+#define STAT_STORE(COUNT, N) _Py_atomic_store_ssize_relaxed(&(COUNT), (N))
+#define STATS_TIMING() _Py_atomic_load_int_relaxed(&stats_timing)
+#define STATS_TIME(ON) _Py_atomic_store_int_relaxed(&stats_timing, (ON))
+#define STAT_ADD_TIME(TIME, T) _Py_atomic_add_int64(&(TIME), (T))
+#define STAT_LOAD_TIME(TIME) _Py_atomic_load_int64_relaxed(&(TIME))
+#else
+#define STATS_ENABLED() (stats_enabled)
+#define STATS_ENABLE(ON) (stats_enabled = (ON))
+#define STAT_INCREMENT(COUNT) ((COUNT)++)
+#define STAT_LOAD(COUNT) (COUNT)
+#define STAT_STORE(COUNT, N) ((COUNT) = (N))
+#define STATS_TIMING() (stats_timing)
+#define STATS_TIME(ON) (stats_timing = (ON))
+#define STAT_ADD_TIME(TIME, T) ((TIME) += (T))
+#define STAT_LOAD_TIME(TIME) (TIME)
+#endif
+
+static void
+stats_free(PyObject *capsule)
+{
+    PyMem_Free(PyCapsule_GetPointer(capsule, NULL));
+}
+
+/* Return a new reference to the capsule of the statistics of the type
+ * of self, creating it if needed, or NULL with an exception set.
+ */
 static PyObject *
-empty_tuple = NULL;
+stats_capsule(shared_state *state, PyObject *self)
+{
+    PyObject *type = (PyObject *)Py_TYPE(self);
+    PyObject *capsule, *created;
+    proxy_stats *stats;
+
+    if (PyDict_GetItemRef(state->stats, type, &capsule) < 0)
+        return NULL;
+    if (capsule == NULL) {
+        stats = PyMem_Calloc(1, sizeof(proxy_stats));
+        if (stats == NULL)
+            return PyErr_NoMemory();
+        created = PyCapsule_New(stats, NULL, stats_free);
+        if (created == NULL) {
+            PyMem_Free(stats);
+            return NULL;
+        }
+        /* Another thread may have counted this type meanwhile. */
+        if (PyDict_SetDefaultRef(state->stats, type, created,
+                                 &capsule) < 0)
+            capsule = NULL;
+        Py_DECREF(created);
+    }
+    return capsule;
+}
+
+/* Count a call to a slot of self.  Not inlined, to keep the slots as
+ * small as they are without statistics.
+ */
+static Py_NO_INLINE void
+count_stat(shared_state *state, PyObject *self, proxy_stat stat)
+{
+    PyObject *capsule = stats_capsule(state, self);
+    proxy_stats *stats;
+
+    if (capsule == NULL) {
+        /* Statistics are best effort; don't make the slot fail. */
+        PyErr_Clear();
+        return;
+    }
+    stats = (proxy_stats *)PyCapsule_GetPointer(capsule, NULL);
+    STAT_INCREMENT(stats->counts[stat]);
+    Py_DECREF(capsule);
+}
+
+#define COUNT_STAT(self, stat) \
+        do { \
+            if (STATS_ENABLED()) \
+                count_stat(&shared, (PyObject *)(self), (stat)); \
+        } while (0)
+
+#define COUNT(self, NAME) COUNT_STAT(self, STAT_##NAME)
+
+static inline PyTime_t
+timer_now(void)
+{
+    PyTime_t now;
+
+    (void)PyTime_PerfCounterRaw(&now);
+    return now;
+}
+
+/* The start of a timed slot, or 0 if slots are not timed. */
+#define TIMER_START() (STATS_TIMING() ? timer_now() : 0)
+
+/* Run STATEMENT, which operates on the proxied object, adding the time
+ * it takes to in_wrapped if the slot is timed.
+ */
+#define TIME_WRAPPED(start, in_wrapped, STATEMENT) \
+        do { \
+            if (start) { \
+                PyTime_t started_ = timer_now(); \
+                STATEMENT; \
+                (in_wrapped) += timer_now() - started_; \
+            } \
+            else { \
+                STATEMENT; \
+            } \
+        } while (0)
+
+/* Record the time of a slot of self started at start, of which it
+ * spent in_wrapped in the proxied object.  The slot may have failed,
+ * so its exception is kept.
+ */
+static Py_NO_INLINE void
+time_stat(shared_state *state, PyObject *self, proxy_stat stat,
+          PyTime_t start, PyTime_t in_wrapped)
+{
+    PyTime_t elapsed = timer_now() - start;
+    PyObject *type, *value, *traceback, *capsule;
+    proxy_stats *stats;
+
+    PyErr_Fetch(&type, &value, &traceback);
+    capsule = stats_capsule(state, self);
+    if (capsule == NULL) {
+        PyErr_Clear();
+    }
+    else {
+        stats = (proxy_stats *)PyCapsule_GetPointer(capsule, NULL);
+        STAT_ADD_TIME(stats->times[stat], elapsed);
+        STAT_ADD_TIME(stats->wrapped_times[stat], in_wrapped);
+        Py_DECREF(capsule);
+    }
+    PyErr_Restore(type, value, traceback);
+}
 
+#define TIME_STAT(self, NAME, start, in_wrapped) \
+        do { \
+            if (start) \
+                time_stat(&shared, (PyObject *)(self), STAT_##NAME, \
+                          (start), (in_wrapped)); \
+        } while (0)
 
-#define MOD_ERROR_VAL NULL
+/* Record every stats_sample_interval'th attribute successfully looked
+ * up through a proxy, and whether the proxy class or the proxied object
+ * provided it.
+ */
+static Py_NO_INLINE void
+sample_attribute(shared_state *state, PyObject *self, PyObject *name,
+                 int from_proxy)
+{
+    PyObject *samples = state->attribute_samples;
+    Py_ssize_t interval = STAT_LOAD(stats_sample_interval);
+    PyObject *key, *count = NULL;
+    Py_ssize_t value;
+    int error = -1;
+
+    if (interval == 0
+        || STAT_INCREMENT(state->attribute_accesses) % interval != 0)
+        return;
+    key = PyTuple_Pack(3, Py_TYPE(self), name,
+                       from_proxy ? state->str_proxy : state->str_wrapped);
+    if (key == NULL)
+        goto finally;
+    Py_BEGIN_CRITICAL_SECTION(samples);
+    if (PyDict_GetItemRef(samples, key, &count) < 0)
+        goto done;
+    if (count == NULL) {
+        /* The table is bounded; only count the samples already in it
+           once it is full. */
+        if (PyDict_GET_SIZE(samples) >= ATTRIBUTE_SAMPLES_MAX) {
+            error = 0;
+            goto done;
+        }
+        value = 0;
+    }
+    else {
+        value = PyLong_AsSsize_t(count);
+        Py_DECREF(count);
+    }
+    count = PyLong_FromSsize_t(value + 1);
+    if (count != NULL)
+        error = PyDict_SetItem(samples, key, count);
+done:
+    Py_END_CRITICAL_SECTION();
+    Py_XDECREF(count);
+    Py_DECREF(key);
+finally:
+    /* Statistics are best effort; don't make the lookup fail. */
+    if (error)
+        PyErr_Clear();
+}
 
-#define MOD_SUCCESS_VAL(val) val
+/* Returns {proxy type: {slot name: count}}, leaving out zero counts. */
+static PyObject *
+get_stats(shared_state *state)
+{
+    PyObject *snapshot, *result, *type, *capsule, *counts, *count;
+    Py_ssize_t pos = 0;
+    proxy_stats *stats;
+    int i;
+
+    /* Copying the dict is atomic; it can be iterated without a lock. */
+    snapshot = PyDict_Copy(state->stats);
+    if (snapshot == NULL)
+        return NULL;
+    result = PyDict_New();
+    if (result == NULL)
+        goto error;
+    while (PyDict_Next(snapshot, &pos, &type, &capsule)) {
+        stats = (proxy_stats *)PyCapsule_GetPointer(capsule, NULL);
+        counts = PyDict_New();
+        if (counts == NULL)
+            goto error;
+        if (PyDict_SetItem(result, type, counts) < 0) {
+            Py_DECREF(counts);
+            goto error;
+        }
+        Py_DECREF(counts);
+        for (i = 0; i < STAT_COUNT; i++) {
+            Py_ssize_t value = STAT_LOAD(stats->counts[i]);
+
+            if (value == 0)
+                continue;
+            count = PyLong_FromSsize_t(value);
+            if (count == NULL)
+                goto error;
+            if (PyDict_SetItemString(counts, stat_names[i], count) < 0) {
+                Py_DECREF(count);
+                goto error;
+            }
+            Py_DECREF(count);
+        }
+    }
+    Py_DECREF(snapshot);
+    return result;
+error:
+    Py_DECREF(snapshot);
+    Py_XDECREF(result);
+    return NULL;
+}
 
-#define MOD_INIT(name) PyMODINIT_FUNC PyInit_##name(void)
+/* Returns {proxy type: {slot name: (time, time in the proxied object)}}
+ * for the slots that were timed.
+ */
+static PyObject *
+get_timings(shared_state *state)
+{
+    PyObject *snapshot, *result, *type, *capsule, *timings, *timing;
+    Py_ssize_t pos = 0;
+    proxy_stats *stats;
+    int i;
 
-#define MOD_DEF(ob, name, doc, methods) \
-        static struct PyModuleDef moduledef = { \
-          PyModuleDef_HEAD_INIT, name, doc, -1, methods, }; \
-        ob = PyModule_Create(&moduledef);
+    snapshot = PyDict_Copy(state->stats);
+    if (snapshot == NULL)
+        return NULL;
+    result = PyDict_New();
+    if (result == NULL)
+        goto error;
+    while (PyDict_Next(snapshot, &pos, &type, &capsule)) {
+        stats = (proxy_stats *)PyCapsule_GetPointer(capsule, NULL);
+        timings = NULL;
+        for (i = 0; i < STAT_COUNT; i++) {
+            PyTime_t time = STAT_LOAD_TIME(stats->times[i]);
+
+            if (time == 0)
+                continue;
+            if (timings == NULL) {
+                timings = PyDict_New();
+                if (timings == NULL)
+                    goto error;
+                if (PyDict_SetItem(result, type, timings) < 0) {
+                    Py_DECREF(timings);
+                    goto error;
+                }
+                Py_DECREF(timings);
+            }
+            timing = Py_BuildValue(
+                "(LL)", (long long)time,
+                (long long)STAT_LOAD_TIME(stats->wrapped_times[i]));
+            if (timing == NULL)
+                goto error;
+            if (PyDict_SetItemString(timings, stat_names[i], timing) < 0) {
+                Py_DECREF(timing);
+                goto error;
+            }
+            Py_DECREF(timing);
+        }
+    }
+    Py_DECREF(snapshot);
+    return result;
+error:
+    Py_DECREF(snapshot);
+    Py_XDECREF(result);
+    return NULL;
+}
 
 
 
@@ -55,6 +597,153 @@ empty_tuple = NULL;
  *   Slot methods.
  */
 
+static PyObject *
+wrap_vectorcall(PyObject *self, PyObject *const *args,
+                size_t nargsf, PyObject *kwnames);
+
+/* The layout of ProxyBase instances.
+ *
+ * The vectorcall pointer follows the ProxyObject of proxy.h rather than
+ * being part of it, so that extensions that embed ProxyObject in their
+ * own structs keep their layout.
+ */
+typedef struct {
+    ProxyObject proxy;
+    vectorcallfunc vectorcall;
+} ProxyBaseObject;
+
+/* Install wrap_vectorcall in a new proxy.
+ *
+ * Only if its type calls through the vectorcall pointer of
+ * ProxyBaseObject: C subtypes written against proxy.h that define
+ * tp_call don't, and may keep something else at that offset.
+ */
+static inline void
+init_vectorcall(PyObject *self)
+{
+    PyTypeObject *type = Py_TYPE(self);
+
+    if (PyType_HasFeature(type, Py_TPFLAGS_HAVE_VECTORCALL)
+        && type->tp_vectorcall_offset
+           == offsetof(ProxyBaseObject, vectorcall))
+        ((ProxyBaseObject *)self)->vectorcall = wrap_vectorcall;
+}
+
+/*
+ *   Lazy proxies start out without a proxied object and call their
+ *   factory to create it the first time it is needed.
+ */
+typedef struct {
+    ProxyBaseObject base;
+    PyObject *factory;          /* NULL once materialized */
+} LazyProxyObject;
+
+/* Return a new reference to the object stored in the proxy, or NULL. */
+static inline PyObject *
+proxy_get(PyObject *self)
+{
+    PyObject *object;
+
+    Py_BEGIN_CRITICAL_SECTION(self);
+    object = Py_XNewRef(Proxy_GET_OBJECT(self));
+    Py_END_CRITICAL_SECTION();
+    return object;
+}
+
+/* Store object (a new reference, or NULL) in the proxy and return the
+ * reference to the object it replaces, which the caller must release.
+ */
+static inline PyObject *
+proxy_exchange(PyObject *self, PyObject *object)
+{
+    PyObject *old;
+
+    Py_BEGIN_CRITICAL_SECTION(self);
+    old = Proxy_GET_OBJECT(self);
+    Proxy_GET_OBJECT(self) = object;
+    Py_END_CRITICAL_SECTION();
+    return old;
+}
+
+/* Call the factory of a lazy proxy and store its result.
+ *
+ * Returns a new reference to the proxied object, or NULL with an
+ * exception set if the factory fails, or NULL without one if there is
+ * no factory (the proxy has been cleared).  The factory is kept until
+ * it succeeds, so a failed materialization can be retried.
+ */
+static PyObject *
+lazy_materialize(PyObject *self)
+{
+    LazyProxyObject *lazy = (LazyProxyObject *)self;
+    PyObject *factory, *object, *stored;
+
+    for (;;) {
+        Py_BEGIN_CRITICAL_SECTION(self);
+        stored = Py_XNewRef(Proxy_GET_OBJECT(self));
+        factory = Py_XNewRef(lazy->factory);
+        Py_END_CRITICAL_SECTION();
+        if (stored != NULL || factory == NULL) {
+            Py_XDECREF(factory);
+            return stored;
+        }
+
+        object = PyObject_CallNoArgs(factory);
+        if (object == NULL) {
+            Py_DECREF(factory);
+            return NULL;
+        }
+
+        /* The factory may have materialized (or repointed) this proxy
+           already, or another thread may have; the first object stored
+           wins.  If the factory was replaced meanwhile, start over
+           with the new one. */
+        Py_BEGIN_CRITICAL_SECTION(self);
+        stored = Py_XNewRef(Proxy_GET_OBJECT(self));
+        if (stored == NULL && lazy->factory == factory) {
+            Proxy_GET_OBJECT(self) = Py_NewRef(object);
+            stored = Py_NewRef(object);
+            lazy->factory = NULL;
+            /* Drops the reference the proxy held. */
+            Py_DECREF(factory);
+        }
+        Py_END_CRITICAL_SECTION();
+        Py_DECREF(factory);
+        Py_DECREF(object);
+        if (stored != NULL)
+            return stored;
+    }
+}
+
+/* Return a new reference to the object proxied by self, materializing
+ * lazy proxies.
+ *
+ * Returns NULL with an exception set on failure, or NULL without one
+ * if the proxy has been cleared.
+ */
+static inline PyObject *
+proxy_object(PyObject *self)
+{
+    PyObject *object = proxy_get(self);
+
+    if (object == NULL && LazyProxy_Check(self))
+        object = lazy_materialize(self);
+    return object;
+}
+
+/* Like proxy_object(), but always sets an exception when returning
+ * NULL; for slots, which can't return NULL without one.
+ */
+static PyObject *
+wrapped_object(PyObject *self)
+{
+    PyObject *object = proxy_object(self);
+
+    if (object == NULL && !PyErr_Occurred())
+        PyErr_SetString(PyExc_RuntimeError, "object is NULL");
+    return object;
+}
+
 static PyObject *
 wrap_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
 {
@@ -72,6 +761,7 @@ wrap_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
             ProxyObject *wrapper = (ProxyObject *) result;
             Py_INCREF(object);
             wrapper->proxy_object = object;
+            init_vectorcall(result);
         }
     }
     return result;
@@ -93,12 +783,8 @@ wrap_init(PyObject *self, PyObject *args, PyObject *kwds)
         /* If the object in this proxy is not the one we
          * received in args, replace it with the new one.
          */
-        if (wrapper->proxy_object != object) {
-            PyObject *temp = wrapper->proxy_object;
-            Py_INCREF(object);
-            wrapper->proxy_object = object;
-            Py_DECREF(temp);
-        }
+        if (wrapper->proxy_object != object)
+            Py_XDECREF(proxy_exchange(self, Py_NewRef(object)));
         result = 0;
     }
     return result;
@@ -107,48 +793,111 @@ wrap_init(PyObject *self, PyObject *args, PyObject *kwds)
 static int
 wrap_traverse(PyObject *self, visitproc visit, void *arg)
 {
-    PyObject *ob = Proxy_GET_OBJECT(self);
-    if (ob != NULL)
-        return visit(ob, arg);
-    else
-        return 0;
+    Py_VISIT(Proxy_GET_OBJECT(self));
+    return 0;
 }
 
 static int
 wrap_clear(PyObject *self)
 {
-    ProxyObject *proxy = (ProxyObject *)self;
-    PyObject *temp = proxy->proxy_object;
-
-    if (temp != NULL) {
-        proxy->proxy_object = NULL;
-        Py_DECREF(temp);
-    }
+    Py_XDECREF(proxy_exchange(self, NULL));
     return 0;
 }
 
 static PyObject *
 wrap_richcompare(PyObject* self, PyObject* other, int op)
 {
+    PyObject *object, *result;
+
     if (Proxy_Check(self)) {
-        self = Proxy_GET_OBJECT(self);
+        object = wrapped_object(self);
+        if (object == NULL)
+            return NULL;
+        COUNT(self, richcompare);
+        result = PyObject_RichCompare(object, other, op);
     }
     else {
-        other = Proxy_GET_OBJECT(other);
+        object = wrapped_object(other);
+        if (object == NULL)
+            return NULL;
+        COUNT(other, richcompare);
+        result = PyObject_RichCompare(self, object, op);
     }
-    return PyObject_RichCompare(self, other, op);
+    Py_DECREF(object);
+    return result;
 }
 
 static PyObject *
 wrap_iter(PyObject *self)
 {
-    return PyObject_GetIter(Proxy_GET_OBJECT(self));
+    PyObject *object = wrapped_object(self);
+    PyObject *result;
+
+    if (object == NULL)
+        return NULL;
+    COUNT(self, iter);
+    result = PyObject_GetIter(object);
+    Py_DECREF(object);
+    return result;
+}
+
+/* Step a coroutine, which has am_send but no tp_iternext. */
+static PyObject *
+send_none(PyObject *object)
+{
+    PyObject *result, *stop;
+
+    switch (PyIter_Send(object, Py_None, &result)) {
+    case PYGEN_NEXT:
+        return result;
+    case PYGEN_RETURN:
+        if (result == Py_None) {
+            /* Exhausted */
+            Py_DECREF(result);
+            return NULL;
+        }
+        stop = PyObject_CallOneArg(PyExc_StopIteration, result);
+        Py_DECREF(result);
+        if (stop != NULL) {
+            PyErr_SetObject(PyExc_StopIteration, stop);
+            Py_DECREF(stop);
+        }
+        return NULL;
+    default:
+        return NULL;
+    }
 }
 
 static PyObject *
 wrap_iternext(PyObject *self)
 {
-    return PyIter_Next(Proxy_GET_OBJECT(self));
+    PyObject *object = wrapped_object(self);
+    iternextfunc iternext;
+    PyAsyncMethods *am;
+    PyObject *result;
+
+    if (object == NULL)
+        return NULL;
+    COUNT(self, iternext);
+    iternext = Py_TYPE(object)->tp_iternext;
+    am = Py_TYPE(object)->tp_as_async;
+    if (iternext != NULL)
+        /* Call the slot directly instead of going through PyIter_Next();
+           like any tp_iternext we may return with StopIteration set, so
+           there is no need to clear it here. */
+        result = iternext(object);
+    else if (am != NULL && am->am_send != NULL)
+        /* am_send isn't inherited, so PyIter_Send() on instances of
+           subclasses (as when asyncio steps a proxied coroutine) ends
+           up here. */
+        result = send_none(object);
+    else {
+        PyErr_Format(PyExc_TypeError, "'%.200s' object is not an iterator",
+                     Py_TYPE(object)->tp_name);
+        result = NULL;
+    }
+    Py_DECREF(object);
+    return result;
 }
 
 static void
@@ -156,21 +905,65 @@ wrap_dealloc(PyObject *self)
 {
     PyObject_GC_UnTrack(self);
     (void) wrap_clear(self);
-    self->ob_type->tp_free(self);
+    Py_TYPE(self)->tp_free(self);
+}
+
+/* The tp_dealloc and tp_traverse of our heap types, whose instances own
+ * a reference to their type.  (For Python subclasses of ProxyBase,
+ * CPython's own tp_dealloc and tp_traverse take care of that.)
+ */
+static void
+heap_wrap_dealloc(PyObject *self)
+{
+    PyTypeObject *type = Py_TYPE(self);
+
+    wrap_dealloc(self);
+    Py_DECREF(type);
+}
+
+static int
+heap_wrap_traverse(PyObject *self, visitproc visit, void *arg)
+{
+    Py_VISIT(Py_TYPE(self));
+    return wrap_traverse(self, visit, arg);
+}
+
+/* Whether type is ProxyBase, or the LazyProxyBase or BufferProxyBase of
+ * one of our module objects: the types whose attributes are those of
+ * the proxied object.
+ */
+static int
+is_proxy_base(PyTypeObject *type)
+{
+    PyObject *module;
+    module_state *state;
+
+    if (type == &ProxyType)
+        return 1;
+    if (!PyType_HasFeature(type, Py_TPFLAGS_HEAPTYPE))
+        return 0;
+    module = ((PyHeapTypeObject *)type)->ht_module;
+    if (module == NULL || PyModule_GetDef(module) != &moduledef)
+        return 0;
+    state = get_module_state(module);
+    return type == state->LazyProxyType || type == state->BufferProxyType;
 }
 
-/* A variant of _PyType_Lookup that doesn't look in ProxyType.
+/* A variant of _PyType_Lookup that doesn't look in ProxyType (or
+ * LazyProxyType or BufferProxyType).
  *
- * If argument search_wrappertype is nonzero, we can look in WrapperType.
+ * Returns a new reference, or NULL if name isn't found.
  */
-PyObject *
-WrapperType_Lookup(PyTypeObject *type, PyObject *name)
+static PyObject *
+WrapperType_FindInMRO(shared_state *state, PyTypeObject *type,
+                      PyObject *name)
 {
-    int i, n;
-    PyObject *mro, *res, *base, *dict;
+    int i, n, found;
+    PyObject *mro, *res = NULL, *base, *dict;
 
-    /* Look in tp_dict of types in MRO */
-    mro = type->tp_mro;
+    /* Look in tp_dict of types in MRO.  Hold on to the MRO, assigning
+       __bases__ replaces it. */
+    mro = Py_XNewRef(type->tp_mro);
 
     /* If mro is NULL, the type is either not yet initialized
        by PyType_Ready(), or already cleared by type_clear().
@@ -186,56 +979,245 @@ WrapperType_Lookup(PyTypeObject *type, PyObject *name)
     for (i = 0; i < n; i++) {
         base = PyTuple_GET_ITEM(mro, i);
 
-        if (((PyTypeObject *)base) != &ProxyType) {
+        if (!is_proxy_base((PyTypeObject *)base)) {
             assert(PyType_Check(base));
             dict = ((PyTypeObject *)base)->tp_dict;
             assert(dict && PyDict_Check(dict));
-            res = PyDict_GetItem(dict, name);
-            if (res != NULL)
-                return res;
+            found = PyDict_GetItemRef(dict, name, &res);
+            if (found > 0)
+                break;
+            if (found < 0)
+                /* Ignored, like _PyType_Lookup does. */
+                PyErr_Clear();
         }
     }
-    return NULL;
+    Py_DECREF(mro);
+    return res;
 }
 
+/*
+ *   Lookup cache.
+ *
+ *   Walking the MRO on every attribute access is expensive for deep
+ *   proxy class hierarchies, so the results of WrapperType_FindInMRO
+ *   (including "not found") are remembered in a small direct-mapped
+ *   table keyed by the type's version tag and the interned attribute
+ *   name.  CPython resets a type's version tag whenever the type or
+ *   one of its bases is modified, which makes stale entries
+ *   unreachable.  This is the same scheme CPython uses for its own
+ *   method cache, which our tp_getattro bypasses.
+ *
+ *   Like in CPython's cache, the values are borrowed: as long as the
+ *   version tag matches, the dictionaries in the MRO haven't changed
+ *   and still reference them.  Version tags are never reused, so the
+ *   entries of types that have gone away can't match.  That way the
+ *   cache doesn't keep the descriptors (and their functions) of deleted
+ *   classes alive.  The names are strong references; otherwise a new
+ *   name at the address of a freed one could match.
+ *
+ *   The table is shared by all threads, so free-threaded builds don't
+ *   use it; they would have to lock it on every attribute access.  It is
+ *   also shared by all interpreters, whose types may have the same
+ *   version tags, so the entries remember their interpreter.
+ */
 
-static PyObject *
-wrap_getattro(PyObject *self, PyObject *name)
-{
-    PyObject *wrapped;
-    PyObject *descriptor;
-    PyObject *res = NULL;
-    const char *name_as_string;
-    int maybe_special_name;
+#ifndef Py_GIL_DISABLED
 
-    name_as_string = PyUnicode_AsUTF8(name);
+#define LOOKUP_CACHE_HASH(version, name)                            \
+        (((unsigned int)(version) ^ (unsigned int)((size_t)(name) >> 3)) \
+         & (LOOKUP_CACHE_SIZE - 1))
 
-    if (name_as_string == NULL) {
-        return NULL;
+static unsigned int
+lookup_cache_version(PyTypeObject *type)
+{
+#if PY_VERSION_HEX >= 0x030C0000
+    return type->tp_version_tag;
+#else
+    if (!PyType_HasFeature(type, Py_TPFLAGS_VALID_VERSION_TAG))
+        return 0;
+    return type->tp_version_tag;
+#endif
+}
+
+static unsigned int
+lookup_cache_assign_version(PyTypeObject *type, PyObject *name)
+{
+#if PY_VERSION_HEX >= 0x030C0000
+    if (!PyUnstable_Type_AssignVersionTag(type))
+        return 0;
+#else
+    /* There is no public API to assign a version tag before 3.12,
+       but _PyType_Lookup() does so as a side effect. */
+    if (!PyType_HasFeature(type, Py_TPFLAGS_VALID_VERSION_TAG))
+        (void) _PyType_Lookup(type, name);
+#endif
+    return lookup_cache_version(type);
+}
+#endif /* Py_GIL_DISABLED */
+
+/* Returns a new reference, or NULL if name isn't found. */
+static PyObject *
+WrapperType_Lookup(shared_state *state, PyTypeObject *type,
+                   PyObject *name)
+{
+#ifdef Py_GIL_DISABLED
+    return WrapperType_FindInMRO(state, type, name);
+#else
+    PyInterpreterState *interp;
+    unsigned int version;
+    lookup_cache_entry *entry;
+    PyObject *res, *old_name;
+
+    if (!PyUnicode_CheckExact(name) || !PyUnicode_CHECK_INTERNED(name))
+        return WrapperType_FindInMRO(state, type, name);
+
+    interp = PyInterpreterState_Get();
+    version = lookup_cache_version(type);
+    if (version != 0) {
+        entry = &state->lookup_cache[LOOKUP_CACHE_HASH(version, name)];
+        if (entry->version == version && entry->name == name
+            && entry->interp == interp)
+            return Py_XNewRef(entry->value);
     }
 
-    wrapped = Proxy_GET_OBJECT(self);
-    if (wrapped == NULL) {
+    res = WrapperType_FindInMRO(state, type, name);
+
+    version = lookup_cache_assign_version(type, name);
+    if (version != 0) {
+        entry = &state->lookup_cache[LOOKUP_CACHE_HASH(version, name)];
+        old_name = entry->name;
+        entry->interp = interp;
+        entry->version = version;
+        entry->name = Py_NewRef(name);
+        entry->value = res;
+        Py_XDECREF(old_name);
+    }
+    return res;
+#endif
+}
+
+
+/* Names that are always looked up on the wrapped object, never on
+ * the proxy type.  The names in the module state are interned so that
+ * the common case of an interned attribute name can be compared by
+ * identity.
+ */
+static int
+is_wrapped_only_name(shared_state *state, PyObject *name)
+{
+    if (name == state->str__class__ || name == state->str__module__)
+        return 1;
+    if (PyUnicode_CheckExact(name) && PyUnicode_CHECK_INTERNED(name))
+        /* Interned and not identical, so it can't be equal. */
+        return 0;
+    return (PyUnicode_Compare(name, state->str__class__) == 0
+            || PyUnicode_Compare(name, state->str__module__) == 0);
+}
+
+/* The object proxied by self for attribute access; sets an exception
+ * naming the attribute if there is none.
+ */
+static PyObject *
+getattro_object(PyObject *self, PyObject *name)
+{
+    PyObject *wrapped = proxy_object(self);
+
+    if (wrapped == NULL && !PyErr_Occurred())
         PyErr_Format(PyExc_RuntimeError,
-            "object is NULL; requested to get attribute '%s'",
-            name_as_string);
-        goto finally;
+            "object is NULL; requested to get attribute '%U'",
+            name);
+    return wrapped;
+}
+
+/* Whether name is __reduce__ or __reduce_ex__; see is_wrapped_only_name. */
+static int
+is_reduce_name(shared_state *state, PyObject *name)
+{
+    if (name == state->str__reduce__ || name == state->str__reduce_ex__)
+        return 1;
+    if (PyUnicode_CheckExact(name) && PyUnicode_CHECK_INTERNED(name))
+        return 0;
+    return (PyUnicode_Compare(name, state->str__reduce__) == 0
+            || PyUnicode_Compare(name, state->str__reduce_ex__) == 0);
+}
+
+/* Look up the reducer registered for type or the nearest of its bases.
+ *
+ * Returns 1 and a new reference in *reducer if there is one, 0 if
+ * there is none and -1 on error.
+ */
+static int
+find_reducer(shared_state *state, PyTypeObject *type, PyObject **reducer)
+{
+    PyObject *mro = type->tp_mro;
+    Py_ssize_t i, n;
+    int found;
+
+    *reducer = NULL;
+    if (PyDict_GET_SIZE(state->reducers) == 0 || mro == NULL)
+        return 0;
+    n = PyTuple_GET_SIZE(mro);
+    for (i = 0; i < n; i++) {
+        found = PyDict_GetItemRef(state->reducers,
+                                  PyTuple_GET_ITEM(mro, i), reducer);
+        if (found != 0)
+            return found;
     }
+    return 0;
+}
+
+/* The bound __reduce__ or __reduce_ex__ method of ProxyBase if a
+ * reducer is registered for the type of self, so that pickle and copy
+ * use it instead of the methods of the proxied object.  Returns NULL
+ * without an exception if there is no reducer.
+ */
+static PyObject *
+reduce_method(shared_state *state, PyObject *self, PyObject *name)
+{
+    PyObject *reducer, *descriptor, *res;
+    int found = find_reducer(state, Py_TYPE(self), &reducer);
+
+    if (found <= 0)
+        return NULL;
+    Py_DECREF(reducer);
+    if (PyDict_GetItemRef(ProxyType.tp_dict, name, &descriptor) <= 0)
+        return NULL;
+    res = Py_TYPE(descriptor)->tp_descr_get(descriptor, self,
+                                            (PyObject *)Py_TYPE(self));
+    Py_DECREF(descriptor);
+    return res;
+}
+
+static PyObject *
+wrap_getattro(PyObject *self, PyObject *name)
+{
+    shared_state *state = &shared;
+    PyObject *wrapped;
+    PyObject *descriptor = NULL;
+    PyObject *res = NULL;
+    int from_proxy = 0;
+    PyTime_t start = TIMER_START(), in_wrapped = 0;
 
-    maybe_special_name = name_as_string[0] == '_' && name_as_string[1] == '_';
+    COUNT(self, getattro);
 
-    if (!(maybe_special_name
-          && (strcmp(name_as_string, "__class__") == 0
-              || strcmp(name_as_string, "__module__") == 0))) {
+    /* The proxied object is only fetched when it's needed, so that
+       attributes provided by the proxy class don't materialize lazy
+       proxies. */
+    if (!is_wrapped_only_name(state, name)) {
 
-        descriptor = WrapperType_Lookup(self->ob_type, name);
+        descriptor = WrapperType_Lookup(state, self->ob_type, name);
 
         if (descriptor != NULL) {
             if (descriptor->ob_type->tp_descr_get != NULL
             ){
               if (descriptor->ob_type->tp_descr_set == NULL)
                 {
-                  res = PyObject_GetAttr(wrapped, name);
+                  wrapped = getattro_object(self, name);
+                  if (wrapped == NULL)
+                    goto finally;
+                  TIME_WRAPPED(start, in_wrapped,
+                               res = PyObject_GetAttr(wrapped, name));
+                  Py_DECREF(wrapped);
                   if (res != NULL)
                     goto finally;
                   if (PyErr_ExceptionMatches(PyExc_AttributeError))
@@ -255,30 +1237,45 @@ wrap_getattro(PyObject *self, PyObject *name)
                 res = descriptor;
             }
 
+            from_proxy = 1;
             goto finally;
         }
+
+        if (is_reduce_name(state, name)) {
+            res = reduce_method(state, self, name);
+            from_proxy = 1;
+            if (res != NULL || PyErr_Occurred())
+                goto finally;
+            from_proxy = 0;
+        }
+    }
+    wrapped = getattro_object(self, name);
+    if (wrapped != NULL) {
+        TIME_WRAPPED(start, in_wrapped,
+                     res = PyObject_GetAttr(wrapped, name));
+        Py_DECREF(wrapped);
     }
-    res = PyObject_GetAttr(wrapped, name);
 
 finally:
+    Py_XDECREF(descriptor);
+    if (res != NULL && STATS_ENABLED())
+        sample_attribute(state, self, name, from_proxy);
+    TIME_STAT(self, getattro, start, in_wrapped);
     return res;
 }
 
 static int
 wrap_setattro(PyObject *self, PyObject *name, PyObject *value)
 {
+    shared_state *state = &shared;
     PyObject *wrapped;
     PyObject *descriptor;
-    const char *name_as_string;
     int res = -1;
+    PyTime_t start = TIMER_START(), in_wrapped = 0;
 
-    name_as_string = PyUnicode_AsUTF8(name);
-
-    if (name_as_string == NULL) {
-        goto finally;
-    }
+    COUNT(self, setattro);
 
-    descriptor = WrapperType_Lookup(self->ob_type, name);
+    descriptor = WrapperType_Lookup(state, self->ob_type, name);
 
     if (descriptor != NULL
         && descriptor->ob_type->tp_descr_set != NULL)
@@ -287,43 +1284,108 @@ wrap_setattro(PyObject *self, PyObject *name, PyObject *value)
         goto finally;
       }
 
-    wrapped = Proxy_GET_OBJECT(self);
+    wrapped = proxy_object(self);
     if (wrapped == NULL) {
-        PyErr_Format(PyExc_RuntimeError,
-            "object is NULL; requested to set attribute '%s'",
-            name_as_string);
+        if (!PyErr_Occurred())
+            PyErr_Format(PyExc_RuntimeError,
+                "object is NULL; requested to set attribute '%U'",
+                name);
         goto finally;
     }
-    res = PyObject_SetAttr(wrapped, name, value);
+    TIME_WRAPPED(start, in_wrapped,
+                 res = PyObject_SetAttr(wrapped, name, value));
+    Py_DECREF(wrapped);
 
 finally:
+    Py_XDECREF(descriptor);
+    TIME_STAT(self, setattro, start, in_wrapped);
     return res;
 }
 
 static PyObject *
 wrap_str(PyObject *wrapper) {
-    return PyObject_Str(Proxy_GET_OBJECT(wrapper));
+    PyObject *object = wrapped_object(wrapper);
+    PyObject *result;
+
+    if (object == NULL)
+        return NULL;
+    COUNT(wrapper, str);
+    result = PyObject_Str(object);
+    Py_DECREF(object);
+    return result;
 }
 
 static PyObject *
 wrap_repr(PyObject *wrapper)
 {
-    return PyObject_Repr(Proxy_GET_OBJECT(wrapper));
+    PyObject *object = wrapped_object(wrapper);
+    PyObject *result;
+
+    if (object == NULL)
+        return NULL;
+    COUNT(wrapper, repr);
+    result = PyObject_Repr(object);
+    Py_DECREF(object);
+    return result;
 }
 
 static Py_hash_t
 wrap_hash(PyObject *self)
 {
-    return PyObject_Hash(Proxy_GET_OBJECT(self));
+    PyObject *object = wrapped_object(self);
+    Py_hash_t result;
+
+    if (object == NULL)
+        return -1;
+    COUNT(self, hash);
+    result = PyObject_Hash(object);
+    Py_DECREF(object);
+    return result;
 }
 
 static PyObject *
 wrap_call(PyObject *self, PyObject *args, PyObject *kw)
 {
-    if (kw)
-        return PyObject_Call(Proxy_GET_OBJECT(self), args, kw);
-    else
-        return PyObject_CallObject(Proxy_GET_OBJECT(self), args);
+    PyTime_t start = TIMER_START(), in_wrapped = 0;
+    PyObject *object = wrapped_object(self);
+    PyObject *result;
+
+    if (object == NULL)
+        return NULL;
+    COUNT(self, call);
+    TIME_WRAPPED(start, in_wrapped,
+                 result = PyObject_Call(object, args, kw));
+    Py_DECREF(object);
+    TIME_STAT(self, call, start, in_wrapped);
+    return result;
+}
+
+/* Calls through the proxy without building an argument tuple.
+ *
+ * Only installed on instances of types that don't override __call__;
+ * CPython clears Py_TPFLAGS_HAVE_VECTORCALL for those and uses tp_call.
+ */
+static PyObject *
+wrap_vectorcall(PyObject *self, PyObject *const *args,
+                size_t nargsf, PyObject *kwnames)
+{
+    PyTime_t start = TIMER_START(), in_wrapped = 0;
+    PyObject *wrapped = proxy_object(self);
+    PyObject *result;
+
+    if (wrapped == NULL) {
+        if (!PyErr_Occurred())
+            PyErr_SetString(PyExc_RuntimeError,
+                            "object is NULL; cannot call");
+        return NULL;
+    }
+    COUNT(self, call);
+    TIME_WRAPPED(start, in_wrapped,
+                 result = PyObject_Vectorcall(wrapped, args, nargsf,
+                                              kwnames));
+    Py_DECREF(wrapped);
+    TIME_STAT(self, call, start, in_wrapped);
+    return result;
 }
 
 /*
@@ -360,11 +1422,16 @@ call_ipow(PyObject *self, PyObject *other)
 typedef PyObject *(*function1)(PyObject *);
 
 static PyObject *
-check1(ProxyObject *self, char *opname, function1 operation)
+check1(ProxyObject *self, proxy_stat stat, function1 operation)
 {
     PyObject *result = NULL;
+    PyObject *object = wrapped_object((PyObject *)self);
 
-    result = operation(Proxy_GET_OBJECT(self));
+    if (object == NULL)
+        return NULL;
+    COUNT_STAT(self, stat);
+    result = operation(object);
+    Py_DECREF(object);
 #if 0
     if (result != NULL)
         /* ??? create proxy for result? */
@@ -375,18 +1442,26 @@ check1(ProxyObject *self, char *opname, function1 operation)
 
 static PyObject *
 check2(PyObject *self, PyObject *other,
-       char *opname, char *ropname, binaryfunc operation)
+       proxy_stat stat, binaryfunc operation)
 {
     PyObject *result = NULL;
     PyObject *object;
 
     if (Proxy_Check(self)) {
-        object = Proxy_GET_OBJECT(self);
+        object = wrapped_object(self);
+        if (object == NULL)
+            return NULL;
+        COUNT_STAT(self, stat);
         result = operation(object, other);
+        Py_DECREF(object);
     }
     else if (Proxy_Check(other)) {
-        object = Proxy_GET_OBJECT(other);
+        object = wrapped_object(other);
+        if (object == NULL)
+            return NULL;
+        COUNT_STAT(other, stat);
         result = operation(self, object);
+        Py_DECREF(object);
     }
     else {
         Py_INCREF(Py_NotImplemented);
@@ -402,19 +1477,23 @@ check2(PyObject *self, PyObject *other,
 
 static PyObject *
 check2i(ProxyObject *self, PyObject *other,
-        char *opname, binaryfunc operation)
+        proxy_stat stat, binaryfunc operation)
 {
         PyObject *result = NULL;
-        PyObject *object = Proxy_GET_OBJECT(self);
+        PyObject *object = wrapped_object((PyObject *)self);
 
+        if (object == NULL)
+            return NULL;
+        COUNT_STAT(self, stat);
         result = operation(object, other);
         if (result == object) {
             /* If the operation was really carried out inplace,
                don't create a new proxy, but use the old one. */
             Py_INCREF(self);
-            Py_DECREF(object);
+            Py_DECREF(result);
             result = (PyObject *)self;
         }
+        Py_DECREF(object);
 #if 0
         else if (result != NULL)
             /* ??? create proxy for result? */
@@ -425,15 +1504,15 @@ check2i(ProxyObject *self, PyObject *other,
 
 #define UNOP(NAME, CALL) \
         static PyObject *wrap_##NAME(PyObject *self) \
-        { return check1((ProxyObject *)self, "__"#NAME"__", CALL); }
+        { return check1((ProxyObject *)self, STAT_##NAME, CALL); }
 
 #define BINOP(NAME, CALL) \
         static PyObject *wrap_##NAME(PyObject *self, PyObject *other) \
-        { return check2(self, other, "__"#NAME"__", "__r"#NAME"__", CALL); }
+        { return check2(self, other, STAT_##NAME, CALL); }
 
 #define INPLACE(NAME, CALL) \
         static PyObject *wrap_i##NAME(PyObject *self, PyObject *other) \
-        { return check2i((ProxyObject *)self, other, "__i"#NAME"__", CALL); }
+        { return check2i((ProxyObject *)self, other, STAT_i##NAME, CALL); }
 
 BINOP(add, PyNumber_Add)
 BINOP(sub, PyNumber_Subtract)
@@ -448,16 +1527,28 @@ wrap_pow(PyObject *self, PyObject *other, PyObject *modulus)
     PyObject *object;
 
     if (Proxy_Check(self)) {
-        object = Proxy_GET_OBJECT(self);
+        object = wrapped_object(self);
+        if (object == NULL)
+            return NULL;
+        COUNT(self, pow);
         result = PyNumber_Power(object, other, modulus);
+        Py_DECREF(object);
     }
     else if (Proxy_Check(other)) {
-        object = Proxy_GET_OBJECT(other);
+        object = wrapped_object(other);
+        if (object == NULL)
+            return NULL;
+        COUNT(other, pow);
         result = PyNumber_Power(self, object, modulus);
+        Py_DECREF(object);
     }
     else if (modulus != NULL && Proxy_Check(modulus)) {
-        object = Proxy_GET_OBJECT(modulus);
+        object = wrapped_object(modulus);
+        if (object == NULL)
+            return NULL;
+        COUNT(modulus, pow);
         result = PyNumber_Power(self, other, modulus);
+        Py_DECREF(object);
     }
     else {
         Py_INCREF(Py_NotImplemented);
@@ -496,12 +1587,22 @@ BINOP(truediv, PyNumber_TrueDivide)
 INPLACE(floordiv, PyNumber_InPlaceFloorDivide)
 INPLACE(truediv, PyNumber_InPlaceTrueDivide)
 UNOP(index, call_index)
+BINOP(matmul, PyNumber_MatrixMultiply)
+INPLACE(matmul, PyNumber_InPlaceMatrixMultiply)
 
 
 static int
 wrap_bool(PyObject *self)
 {
-    return PyObject_IsTrue(Proxy_GET_OBJECT(self));
+    PyObject *object = wrapped_object(self);
+    int result;
+
+    if (object == NULL)
+        return -1;
+    COUNT(self, bool);
+    result = PyObject_IsTrue(object);
+    Py_DECREF(object);
+    return result;
 }
 
 /*
@@ -511,13 +1612,150 @@ wrap_bool(PyObject *self)
 static Py_ssize_t
 wrap_length(PyObject *self)
 {
-    return PyObject_Length(Proxy_GET_OBJECT(self));
+    PyObject *object = wrapped_object(self);
+    Py_ssize_t result;
+
+    if (object == NULL)
+        return -1;
+    COUNT(self, len);
+    result = PyObject_Length(object);
+    Py_DECREF(object);
+    return result;
 }
 
 static int
 wrap_contains(PyObject *self, PyObject *value)
 {
-    return PySequence_Contains(Proxy_GET_OBJECT(self), value);
+    PyObject *object = wrapped_object(self);
+    int result;
+
+    if (object == NULL)
+        return -1;
+    COUNT(self, contains);
+    result = PySequence_Contains(object, value);
+    Py_DECREF(object);
+    return result;
+}
+
+/* Every proxy has the sequence slots, so PySequence_Check() is true
+ * for proxies of mappings, too.  Their items can't be accessed by
+ * position, though, even if the type of the proxied object (such as a
+ * dict subclass defining __getitem__) has the slots.
+ */
+static int
+check_sequence(PyObject *object)
+{
+    if (PySequence_Check(object))
+        return 0;
+    PyErr_Format(PyExc_TypeError, "'%.200s' object is not a sequence",
+                 Py_TYPE(object)->tp_name);
+    return -1;
+}
+
+/* PySequence_GetItem() and friends have already added the proxy's
+ * length to a negative index, so the index is passed on unchanged.
+ */
+static PyObject *
+wrap_item(PyObject *self, Py_ssize_t i)
+{
+    PyObject *object = wrapped_object(self);
+    PyObject *result;
+
+    if (object == NULL)
+        return NULL;
+    COUNT(self, item);
+    if (check_sequence(object) < 0)
+        result = NULL;
+    else
+        result = PySequence_GetItem(object, i);
+    Py_DECREF(object);
+    return result;
+}
+
+static int
+wrap_ass_item(PyObject *self, Py_ssize_t i, PyObject *value)
+{
+    PyObject *object = wrapped_object(self);
+    int result;
+
+    if (object == NULL)
+        return -1;
+    COUNT(self, ass_item);
+    if (check_sequence(object) < 0)
+        result = -1;
+    else if (value == NULL)
+        result = PySequence_DelItem(object, i);
+    else
+        result = PySequence_SetItem(object, i, value);
+    Py_DECREF(object);
+    return result;
+}
+
+static PyObject *
+wrap_concat(PyObject *self, PyObject *other)
+{
+    PyObject *object = wrapped_object(self);
+    PyObject *result;
+
+    if (object == NULL)
+        return NULL;
+    COUNT(self, concat);
+    result = PySequence_Concat(object, other);
+    Py_DECREF(object);
+    return result;
+}
+
+static PyObject *
+wrap_repeat(PyObject *self, Py_ssize_t count)
+{
+    PyObject *object = wrapped_object(self);
+    PyObject *result;
+
+    if (object == NULL)
+        return NULL;
+    COUNT(self, repeat);
+    result = PySequence_Repeat(object, count);
+    Py_DECREF(object);
+    return result;
+}
+
+/* As with check2i(), keep the proxy if the operation was carried out
+ * in place.
+ */
+static PyObject *
+inplace_result(PyObject *self, PyObject *object, PyObject *result)
+{
+    if (result == object) {
+        Py_INCREF(self);
+        Py_DECREF(result);
+        result = self;
+    }
+    Py_DECREF(object);
+    return result;
+}
+
+static PyObject *
+wrap_inplace_concat(PyObject *self, PyObject *other)
+{
+    PyObject *object = wrapped_object(self);
+
+    if (object == NULL)
+        return NULL;
+    COUNT(self, iconcat);
+    return inplace_result(self, object,
+                          PySequence_InPlaceConcat(object, other));
+}
+
+static PyObject *
+wrap_inplace_repeat(PyObject *self, Py_ssize_t count)
+{
+    PyObject *object = wrapped_object(self);
+
+    if (object == NULL)
+        return NULL;
+    COUNT(self, irepeat);
+    return inplace_result(self, object,
+                          PySequence_InPlaceRepeat(object, count));
 }
 
 /*
@@ -526,16 +1764,136 @@ wrap_contains(PyObject *self, PyObject *value)
 
 static PyObject *
 wrap_getitem(PyObject *wrapper, PyObject *v) {
-    return PyObject_GetItem(Proxy_GET_OBJECT(wrapper), v);
+    PyObject *object = wrapped_object(wrapper);
+    PyObject *result;
+
+    if (object == NULL)
+        return NULL;
+    COUNT(wrapper, getitem);
+    result = PyObject_GetItem(object, v);
+    Py_DECREF(object);
+    return result;
 }
 
 static int
 wrap_setitem(PyObject *self, PyObject *key, PyObject *value)
 {
+    PyObject *object = wrapped_object(self);
+    int result;
+
+    if (object == NULL)
+        return -1;
+    COUNT(self, setitem);
     if (value == NULL)
-        return PyObject_DelItem(Proxy_GET_OBJECT(self), key);
+        result = PyObject_DelItem(object, key);
     else
-        return PyObject_SetItem(Proxy_GET_OBJECT(self), key, value);
+        result = PyObject_SetItem(object, key, value);
+    Py_DECREF(object);
+    return result;
+}
+
+/*
+ *   Buffer methods
+ */
+
+/* The view is filled in by the proxied object and references it in
+ * view->obj, so PyBuffer_Release() hands it back to that object even
+ * if the proxy has been pointed elsewhere since; there is no
+ * bf_releasebuffer.
+ */
+static int
+wrap_getbuffer(PyObject *self, Py_buffer *view, int flags)
+{
+    PyObject *object = wrapped_object(self);
+    int result;
+
+    if (object == NULL)
+        return -1;
+    COUNT(self, getbuffer);
+    result = PyObject_GetBuffer(object, view, flags);
+    Py_DECREF(object);
+    return result;
+}
+
+/*
+ *   Async methods
+ */
+
+static PyObject *
+wrap_await(PyObject *self)
+{
+    PyObject *object = wrapped_object(self);
+    PyAsyncMethods *am;
+    PyObject *result;
+
+    if (object == NULL)
+        return NULL;
+    COUNT(self, await);
+    am = Py_TYPE(object)->tp_as_async;
+    if (am != NULL && am->am_await != NULL)
+        result = am->am_await(object);
+    else {
+        PyErr_Format(PyExc_TypeError,
+                     "object %.100s can't be used in 'await' expression",
+                     Py_TYPE(object)->tp_name);
+        result = NULL;
+    }
+    Py_DECREF(object);
+    return result;
+}
+
+static PyObject *
+wrap_aiter(PyObject *self)
+{
+    PyObject *object = wrapped_object(self);
+    PyObject *result;
+
+    if (object == NULL)
+        return NULL;
+    COUNT(self, aiter);
+    result = PyObject_GetAIter(object);
+    Py_DECREF(object);
+    return result;
+}
+
+static PyObject *
+wrap_anext(PyObject *self)
+{
+    PyObject *object = wrapped_object(self);
+    PyAsyncMethods *am;
+    PyObject *result;
+
+    if (object == NULL)
+        return NULL;
+    COUNT(self, anext);
+    am = Py_TYPE(object)->tp_as_async;
+    if (am != NULL && am->am_anext != NULL)
+        result = am->am_anext(object);
+    else {
+        PyErr_Format(PyExc_TypeError,
+                     "'%.200s' object is not an async iterator",
+                     Py_TYPE(object)->tp_name);
+        result = NULL;
+    }
+    Py_DECREF(object);
+    return result;
+}
+
+/* Used by PyIter_Send(), e.g. when asyncio steps a proxied coroutine. */
+static PySendResult
+wrap_send(PyObject *self, PyObject *value, PyObject **result)
+{
+    PyObject *object = wrapped_object(self);
+    PySendResult status;
+
+    if (object == NULL) {
+        *result = NULL;
+        return PYGEN_ERROR;
+    }
+    COUNT(self, send);
+    status = PyIter_Send(object, value, result);
+    Py_DECREF(object);
+    return status;
 }
 
 /*
@@ -545,14 +1903,34 @@ wrap_setitem(PyObject *self, PyObject *key, PyObject *value)
 static char
 reduce__doc__[] =
 "__reduce__()\n"
-"Raise an exception; this prevents proxies from being picklable by\n"
-"default, even if the underlying object is picklable.";
+"Call the reducer registered for the type of the proxy with\n"
+"registerProxyReducer().  Without one, raise an exception; this\n"
+"prevents proxies from being picklable by default, even if the\n"
+"underlying object is picklable.";
+
+static char
+reduce_ex__doc__[] =
+"__reduce_ex__(protocol)\n"
+"Like __reduce__(); the protocol is ignored.";
 
 static PyObject *
 wrap_reduce(PyObject *self)
 {
+    PyObject *reducer, *res;
     PyObject *pickle_error = NULL;
-    PyObject *pickle = PyImport_ImportModule("pickle");
+    PyObject *pickle;
+    int found;
+
+    found = find_reducer(&shared, Py_TYPE(self), &reducer);
+    if (found < 0)
+        return NULL;
+    if (found) {
+        res = PyObject_CallOneArg(reducer, self);
+        Py_DECREF(reducer);
+        return res;
+    }
+
+    pickle = PyImport_ImportModule("pickle");
 
     if (pickle == NULL)
         PyErr_Clear();
@@ -571,72 +1949,97 @@ wrap_reduce(PyObject *self)
     return NULL;
 }
 
-static PyNumberMethods
-wrap_as_number = {
-    wrap_add,                               /* nb_add */
-    wrap_sub,                               /* nb_subtract */
-    wrap_mul,                               /* nb_multiply */
-    wrap_mod,                               /* nb_remainder */
-    wrap_divmod,                            /* nb_divmod */
-    wrap_pow,                               /* nb_power */
-    wrap_neg,                               /* nb_negative */
-    wrap_pos,                               /* nb_positive */
-    wrap_abs,                               /* nb_absolute */
-    wrap_bool,                              /* nb_bool, formerly nb_nonzero */
-    wrap_invert,                            /* nb_invert */
-    wrap_lshift,                            /* nb_lshift */
-    wrap_rshift,                            /* nb_rshift */
-    wrap_and,                               /* nb_and */
-    wrap_xor,                               /* nb_xor */
-    wrap_or,                                /* nb_or */
-    wrap_int,                               /* nb_int */
-    0,                                      /* formerly known as nb_long */
-    wrap_float,                             /* nb_float */
+static PyObject *
+wrap_reduce_ex(PyObject *self, PyObject *protocol)
+{
+    return wrap_reduce(self);
+}
 
-    /* Added in release 2.0 */
-    /* These require the Py_TPFLAGS_HAVE_INPLACEOPS flag */
-    wrap_iadd,                              /* nb_inplace_add */
-    wrap_isub,                              /* nb_inplace_subtract */
-    wrap_imul,                              /* nb_inplace_multiply */
-    wrap_imod,                              /* nb_inplace_remainder */
-    (ternaryfunc)wrap_ipow,                 /* nb_inplace_power */
-    wrap_ilshift,                           /* nb_inplace_lshift */
-    wrap_irshift,                           /* nb_inplace_rshift */
-    wrap_iand,                              /* nb_inplace_and */
-    wrap_ixor,                              /* nb_inplace_xor */
-    wrap_ior,                               /* nb_inplace_or */
+/* There is no slot for complex(); without this it would fall back to
+   float(). */
+static PyObject *
+wrap_complex(PyObject *self, PyObject *unused)
+{
+    PyObject *object = wrapped_object(self);
+    PyObject *result;
 
-    /* Added in release 2.2 */
-    /* These require the Py_TPFLAGS_HAVE_CLASS flag */
-    wrap_floordiv,                          /* nb_floor_divide */
-    wrap_truediv,                           /* nb_true_divide */
-    wrap_ifloordiv,                         /* nb_inplace_floor_divide */
-    wrap_itruediv,                          /* nb_inplace_true_divide */
-    wrap_index,                             /* nb_index */
-};
+    if (object == NULL)
+        return NULL;
+    result = PyObject_CallOneArg((PyObject *)&PyComplex_Type, object);
+    Py_DECREF(object);
+    return result;
+}
 
-static PySequenceMethods
-wrap_as_sequence = {
-    wrap_length,                            /* sq_length */
-    0,                                      /* sq_concat */
-    0,                                      /* sq_repeat */
-    0,                                      /* sq_item */
-    0,                                      /* sq_slice, unused */
-    0,                                      /* sq_ass_item */
-    0,                                      /* sq_ass_slice, unused */
-    wrap_contains,                          /* sq_contains */
-};
+/* bytes() looks up __bytes__ before the buffer protocol, so forward to
+   bytes() itself to keep its handling of integers and iterables. */
+static PyObject *
+wrap_bytes(PyObject *self, PyObject *unused)
+{
+    PyObject *object = wrapped_object(self);
+    PyObject *result;
 
-static PyMappingMethods
-wrap_as_mapping = {
-    wrap_length,                            /* mp_length */
-    wrap_getitem,                           /* mp_subscript */
-    wrap_setitem,                           /* mp_ass_subscript */
-};
+    if (object == NULL)
+        return NULL;
+    result = PyObject_CallOneArg((PyObject *)&PyBytes_Type, object);
+    Py_DECREF(object);
+    return result;
+}
+
+static PyObject *
+wrap_format(PyObject *self, PyObject *format_spec)
+{
+    PyObject *object = wrapped_object(self);
+    PyObject *result;
+
+    if (object == NULL)
+        return NULL;
+    result = PyObject_Format(object, format_spec);
+    Py_DECREF(object);
+    return result;
+}
+
+static PyObject *
+wrap_reversed(PyObject *self, PyObject *unused)
+{
+    PyObject *object = wrapped_object(self);
+    PyObject *result;
+
+    if (object == NULL)
+        return NULL;
+    result = PyObject_CallOneArg((PyObject *)&PyReversed_Type, object);
+    Py_DECREF(object);
+    return result;
+}
+
+/* operator.length_hint() only gets here if len() of the proxied object
+   failed; return NotImplemented if it doesn't have a hint either. */
+static PyObject *
+wrap_length_hint(PyObject *self, PyObject *unused)
+{
+    PyObject *object = wrapped_object(self);
+    Py_ssize_t hint;
+
+    if (object == NULL)
+        return NULL;
+    hint = PyObject_LengthHint(object, -1);
+    Py_DECREF(object);
+    if (hint < 0) {
+        if (PyErr_Occurred())
+            return NULL;
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+    return PyLong_FromSsize_t(hint);
+}
 
 static PyMethodDef
 wrap_methods[] = {
     {"__reduce__", (PyCFunction)wrap_reduce, METH_NOARGS, reduce__doc__},
+    {"__reduce_ex__", wrap_reduce_ex, METH_O, reduce_ex__doc__},
+    {"__complex__", wrap_complex, METH_NOARGS, NULL},
+    {"__bytes__", wrap_bytes, METH_NOARGS, NULL},
+    {"__format__", wrap_format, METH_O, NULL},
+    {"__reversed__", wrap_reversed, METH_NOARGS, NULL},
+    {"__length_hint__", wrap_length_hint, METH_NOARGS, NULL},
     {NULL, NULL},
 };
 
@@ -651,17 +2054,105 @@ wrap_methods[] = {
  */
 
 
+static PyMemberDef
+wrap_members[] = {
+    {"__vectorcalloffset__", Py_T_PYSSIZET,
+     offsetof(ProxyBaseObject, vectorcall), Py_READONLY},
+    {NULL},
+};
+
+static PyAsyncMethods
+wrap_as_async = {
+    wrap_await,                             /* am_await */
+    wrap_aiter,                             /* am_aiter */
+    wrap_anext,                             /* am_anext */
+    wrap_send,                              /* am_send */
+};
+
+static PyNumberMethods
+wrap_as_number = {
+    wrap_add,                               /* nb_add */
+    wrap_sub,                               /* nb_subtract */
+    wrap_mul,                               /* nb_multiply */
+    wrap_mod,                               /* nb_remainder */
+    wrap_divmod,                            /* nb_divmod */
+    wrap_pow,                               /* nb_power */
+    wrap_neg,                               /* nb_negative */
+    wrap_pos,                               /* nb_positive */
+    wrap_abs,                               /* nb_absolute */
+    wrap_bool,                              /* nb_bool, formerly nb_nonzero */
+    wrap_invert,                            /* nb_invert */
+    wrap_lshift,                            /* nb_lshift */
+    wrap_rshift,                            /* nb_rshift */
+    wrap_and,                               /* nb_and */
+    wrap_xor,                               /* nb_xor */
+    wrap_or,                                /* nb_or */
+    wrap_int,                               /* nb_int */
+    0,                                      /* formerly known as nb_long */
+    wrap_float,                             /* nb_float */
+
+    /* Added in release 2.0 */
+    /* These require the Py_TPFLAGS_HAVE_INPLACEOPS flag */
+    wrap_iadd,                              /* nb_inplace_add */
+    wrap_isub,                              /* nb_inplace_subtract */
+    wrap_imul,                              /* nb_inplace_multiply */
+    wrap_imod,                              /* nb_inplace_remainder */
+    (ternaryfunc)wrap_ipow,                 /* nb_inplace_power */
+    wrap_ilshift,                           /* nb_inplace_lshift */
+    wrap_irshift,                           /* nb_inplace_rshift */
+    wrap_iand,                              /* nb_inplace_and */
+    wrap_ixor,                              /* nb_inplace_xor */
+    wrap_ior,                               /* nb_inplace_or */
+
+    /* Added in release 2.2 */
+    /* These require the Py_TPFLAGS_HAVE_CLASS flag */
+    wrap_floordiv,                          /* nb_floor_divide */
+    wrap_truediv,                           /* nb_true_divide */
+    wrap_ifloordiv,                         /* nb_inplace_floor_divide */
+    wrap_itruediv,                          /* nb_inplace_true_divide */
+    wrap_index,                             /* nb_index */
+
+    /* Added in release 3.5 */
+    wrap_matmul,                            /* nb_matrix_multiply */
+    wrap_imatmul,                           /* nb_inplace_matrix_multiply */
+};
+
+static PySequenceMethods
+wrap_as_sequence = {
+    wrap_length,                            /* sq_length */
+    wrap_concat,                            /* sq_concat */
+    wrap_repeat,                            /* sq_repeat */
+    wrap_item,                              /* sq_item */
+    0,                                      /* sq_slice, unused */
+    wrap_ass_item,                          /* sq_ass_item */
+    0,                                      /* sq_ass_slice, unused */
+    wrap_contains,                          /* sq_contains */
+    wrap_inplace_concat,                    /* sq_inplace_concat */
+    wrap_inplace_repeat,                    /* sq_inplace_repeat */
+};
+
+static PyMappingMethods
+wrap_as_mapping = {
+    wrap_length,                            /* mp_length */
+    wrap_getitem,                           /* mp_subscript */
+    wrap_setitem,                           /* mp_ass_subscript */
+};
+
+/* ProxyBase is a static type, shared by all interpreters, so that C
+ * extensions (e.g. zope.security) can keep deriving static types from
+ * the type handed out by the _CAPI capsule.
+ */
 static PyTypeObject
 ProxyType = {
     PyVarObject_HEAD_INIT(NULL, 0)
     "zope.proxy.ProxyBase",
-    sizeof(ProxyObject),
+    sizeof(ProxyBaseObject),
     0,
     wrap_dealloc,                           /* tp_dealloc */
-    0,                                      /* tp_vectorcall_offset */
+    offsetof(ProxyBaseObject, vectorcall),  /* tp_vectorcall_offset */
     0,                                      /* tp_getattr */
     0,                                      /* tp_setattr */
-    0,                                      /* tp_reserved */
+    &wrap_as_async,                         /* tp_as_async */
     wrap_repr,                              /* tp_repr */
     &wrap_as_number,                        /* tp_as_number */
     &wrap_as_sequence,                      /* tp_as_sequence */
@@ -674,6 +2165,7 @@ ProxyType = {
     0,                                      /* tp_as_buffer */
     Py_TPFLAGS_DEFAULT |
     Py_TPFLAGS_HAVE_GC |
+    Py_TPFLAGS_HAVE_VECTORCALL |
     Py_TPFLAGS_BASETYPE,                    /* tp_flags */
     0,                                      /* tp_doc */
     wrap_traverse,                          /* tp_traverse */
@@ -696,18 +2188,776 @@ ProxyType = {
     0, /*PyObject_GC_Del,*/                 /* tp_free */
 };
 
+/*
+ *   Buffer proxies.
+ *
+ *   Only proxies of this type forward the buffer protocol.  Having a
+ *   bf_getbuffer slot makes bytes(), bytearray() and others treat the
+ *   proxy as a buffer, even if the proxied object isn't one.
+ */
+
+static char
+buffer__doc__[] =
+"BufferProxyBase(object)\n"
+"\n"
+"A proxy that also forwards the buffer protocol to the object.\n"
+;
+
+static PyType_Slot
+BufferProxyType_slots[] = {
+    {Py_tp_dealloc, heap_wrap_dealloc},
+    {Py_tp_doc, (void *)buffer__doc__},
+    {Py_tp_traverse, heap_wrap_traverse},
+    {Py_tp_clear, wrap_clear},
+    {Py_tp_members, wrap_members},
+    {Py_bf_getbuffer, wrap_getbuffer},
+    {0, NULL},
+};
+
+static PyType_Spec
+BufferProxyType_spec = {
+    "zope.proxy.BufferProxyBase",
+    sizeof(ProxyBaseObject),
+    0,
+    Py_TPFLAGS_DEFAULT |
+    Py_TPFLAGS_HAVE_GC |
+    Py_TPFLAGS_HAVE_VECTORCALL |
+    Py_TPFLAGS_IMMUTABLETYPE |
+    Py_TPFLAGS_BASETYPE,
+    BufferProxyType_slots,
+};
+
+/*
+ *   Lazy proxies.
+ */
+
+static int
+check_factory(PyObject *factory)
+{
+    if (!PyCallable_Check(factory)) {
+        PyErr_Format(PyExc_TypeError,
+                     "expected callable factory, got %s",
+                     Py_TYPE(factory)->tp_name);
+        return -1;
+    }
+    return 0;
+}
+
+static PyObject *
+lazy_new(PyTypeObject *type, PyObject *args, PyObject *kwds)
+{
+    PyObject *result = NULL;
+    PyObject *factory;
+
+    if (PyArg_UnpackTuple(args, "__new__", 1, 1, &factory)) {
+        if (kwds != NULL && PyDict_Size(kwds) != 0) {
+            PyErr_SetString(PyExc_TypeError,
+                            "proxy.__new__ does not accept keyword args");
+            return NULL;
+        }
+        if (check_factory(factory) < 0)
+            return NULL;
+        result = PyType_GenericNew(type, args, kwds);
+        if (result != NULL) {
+            LazyProxyObject *lazy = (LazyProxyObject *) result;
+            Py_INCREF(factory);
+            lazy->factory = factory;
+            init_vectorcall(result);
+        }
+    }
+    return result;
+}
+
+static int
+lazy_init(PyObject *self, PyObject *args, PyObject *kwds)
+{
+    LazyProxyObject *lazy = (LazyProxyObject *)self;
+    PyObject *factory;
+
+    if (!PyArg_UnpackTuple(args, "__init__", 1, 1, &factory))
+        return -1;
+    if (kwds != NULL && PyDict_Size(kwds) != 0) {
+        PyErr_SetString(PyExc_TypeError,
+                        "proxy.__init__ does not accept keyword args");
+        return -1;
+    }
+    /* If the factory of this proxy is not the one we received in
+     * args, start over with the new one.
+     */
+    if (lazy->factory != factory) {
+        PyObject *old_factory, *old_object;
+
+        if (check_factory(factory) < 0)
+            return -1;
+        Py_BEGIN_CRITICAL_SECTION(self);
+        old_factory = lazy->factory;
+        old_object = Proxy_GET_OBJECT(self);
+        lazy->factory = Py_NewRef(factory);
+        Proxy_GET_OBJECT(self) = NULL;
+        Py_END_CRITICAL_SECTION();
+        Py_XDECREF(old_factory);
+        Py_XDECREF(old_object);
+    }
+    return 0;
+}
+
+static int
+lazy_traverse(PyObject *self, visitproc visit, void *arg)
+{
+    Py_VISIT(((LazyProxyObject *)self)->factory);
+    return heap_wrap_traverse(self, visit, arg);
+}
+
+static int
+lazy_clear(PyObject *self)
+{
+    LazyProxyObject *lazy = (LazyProxyObject *)self;
+    PyObject *factory;
+
+    Py_BEGIN_CRITICAL_SECTION(self);
+    factory = lazy->factory;
+    lazy->factory = NULL;
+    Py_END_CRITICAL_SECTION();
+    Py_XDECREF(factory);
+    return wrap_clear(self);
+}
+
+static void
+lazy_dealloc(PyObject *self)
+{
+    PyTypeObject *type = Py_TYPE(self);
+
+    PyObject_GC_UnTrack(self);
+    (void) lazy_clear(self);
+    type->tp_free(self);
+    if (PyType_HasFeature(type, Py_TPFLAGS_HEAPTYPE))
+        Py_DECREF(type);
+}
+
+static char
+lazy__doc__[] =
+"LazyProxyBase(factory)\n"
+"\n"
+"A proxy for the object returned by calling factory without\n"
+"arguments.  The factory is called the first time the proxied\n"
+"object is needed.\n"
+;
+
+static PyType_Slot
+LazyProxyType_slots[] = {
+    {Py_tp_dealloc, lazy_dealloc},
+    {Py_tp_doc, (void *)lazy__doc__},
+    {Py_tp_traverse, lazy_traverse},
+    {Py_tp_clear, lazy_clear},
+    {Py_tp_members, wrap_members},
+    {Py_tp_init, lazy_init},
+    {Py_tp_new, lazy_new},
+    {0, NULL},
+};
+
+static PyType_Spec
+LazyProxyType_spec = {
+    "zope.proxy.LazyProxyBase",
+    sizeof(LazyProxyObject),
+    0,
+    Py_TPFLAGS_DEFAULT |
+    Py_TPFLAGS_HAVE_GC |
+    Py_TPFLAGS_HAVE_VECTORCALL |
+    Py_TPFLAGS_IMMUTABLETYPE |
+    Py_TPFLAGS_BASETYPE,
+    LazyProxyType_slots,
+};
+
+/*
+ *   Decorators.
+ *
+ *   C versions of zope.proxy.decorator's DecoratorSpecificationDescriptor
+ *   and SpecificationDecoratorBase.  The specifications combining what
+ *   a decorated object provides with what its decorator class implements
+ *   are cached in the same place as by the Python version; see there.
+ */
+
+/* Import what we need from zope.interface.declarations at module
+ * initialization, so that it never changes once threads can see it.
+ */
+static int
+decorator_import(module_state *state)
+{
+    PyObject *declarations, *weakref;
+
+    declarations = PyImport_ImportModule("zope.interface.declarations");
+    if (declarations == NULL)
+        return -1;
+    state->zi_providedBy = PyObject_GetAttrString(
+        declarations, "providedBy");
+    if (state->zi_providedBy != NULL)
+        state->zi_getObjectSpecification = PyObject_GetAttrString(
+            declarations, "getObjectSpecification");
+    if (state->zi_getObjectSpecification != NULL)
+        state->zi_ObjectSpecification = PyObject_GetAttrString(
+            declarations, "ObjectSpecification");
+    if (state->zi_ObjectSpecification != NULL)
+        state->zi_ProvidesClass = PyObject_GetAttrString(
+            declarations, "ProvidesClass");
+    Py_DECREF(declarations);
+    if (state->zi_ProvidesClass == NULL)
+        return -1;
+
+    weakref = PyImport_ImportModule("weakref");
+    if (weakref == NULL)
+        return -1;
+    state->WeakValueDictionary = PyObject_GetAttrString(
+        weakref, "WeakValueDictionary");
+    Py_DECREF(weakref);
+    return state->WeakValueDictionary == NULL ? -1 : 0;
+}
+
+static PyObject *weakref_target(PyObject *ref);
+
+/* Return the (cached) specification for instances of cls decorating
+ * objects that provide provided.
+ *
+ * The cache is the same WeakValueDictionary, keyed by id(cls), that the
+ * Python implementation uses; see _getDecoratorSpecification() in
+ * decorator.py.  Hits are looked up in the dictionary of weak references
+ * behind it, to save calling its Python methods.
+ */
+static PyObject *
+decorator_spec(module_state *state, PyObject *provided, PyObject *cls)
+{
+    PyObject *dict, *specs, *key, *data, *ref, *new_spec;
+    PyObject *spec = NULL;
+    int found;
+
+    dict = PyObject_GenericGetDict(provided, NULL);
+    if (dict == NULL) {
+        /* Not a Declaration; don't cache. */
+        if (!PyErr_ExceptionMatches(PyExc_AttributeError))
+            return NULL;
+        PyErr_Clear();
+        return PyObject_CallFunctionObjArgs(state->zi_ObjectSpecification,
+                                            provided, cls, NULL);
+    }
+
+    /* Other threads may be adding the cache (or entries) at the same
+       time; setdefault makes them all end up with the same ones. */
+    if (PyDict_GetItemRef(dict, state->str_decorator_specs, &specs) == 0) {
+        PyObject *new_specs = PyObject_CallNoArgs(state->WeakValueDictionary);
+
+        if (new_specs != NULL) {
+            (void) PyDict_SetDefaultRef(dict, state->str_decorator_specs,
+                                        new_specs, &specs);
+            Py_DECREF(new_specs);
+        }
+    }
+    Py_DECREF(dict);
+    if (specs == NULL)
+        return NULL;
+
+    key = PyLong_FromVoidPtr(cls);
+    if (key == NULL) {
+        Py_DECREF(specs);
+        return NULL;
+    }
+    data = PyObject_GetAttr(specs, state->str_data);
+    if (data == NULL)
+        goto done;
+    if (!PyDict_Check(data)) {
+        PyErr_Format(PyExc_TypeError,
+                     "%U must be a WeakValueDictionary, not %s",
+                     state->str_decorator_specs, Py_TYPE(specs)->tp_name);
+        Py_DECREF(data);
+        goto done;
+    }
+    found = PyDict_GetItemRef(data, key, &ref);
+    Py_DECREF(data);
+    if (found < 0)
+        goto done;
+    if (found) {
+        spec = weakref_target(ref);
+        Py_DECREF(ref);
+        if (spec != NULL)
+            goto done;
+    }
+
+    new_spec = PyObject_CallFunctionObjArgs(state->zi_ProvidesClass,
+                                            cls, provided, NULL);
+    if (new_spec != NULL) {
+        spec = PyObject_CallMethodObjArgs(specs, state->str_setdefault,
+                                          key, new_spec, NULL);
+        Py_DECREF(new_spec);
+    }
+
+done:
+    Py_DECREF(key);
+    Py_DECREF(specs);
+    return spec;
+}
+
+static PyObject *
+dsd_get(PyObject *self, PyObject *inst, PyObject *cls)
+{
+    module_state *state = type_state(Py_TYPE(self));
+    PyObject *object, *provided, *spec;
+
+    if (state == NULL)
+        return NULL;
+
+    if (inst == NULL || inst == Py_None)
+        return PyObject_CallOneArg(state->zi_getObjectSpecification, cls);
+
+    if (Proxy_Check(inst)) {
+        object = wrapped_object(inst);
+        if (object == NULL)
+            return NULL;
+    }
+    else
+        object = Py_NewRef(inst);
+    provided = PyObject_CallOneArg(state->zi_providedBy, object);
+    Py_DECREF(object);
+    if (provided == NULL)
+        return NULL;
+
+    /* Use the type rather than __class__ because inst is a proxy and
+       would return the proxied object's class. */
+    spec = decorator_spec(state, provided, (PyObject *)Py_TYPE(inst));
+    Py_DECREF(provided);
+    return spec;
+}
+
+static int
+dsd_set(PyObject *self, PyObject *inst, PyObject *value)
+{
+    if (value == NULL)
+        PyErr_SetString(PyExc_AttributeError, "__delete__");
+    else
+        PyErr_SetString(PyExc_TypeError,
+                        "Can't set __providedBy__ on a decorated object");
+    return -1;
+}
+
+static int
+dsd_traverse(PyObject *self, visitproc visit, void *arg)
+{
+    Py_VISIT(Py_TYPE(self));
+    return 0;
+}
+
+static void
+dsd_dealloc(PyObject *self)
+{
+    PyTypeObject *type = Py_TYPE(self);
+
+    PyObject_GC_UnTrack(self);
+    type->tp_free(self);
+    Py_DECREF(type);
+}
+
+static char
+dsd__doc__[] = "Support for interface declarations on decorators";
+
+static PyType_Slot
+DecoratorSpecificationDescriptorType_slots[] = {
+    {Py_tp_dealloc, dsd_dealloc},
+    {Py_tp_doc, (void *)dsd__doc__},
+    {Py_tp_traverse, dsd_traverse},
+    {Py_tp_descr_get, dsd_get},
+    {Py_tp_descr_set, dsd_set},
+    {Py_tp_new, PyType_GenericNew},
+    {0, NULL},
+};
+
+static PyType_Spec
+DecoratorSpecificationDescriptorType_spec = {
+    "zope.proxy.decorator.DecoratorSpecificationDescriptor",
+    sizeof(PyObject),
+    0,
+    Py_TPFLAGS_DEFAULT |
+    Py_TPFLAGS_HAVE_GC |
+    Py_TPFLAGS_IMMUTABLETYPE |
+    Py_TPFLAGS_BASETYPE,
+    DecoratorSpecificationDescriptorType_slots,
+};
+
+static char
+decorator__doc__[] =
+"Base class for a proxy that provides additional interfaces.";
+
+static PyType_Slot
+SpecificationDecoratorType_slots[] = {
+    {Py_tp_dealloc, heap_wrap_dealloc},
+    {Py_tp_doc, (void *)decorator__doc__},
+    {Py_tp_traverse, heap_wrap_traverse},
+    {Py_tp_clear, wrap_clear},
+    {Py_tp_members, wrap_members},
+    {0, NULL},
+};
+
+static PyType_Spec
+SpecificationDecoratorType_spec = {
+    "zope.proxy.decorator.SpecificationDecoratorBase",
+    sizeof(ProxyBaseObject),
+    0,
+    Py_TPFLAGS_DEFAULT |
+    Py_TPFLAGS_HAVE_GC |
+    Py_TPFLAGS_HAVE_VECTORCALL |
+    Py_TPFLAGS_IMMUTABLETYPE |
+    Py_TPFLAGS_BASETYPE,
+    SpecificationDecoratorType_slots,
+};
+
+/* Call method *name* of *obj* with the given vectorcall arguments.
+ *
+ * This behaves like getattr(obj, name)(*args, **kw), but when the
+ * method comes from the innermost wrapped object, it is looked up and
+ * called with PyObject_VectorcallMethod(), which avoids creating a
+ * bound method object.  If a proxy class in the chain defines *name*,
+ * or overrides attribute access, the normal attribute protocol is used
+ * instead.
+ */
+#define CALL_METHOD_SMALL_STACK 8
+
+static PyObject *
+call_method(PyObject *obj, PyObject *name,
+            PyObject *const *args, Py_ssize_t nargs, PyObject *kwnames)
+{
+    PyObject *small_stack[CALL_METHOD_SMALL_STACK];
+    PyObject **stack;
+    PyObject *target, *descriptor, *next;
+    PyObject *result;
+    Py_ssize_t nkwargs, total;
+    int use_getattr;
+
+    if (!PyUnicode_Check(name)) {
+        PyErr_Format(PyExc_TypeError,
+                     "attribute name must be string, not '%.200s'",
+                     Py_TYPE(name)->tp_name);
+        return NULL;
+    }
+
+    target = Py_NewRef(obj);
+    while (Proxy_Check(target)) {
+        if (Py_TYPE(target)->tp_getattro != wrap_getattro)
+            /* The proxy type controls attribute access itself (a
+               security proxy, say), so it must get to see the name. */
+            use_getattr = 1;
+        else if (is_wrapped_only_name(&shared, name))
+            use_getattr = 0;
+        else {
+            descriptor = WrapperType_Lookup(&shared, Py_TYPE(target), name);
+            use_getattr = descriptor != NULL;
+            Py_XDECREF(descriptor);
+        }
+        if (use_getattr) {
+            PyObject *method;
+
+            method = PyObject_GetAttr(target, name);
+            Py_DECREF(target);
+            if (method == NULL)
+                return NULL;
+            result = PyObject_Vectorcall(method, args, nargs, kwnames);
+            Py_DECREF(method);
+            return result;
+        }
+        next = proxy_object(target);
+        Py_DECREF(target);
+        if (next == NULL) {
+            if (!PyErr_Occurred())
+                PyErr_Format(PyExc_RuntimeError,
+                    "object is NULL; requested to call method '%U'",
+                    name);
+            return NULL;
+        }
+        target = next;
+    }
+
+    /* PyObject_VectorcallMethod() wants the target as the first
+       argument, preceded by a free slot for PY_VECTORCALL_ARGUMENTS_OFFSET. */
+    nkwargs = kwnames == NULL ? 0 : PyTuple_GET_SIZE(kwnames);
+    total = nargs + nkwargs;
+    if (total + 2 <= CALL_METHOD_SMALL_STACK)
+        stack = small_stack;
+    else {
+        stack = PyMem_Malloc((total + 2) * sizeof(PyObject *));
+        if (stack == NULL) {
+            Py_DECREF(target);
+            return PyErr_NoMemory();
+        }
+    }
+    stack[1] = target;
+    if (total > 0)
+        memcpy(stack + 2, args, total * sizeof(PyObject *));
+
+    result = PyObject_VectorcallMethod(
+        name, stack + 1, (nargs + 1) | PY_VECTORCALL_ARGUMENTS_OFFSET,
+        kwnames);
+
+    if (stack != small_stack)
+        PyMem_Free(stack);
+    Py_DECREF(target);
+    return result;
+}
+
+static PyObject *
+create_proxy(PyObject *object)
+{
+    PyObject *result = NULL;
+    PyObject *args;
+
+    args = PyTuple_New(1);
+    if (args != NULL) {
+        Py_INCREF(object);
+        PyTuple_SET_ITEM(args, 0, object);
+        result = PyObject_CallObject((PyObject *)&ProxyType, args);
+        Py_DECREF(args);
+    }
+    return result;
+}
+
+/*
+ *   Interned proxies.
+ *
+ *   The interned_proxies registry in the module state maps proxy types
+ *   to dictionaries that map the id()
+ *   of a proxied object to a weak reference to its proxy.  The weak
+ *   reference callback removes the entry again (and the per-type
+ *   dictionary once it is empty).  Because a live proxy keeps its
+ *   object alive, the id can't be reused while the entry is valid.
+ */
+/* Return a new reference to the referent of ref, or NULL if it's dead. */
+static PyObject *
+weakref_target(PyObject *ref)
+{
+#if PY_VERSION_HEX >= 0x030D0000
+    PyObject *obj;
+
+    if (PyWeakref_GetRef(ref, &obj) <= 0) {
+        PyErr_Clear();
+        return NULL;
+    }
+    return obj;
+#else
+    PyObject *obj = PyWeakref_GetObject(ref);
+
+    if (obj == NULL) {
+        PyErr_Clear();
+        return NULL;
+    }
+    if (obj == Py_None)
+        return NULL;
+    Py_INCREF(obj);
+    return obj;
+#endif
+}
+
+/* Weak reference callback; self is the (registry, proxy type, id) key. */
+static PyObject *
+intern_discard(PyObject *key, PyObject *ref)
+{
+    PyObject *interned_proxies = PyTuple_GET_ITEM(key, 0);
+    PyObject *type = PyTuple_GET_ITEM(key, 1);
+    PyObject *id = PyTuple_GET_ITEM(key, 2);
+    PyObject *by_id = NULL, *current = NULL;
+    int error = -1;
+
+    Py_BEGIN_CRITICAL_SECTION(interned_proxies);
+    if (PyDict_GetItemRef(interned_proxies, type, &by_id) < 0)
+        goto done;
+    if (by_id != NULL) {
+        if (PyDict_GetItemRef(by_id, id, &current) < 0)
+            goto done;
+        if (current == ref && PyDict_DelItem(by_id, id) < 0)
+            goto done;
+        if (PyDict_GET_SIZE(by_id) == 0
+            && PyDict_DelItem(interned_proxies, type) < 0)
+            goto done;
+    }
+    error = 0;
+done:
+    Py_END_CRITICAL_SECTION();
+    Py_XDECREF(current);
+    Py_XDECREF(by_id);
+    if (error)
+        return NULL;
+    Py_RETURN_NONE;
+}
+
+static PyMethodDef
+intern_discard_def = {"_intern_discard", intern_discard, METH_O, NULL};
+
+/* Look up the live proxy of the given type interned for obj (whose id
+ * is id) and store a new reference to it in *proxy, or NULL if there
+ * is none.  In that case, if ref isn't NULL, intern its referent.
+ *
+ * The registry is locked meanwhile, so that concurrent callers agree
+ * on a single proxy.  Returns -1 on error.
+ */
+static int
+intern_lookup(PyObject *interned_proxies, PyObject *type, PyObject *id,
+              PyObject *obj, PyObject *ref, PyObject **proxy)
+{
+    PyObject *by_id = NULL, *old_ref = NULL, *stale = NULL;
+    int error = -1;
+
+    *proxy = NULL;
+    Py_BEGIN_CRITICAL_SECTION(interned_proxies);
+    if (PyDict_GetItemRef(interned_proxies, type, &by_id) < 0)
+        goto done;
+    if (by_id != NULL) {
+        if (PyDict_GetItemRef(by_id, id, &old_ref) < 0)
+            goto done;
+        if (old_ref != NULL) {
+            *proxy = weakref_target(old_ref);
+            /* The proxy may have been pointed elsewhere since.  The
+               pointers are only compared, so there's no need to lock
+               the proxy. */
+            if (*proxy != NULL && Proxy_GET_OBJECT(*proxy) != obj) {
+                stale = *proxy;
+                *proxy = NULL;
+            }
+        }
+    }
+    if (*proxy == NULL && ref != NULL) {
+        if (by_id == NULL) {
+            by_id = PyDict_New();
+            if (by_id == NULL
+                || PyDict_SetItem(interned_proxies, type, by_id) < 0)
+                goto done;
+        }
+        if (PyDict_SetItem(by_id, id, ref) < 0)
+            goto done;
+    }
+    error = 0;
+done:
+    Py_END_CRITICAL_SECTION();
+    /* Releasing these may run arbitrary code, so wait until the
+       registry is unlocked. */
+    Py_XDECREF(stale);
+    Py_XDECREF(old_ref);
+    Py_XDECREF(by_id);
+    if (error)
+        Py_CLEAR(*proxy);
+    return error;
+}
+
+static PyObject *
+intern_proxy(shared_state *state, PyTypeObject *type, PyObject *obj)
+{
+    PyObject *interned_proxies = state->interned_proxies;
+    PyObject *id, *ref, *key, *callback, *existing;
+    PyObject *proxy = NULL;
+
+    if (!PyType_IsSubtype(type, &ProxyType)) {
+        PyErr_Format(PyExc_TypeError, "expected proxy type, got %s",
+                     type->tp_name);
+        return NULL;
+    }
+    if (type->tp_weaklistoffset == 0) {
+        PyErr_Format(PyExc_TypeError,
+                     "cannot intern %s proxies; "
+                     "they can't be weakly referenced",
+                     type->tp_name);
+        return NULL;
+    }
+
+    id = PyLong_FromVoidPtr(obj);
+    if (id == NULL)
+        return NULL;
+
+    if (intern_lookup(interned_proxies, (PyObject *)type, id, obj,
+                      NULL, &proxy) < 0
+        || proxy != NULL)
+        goto finally;
+
+    proxy = PyObject_CallOneArg((PyObject *)type, obj);
+    if (proxy == NULL || !PyObject_TypeCheck(proxy, type)
+        || Proxy_GET_OBJECT(proxy) != obj)
+        /* A __new__ or __init__ that does something unusual; hand the
+           result out, but don't remember it. */
+        goto finally;
+
+    key = PyTuple_Pack(3, interned_proxies, (PyObject *)type, id);
+    if (key == NULL)
+        goto error;
+    callback = PyCFunction_New(&intern_discard_def, key);
+    Py_DECREF(key);
+    if (callback == NULL)
+        goto error;
+    ref = PyWeakref_NewRef(proxy, callback);
+    Py_DECREF(callback);
+    if (ref == NULL)
+        goto error;
+
+    /* Creating the proxy may have run arbitrary code, or another
+       thread may have interned a proxy meanwhile; then use that one. */
+    if (intern_lookup(interned_proxies, (PyObject *)type, id, obj,
+                      ref, &existing) < 0) {
+        Py_DECREF(ref);
+        goto error;
+    }
+    Py_DECREF(ref);
+    if (existing != NULL)
+        Py_SETREF(proxy, existing);
+    goto finally;
+
+error:
+    Py_CLEAR(proxy);
+finally:
+    Py_DECREF(id);
+    return proxy;
+}
+
+/* Return a list of proxies of the given type for the objects in
+ * iterable.
+ *
+ * Types that don't customize creation (ProxyBase and subclasses that
+ * define neither __new__ nor __init__) are allocated directly; for
+ * those, calling the type would only run wrap_new() and a no-op
+ * wrap_init().  Other types are called once per object.
+ */
 static PyObject *
-create_proxy(PyObject *object)
+wrap_many(PyTypeObject *type, PyObject *iterable)
 {
-    PyObject *result = NULL;
-    PyObject *args;
+    PyObject *result;
+    Py_ssize_t i;
+    int fast;
 
-    args = PyTuple_New(1);
-    if (args != NULL) {
-        Py_INCREF(object);
-        PyTuple_SET_ITEM(args, 0, object);
-        result = PyObject_CallObject((PyObject *)&ProxyType, args);
-        Py_DECREF(args);
+    if (!PyType_IsSubtype(type, &ProxyType)) {
+        PyErr_Format(PyExc_TypeError, "expected proxy type, got %s",
+                     type->tp_name);
+        return NULL;
+    }
+
+    /* We own this copy, so we can replace its items in place. */
+    result = PySequence_List(iterable);
+    if (result == NULL)
+        return NULL;
+
+    fast = (type->tp_new == wrap_new
+            && type->tp_init == wrap_init
+            && Py_TYPE(type)->tp_call == PyType_Type.tp_call);
+
+    for (i = 0; i < PyList_GET_SIZE(result); i++) {
+        PyObject *object = PyList_GET_ITEM(result, i);
+        PyObject *proxy;
+
+        if (fast) {
+            proxy = type->tp_alloc(type, 0);
+            if (proxy != NULL) {
+                Proxy_GET_OBJECT(proxy) = Py_NewRef(object);
+                init_vectorcall(proxy);
+            }
+        }
+        else
+            proxy = PyObject_CallOneArg((PyObject *)type, object);
+
+        if (proxy == NULL) {
+            Py_DECREF(result);
+            return NULL;
+        }
+        /* The proxy holds its own reference to the object. */
+        PyList_SET_ITEM(result, i, proxy);
+        Py_DECREF(object);
     }
     return result;
 }
@@ -737,8 +2987,13 @@ api_getobject(PyObject *proxy)
                         "cannot pass NULL to ProxyAPI.getobject()");
         return NULL;
     }
-    if (Proxy_Check(proxy))
-        return Proxy_GET_OBJECT(proxy);
+    if (Proxy_Check(proxy)) {
+        /* Borrowed from the proxy, for compatibility. */
+        PyObject *object = proxy_object(proxy);
+
+        Py_XDECREF(object);
+        return object;
+    }
     else {
         PyErr_Format(PyExc_TypeError, "expected proxy object, got %s",
                      proxy->ob_type->tp_name);
@@ -746,15 +3001,53 @@ api_getobject(PyObject *proxy)
     }
 }
 
-static ProxyInterface
-wrapper_capi = {
-    &ProxyType,
-    api_check,
-    api_create,
-    api_getobject,
-};
+static PyObject *
+api_callmethod(PyObject *obj, PyObject *name,
+               PyObject *const *args, Py_ssize_t nargs, PyObject *kwnames)
+{
+    if (obj == NULL || name == NULL) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "cannot pass NULL to ProxyAPI.callmethod()");
+        return NULL;
+    }
+    return call_method(obj, name, args, nargs, kwnames);
+}
+
+static PyObject *
+api_intern(PyTypeObject *proxytype, PyObject *obj)
+{
+    if (proxytype == NULL || obj == NULL) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "cannot pass NULL to ProxyAPI.intern()");
+        return NULL;
+    }
+    return intern_proxy(&shared, proxytype, obj);
+}
+
+static PyObject *
+api_wrapmany(PyTypeObject *proxytype, PyObject *iterable)
+{
+    if (proxytype == NULL || iterable == NULL) {
+        PyErr_SetString(PyExc_RuntimeError,
+                        "cannot pass NULL to ProxyAPI.wrapmany()");
+        return NULL;
+    }
+    return wrap_many(proxytype, iterable);
+}
+
 
-static PyObject *api_object = NULL;
+/* Return a new reference to the innermost object proxied by obj, or obj
+ * itself if it isn't a proxy.  Returns NULL with an exception set on
+ * failure, or NULL without one if a proxy has been cleared.
+ */
+static PyObject *
+innermost_object(PyObject *obj)
+{
+  Py_INCREF(obj);
+  while (obj && Proxy_Check(obj))
+    Py_SETREF(obj, proxy_object(obj));
+  return obj;
+}
 
 
 static char
@@ -767,13 +3060,17 @@ getobject__doc__[] =
 static PyObject *
 wrapper_getobject(PyObject *unused, PyObject *obj)
 {
-  if (Proxy_Check(obj))
-    obj = Proxy_GET_OBJECT(obj);
+  if (Proxy_Check(obj)) {
+    obj = proxy_object(obj);
+    if (obj == NULL && PyErr_Occurred())
+      return NULL;
+  }
+  else
+    Py_INCREF(obj);
 
   if (obj == NULL)
-    obj = Py_None;
+    obj = Py_NewRef(Py_None);
 
-  Py_INCREF(obj);
   return obj;
 }
 
@@ -785,16 +3082,24 @@ setobject__doc__[] =
 "Raises TypeError if proxy is not a proxy.\n";
 
 static PyObject *
-wrapper_setobject(PyObject *unused, PyObject *args)
+wrapper_setobject(PyObject *module, PyObject *args)
 {
   PyObject *proxy;
   PyObject *object;
   PyObject *result = NULL;
   if (PyArg_ParseTuple(args, "O!O:setProxiedObject",
-                       &ProxyType, &proxy, &object)) {
-    result = Proxy_GET_OBJECT(proxy);
-    Py_INCREF(object);
-    ((ProxyObject *) proxy)->proxy_object = object;
+                       &ProxyType,
+                       &proxy, &object)) {
+    /* Materialize lazy proxies first, so the factory is dropped. */
+    result = proxy_object(proxy);
+    if (result == NULL && PyErr_Occurred())
+      return NULL;
+    Py_XDECREF(result);
+    /* Return what was actually replaced, even if another thread set
+       the object in between. */
+    result = proxy_exchange(proxy, Py_NewRef(object));
+    if (result == NULL)
+      result = Py_NewRef(Py_None);
   }
   return result;
 }
@@ -808,26 +3113,31 @@ isProxy__doc__[] =
 ;
 
 static PyObject *
-wrapper_isProxy(PyObject *unused, PyObject *args)
+wrapper_isProxy(PyObject *module, PyObject *args)
 {
   PyObject *obj, *result;
-  PyTypeObject *proxytype=&ProxyType;
+  PyTypeObject *proxytype = &ProxyType;
 
   if (! PyArg_ParseTuple(args, "O|O!:isProxy",
                          &obj, &PyType_Type, &proxytype)
       )
     return NULL;
 
+  Py_INCREF(obj);
   while (obj && Proxy_Check(obj))
   {
     if (PyObject_TypeCheck(obj, proxytype))
       {
+        Py_DECREF(obj);
         result = Py_True;
         Py_INCREF(result);
         return result;
       }
-    obj = Proxy_GET_OBJECT(obj);
+    Py_SETREF(obj, proxy_object(obj));
   }
+  Py_XDECREF(obj);
+  if (PyErr_Occurred())
+    return NULL;
   result = Py_False;
   Py_INCREF(result);
   return result;
@@ -847,16 +3157,96 @@ removeAllProxies__doc__[] =
 static PyObject *
 wrapper_removeAllProxies(PyObject *unused, PyObject *obj)
 {
-  while (obj && Proxy_Check(obj))
-    obj = Proxy_GET_OBJECT(obj);
+  obj = innermost_object(obj);
 
-  if (obj == NULL)
-    obj = Py_None;
+  if (obj == NULL) {
+    if (PyErr_Occurred())
+      return NULL;
+    obj = Py_NewRef(Py_None);
+  }
 
-  Py_INCREF(obj);
   return obj;
 }
 
+static char
+removeAllProxiesMany__doc__[] =
+"removeAllProxiesMany(iterable) --> list\n"
+"\n"
+"Return a list of the objects in iterable with all proxies removed.\n"
+;
+
+/* Replace the proxies in list by their innermost proxied objects.
+   Returns -1 with an exception set if a lazy proxy fails to
+   materialize. */
+static int
+remove_all_proxies_in_list(PyObject *list)
+{
+  Py_ssize_t i;
+
+  /* Releasing a proxy may run arbitrary code, and other threads may
+     change the list, so re-check the size and don't keep borrowed
+     references to items. */
+  for (i = 0; i < PyList_GET_SIZE(list); i++)
+    {
+      PyObject *item = PyList_GetItemRef(list, i);
+      PyObject *obj;
+
+      if (item == NULL) {
+        /* The list has shrunk meanwhile. */
+        PyErr_Clear();
+        break;
+      }
+      if (!Proxy_Check(item)) {
+        Py_DECREF(item);
+        continue;
+      }
+      obj = innermost_object(item);
+      Py_DECREF(item);
+      if (obj == NULL) {
+        if (PyErr_Occurred())
+          return -1;
+        obj = Py_NewRef(Py_None);
+      }
+
+      if (PyList_SetItem(list, i, obj) < 0) {
+        PyErr_Clear();
+        break;
+      }
+    }
+  return 0;
+}
+
+static PyObject *
+wrapper_removeAllProxiesMany(PyObject *unused, PyObject *iterable)
+{
+  PyObject *result = PySequence_List(iterable);
+
+  if (result != NULL && remove_all_proxies_in_list(result) < 0)
+    Py_CLEAR(result);
+  return result;
+}
+
+static char
+removeAllProxiesInPlace__doc__[] =
+"removeAllProxiesInPlace(list) --> None\n"
+"\n"
+"Replace the proxied objects in list by the objects with no proxies.\n"
+;
+
+static PyObject *
+wrapper_removeAllProxiesInPlace(PyObject *unused, PyObject *list)
+{
+  if (!PyList_Check(list))
+    {
+      PyErr_Format(PyExc_TypeError, "expected list, got %s",
+                   Py_TYPE(list)->tp_name);
+      return NULL;
+    }
+  if (remove_all_proxies_in_list(list) < 0)
+    return NULL;
+  Py_RETURN_NONE;
+}
+
 static char
 sameProxiedObjects__doc__[] =
 "Check whether two objects are the same or proxies of the same object";
@@ -864,24 +3254,27 @@ sameProxiedObjects__doc__[] =
 static PyObject *
 wrapper_sameProxiedObjects(PyObject *unused, PyObject *args)
 {
-  PyObject *ob1, *ob2;
+  PyObject *ob1, *ob2, *result;
 
   if (! PyArg_ParseTuple(args, "OO:sameProxiedObjects", &ob1, &ob2))
     return NULL;
 
-  while (ob1 && Proxy_Check(ob1))
-    ob1 = Proxy_GET_OBJECT(ob1);
+  ob1 = innermost_object(ob1);
+  if (ob1 == NULL && PyErr_Occurred())
+    return NULL;
 
-  while (ob2 && Proxy_Check(ob2))
-    ob2 = Proxy_GET_OBJECT(ob2);
+  ob2 = innermost_object(ob2);
+  if (ob2 == NULL && PyErr_Occurred()) {
+    Py_XDECREF(ob1);
+    return NULL;
+  }
 
-  if (ob1 == ob2)
-    ob1 = Py_True;
-  else
-    ob1 = Py_False;
+  result = (ob1 == ob2) ? Py_True : Py_False;
+  Py_XDECREF(ob1);
+  Py_XDECREF(ob2);
 
-  Py_INCREF(ob1);
-  return ob1;
+  Py_INCREF(result);
+  return result;
 }
 
 
@@ -893,25 +3286,26 @@ queryProxy__doc__[] =
 ;
 
 static PyObject *
-wrapper_queryProxy(PyObject *unused, PyObject *args)
+wrapper_queryProxy(PyObject *module, PyObject *args)
 {
   PyObject *obj, *result=Py_None;
-  PyTypeObject *proxytype=&ProxyType;
+  PyTypeObject *proxytype = &ProxyType;
 
   if (! PyArg_ParseTuple(args, "O|O!O:queryProxy",
                          &obj, &PyType_Type, &proxytype, &result)
       )
     return NULL;
 
+  Py_INCREF(obj);
   while (obj && Proxy_Check(obj))
   {
     if (PyObject_TypeCheck(obj, proxytype))
-      {
-        Py_INCREF(obj);
-        return obj;
-      }
-    obj = Proxy_GET_OBJECT(obj);
+      return obj;
+    Py_SETREF(obj, proxy_object(obj));
   }
+  Py_XDECREF(obj);
+  if (PyErr_Occurred())
+    return NULL;
 
   Py_INCREF(result);
   return result;
@@ -927,27 +3321,260 @@ queryInnerProxy__doc__[] =
 ;
 
 static PyObject *
-wrapper_queryInnerProxy(PyObject *unused, PyObject *args)
+wrapper_queryInnerProxy(PyObject *module, PyObject *args)
 {
   PyObject *obj, *result=Py_None;
-  PyTypeObject *proxytype=&ProxyType;
+  PyTypeObject *proxytype = &ProxyType;
 
   if (! PyArg_ParseTuple(args, "O|O!O:queryInnerProxy",
                          &obj, &PyType_Type, &proxytype, &result)
       )
     return NULL;
 
+  Py_INCREF(result);
+  Py_INCREF(obj);
   while (obj && Proxy_Check(obj))
   {
     if (PyObject_TypeCheck(obj, proxytype))
-      result = obj;
-    obj = Proxy_GET_OBJECT(obj);
+      Py_SETREF(result, Py_NewRef(obj));
+    Py_SETREF(obj, proxy_object(obj));
+  }
+  Py_XDECREF(obj);
+  if (PyErr_Occurred()) {
+    Py_DECREF(result);
+    return NULL;
   }
 
-  Py_INCREF(result);
   return result;
 }
 
+static char
+callMethod__doc__[] =
+"callMethod($module, obj, name, /, *args, **kw)\n"
+"--\n"
+"\n"
+"Call the method name of obj with the given arguments.\n"
+"\n"
+"This is equivalent to ``getattr(obj, name)(*args, **kw)``, but avoids\n"
+"creating a bound method when the method is provided by the innermost\n"
+"proxied object.\n"
+;
+
+static PyObject *
+wrapper_callMethod(PyObject *unused, PyObject *const *args,
+                   Py_ssize_t nargs, PyObject *kwnames)
+{
+  if (nargs < 2) {
+    PyErr_Format(PyExc_TypeError,
+                 "callMethod expected at least 2 arguments, got %zd",
+                 nargs);
+    return NULL;
+  }
+  return call_method(args[0], args[1], args + 2, nargs - 2, kwnames);
+}
+
+static char
+internProxy__doc__[] =
+"internProxy(proxytype, obj) --> proxy\n"
+"\n"
+"Return a proxy of the given type for obj, reusing a live one\n"
+"created by an earlier call if there is one.\n"
+"\n"
+"Instances of proxytype must support weak references.\n"
+;
+
+static PyObject *
+wrapper_internProxy(PyObject *module, PyObject *const *args,
+                    Py_ssize_t nargs)
+{
+  if (nargs != 2) {
+    PyErr_Format(PyExc_TypeError,
+                 "internProxy expected 2 arguments, got %zd", nargs);
+    return NULL;
+  }
+  if (!PyType_Check(args[0])) {
+    PyErr_Format(PyExc_TypeError, "expected proxy type, got %s",
+                 Py_TYPE(args[0])->tp_name);
+    return NULL;
+  }
+  return intern_proxy(&shared, (PyTypeObject *)args[0], args[1]);
+}
+
+static char
+registerProxyReducer__doc__[] =
+"registerProxyReducer(proxytype, reducer)\n"
+"\n"
+"Make proxies of the given type (and its subclasses) picklable by\n"
+"calling reducer(proxy), which returns what __reduce__() would.\n"
+"A reducer of None removes the registration.\n"
+;
+
+static PyObject *
+wrapper_registerProxyReducer(PyObject *module, PyObject *const *args,
+                             Py_ssize_t nargs)
+{
+  shared_state *state = &shared;
+  int result;
+
+  if (nargs != 2) {
+    PyErr_Format(PyExc_TypeError,
+                 "registerProxyReducer expected 2 arguments, got %zd",
+                 nargs);
+    return NULL;
+  }
+  if (!PyType_Check(args[0])
+      || !PyType_IsSubtype((PyTypeObject *)args[0], &ProxyType)) {
+    PyErr_Format(PyExc_TypeError, "expected proxy type, got %R", args[0]);
+    return NULL;
+  }
+  if (args[1] == Py_None) {
+    result = PyDict_DelItem(state->reducers, args[0]);
+    if (result < 0 && PyErr_ExceptionMatches(PyExc_KeyError)) {
+      PyErr_Clear();
+      result = 0;
+    }
+  }
+  else if (!PyCallable_Check(args[1])) {
+    PyErr_Format(PyExc_TypeError, "expected callable reducer, got %s",
+                 Py_TYPE(args[1])->tp_name);
+    return NULL;
+  }
+  else
+    result = PyDict_SetItem(state->reducers, args[0], args[1]);
+  if (result < 0)
+    return NULL;
+  Py_RETURN_NONE;
+}
+
+static char
+wrapMany__doc__[] =
+"wrapMany(proxytype, iterable) --> list\n"
+"\n"
+"Return a list of proxies of the given type for the objects in\n"
+"iterable.\n"
+;
+
+static PyObject *
+wrapper_wrapMany(PyObject *unused, PyObject *const *args, Py_ssize_t nargs)
+{
+  if (nargs != 2) {
+    PyErr_Format(PyExc_TypeError,
+                 "wrapMany expected 2 arguments, got %zd", nargs);
+    return NULL;
+  }
+  if (!PyType_Check(args[0])) {
+    PyErr_Format(PyExc_TypeError, "expected proxy type, got %s",
+                 Py_TYPE(args[0])->tp_name);
+    return NULL;
+  }
+  return wrap_many((PyTypeObject *)args[0], args[1]);
+}
+
+static char
+enableStats__doc__[] =
+"enableStats(sample_interval=0, timing=False)\n"
+"\n"
+"Start counting the calls to the slots of proxies, per proxy type.\n"
+"If sample_interval is not 0, also record every sample_interval'th\n"
+"attribute looked up through a proxy.  If timing is true, also time\n"
+"attribute access and calls.\n"
+;
+
+static PyObject *
+wrapper_enableStats(PyObject *module, PyObject *args, PyObject *kw)
+{
+  static char *kwlist[] = {"sample_interval", "timing", NULL};
+  Py_ssize_t interval = 0;
+  int timing = 0;
+
+  if (!PyArg_ParseTupleAndKeywords(args, kw, "|np:enableStats", kwlist,
+                                   &interval, &timing))
+    return NULL;
+  if (interval < 0) {
+    PyErr_SetString(PyExc_ValueError,
+                    "sample_interval must not be negative");
+    return NULL;
+  }
+  STAT_STORE(stats_sample_interval, interval);
+  STATS_TIME(timing);
+  STATS_ENABLE(1);
+  Py_RETURN_NONE;
+}
+
+static char
+disableStats__doc__[] =
+"disableStats()\n"
+"\n"
+"Stop counting the calls to the slots of proxies, keeping the counts.\n"
+;
+
+static PyObject *
+wrapper_disableStats(PyObject *module, PyObject *unused)
+{
+  STATS_ENABLE(0);
+  STATS_TIME(0);
+  Py_RETURN_NONE;
+}
+
+static char
+getStats__doc__[] =
+"getStats() --> dict\n"
+"\n"
+"Return a snapshot of the counts as {proxy type: {slot: count}}.\n"
+;
+
+static PyObject *
+wrapper_getStats(PyObject *module, PyObject *unused)
+{
+  return get_stats(&shared);
+}
+
+static char
+getTimings__doc__[] =
+"getTimings() --> dict\n"
+"\n"
+"Return a snapshot of the times as {proxy type: {slot: (nanoseconds,\n"
+"nanoseconds in the proxied object)}}.\n"
+;
+
+static PyObject *
+wrapper_getTimings(PyObject *module, PyObject *unused)
+{
+  return get_timings(&shared);
+}
+
+static char
+getAttributeSamples__doc__[] =
+"getAttributeSamples() --> dict\n"
+"\n"
+"Return a snapshot of the attribute samples as\n"
+"{(proxy type, name, 'proxy' or 'wrapped'): count}.\n"
+;
+
+static PyObject *
+wrapper_getAttributeSamples(PyObject *module, PyObject *unused)
+{
+  return PyDict_Copy(shared.attribute_samples);
+}
+
+static char
+resetStats__doc__[] =
+"resetStats()\n"
+"\n"
+"Discard the counts, the times and the attribute samples.\n"
+;
+
+static PyObject *
+wrapper_resetStats(PyObject *module, PyObject *unused)
+{
+  shared_state *state = &shared;
+
+  PyDict_Clear(state->stats);
+  PyDict_Clear(state->attribute_samples);
+  STAT_STORE(state->attribute_accesses, 0);
+  Py_RETURN_NONE;
+}
+
 /* Module initialization */
 
 static char
@@ -971,37 +3598,233 @@ module_functions[] = {
      queryInnerProxy__doc__},
     {"removeAllProxies", wrapper_removeAllProxies, METH_O,
      removeAllProxies__doc__},
+    {"removeAllProxiesMany", wrapper_removeAllProxiesMany, METH_O,
+     removeAllProxiesMany__doc__},
+    {"removeAllProxiesInPlace", wrapper_removeAllProxiesInPlace, METH_O,
+     removeAllProxiesInPlace__doc__},
+    {"callMethod", (PyCFunction)(void(*)(void))wrapper_callMethod,
+     METH_FASTCALL | METH_KEYWORDS, callMethod__doc__},
+    {"internProxy", (PyCFunction)(void(*)(void))wrapper_internProxy,
+     METH_FASTCALL, internProxy__doc__},
+    {"wrapMany", (PyCFunction)(void(*)(void))wrapper_wrapMany,
+     METH_FASTCALL, wrapMany__doc__},
+    {"registerProxyReducer",
+     (PyCFunction)(void(*)(void))wrapper_registerProxyReducer,
+     METH_FASTCALL, registerProxyReducer__doc__},
+    {"enableStats", (PyCFunction)(void(*)(void))wrapper_enableStats,
+     METH_VARARGS | METH_KEYWORDS, enableStats__doc__},
+    {"disableStats", wrapper_disableStats, METH_NOARGS,
+     disableStats__doc__},
+    {"getStats", wrapper_getStats, METH_NOARGS, getStats__doc__},
+    {"getAttributeSamples", wrapper_getAttributeSamples, METH_NOARGS,
+     getAttributeSamples__doc__},
+    {"getTimings", wrapper_getTimings, METH_NOARGS, getTimings__doc__},
+    {"resetStats", wrapper_resetStats, METH_NOARGS, resetStats__doc__},
     {NULL}
 };
 
-MOD_INIT(_zope_proxy_proxy)
+static int
+module_traverse(PyObject *module, visitproc visit, void *arg)
+{
+    module_state *state = get_module_state(module);
+
+    Py_VISIT(state->LazyProxyType);
+    Py_VISIT(state->BufferProxyType);
+    Py_VISIT(state->DecoratorSpecificationDescriptorType);
+    Py_VISIT(state->SpecificationDecoratorType);
+    Py_VISIT(state->zi_providedBy);
+    Py_VISIT(state->zi_getObjectSpecification);
+    Py_VISIT(state->zi_ObjectSpecification);
+    Py_VISIT(state->zi_ProvidesClass);
+    Py_VISIT(state->WeakValueDictionary);
+    return 0;
+}
+
+static int
+module_clear(PyObject *module)
+{
+    module_state *state = get_module_state(module);
+
+    Py_CLEAR(state->LazyProxyType);
+    Py_CLEAR(state->BufferProxyType);
+    Py_CLEAR(state->DecoratorSpecificationDescriptorType);
+    Py_CLEAR(state->SpecificationDecoratorType);
+    Py_CLEAR(state->str_decorator_specs);
+    Py_CLEAR(state->str_data);
+    Py_CLEAR(state->str_setdefault);
+    Py_CLEAR(state->zi_providedBy);
+    Py_CLEAR(state->zi_getObjectSpecification);
+    Py_CLEAR(state->zi_ObjectSpecification);
+    Py_CLEAR(state->zi_ProvidesClass);
+    Py_CLEAR(state->WeakValueDictionary);
+    return 0;
+}
+
+static void
+module_free(void *module)
 {
-    PyObject *m;
+    (void) module_clear((PyObject *)module);
+}
 
-    MOD_DEF(m, "_zope_proxy_proxy", module___doc__, module_functions)
+static PyTypeObject *
+add_type(PyObject *module, PyType_Spec *spec, PyTypeObject *base)
+{
+    PyTypeObject *type = (PyTypeObject *)PyType_FromModuleAndSpec(
+        module, spec, (PyObject *)base);
 
-    if (m == NULL)
-        return MOD_ERROR_VAL;
+    if (type != NULL && PyModule_AddType(module, type) < 0)
+        Py_CLEAR(type);
+    return type;
+}
 
-    if (empty_tuple == NULL)
-        empty_tuple = PyTuple_New(0);
+/* Sets up ProxyBase and the shared state, once per process. */
+static int
+shared_init(void)
+{
+    if (shared.initialized)
+        return 0;
 
-    ProxyType.tp_free = PyObject_GC_Del;
+    shared.str__class__ = PyUnicode_InternFromString("__class__");
+    if (shared.str__class__ == NULL)
+        return -1;
+    shared.str__module__ = PyUnicode_InternFromString("__module__");
+    if (shared.str__module__ == NULL)
+        return -1;
+    shared.str__reduce__ = PyUnicode_InternFromString("__reduce__");
+    if (shared.str__reduce__ == NULL)
+        return -1;
+    shared.str__reduce_ex__ = PyUnicode_InternFromString("__reduce_ex__");
+    if (shared.str__reduce_ex__ == NULL)
+        return -1;
+    shared.str_proxy = PyUnicode_InternFromString("proxy");
+    if (shared.str_proxy == NULL)
+        return -1;
+    shared.str_wrapped = PyUnicode_InternFromString("wrapped");
+    if (shared.str_wrapped == NULL)
+        return -1;
+
+    shared.interned_proxies = PyDict_New();
+    if (shared.interned_proxies == NULL)
+        return -1;
+    shared.reducers = PyDict_New();
+    if (shared.reducers == NULL)
+        return -1;
+    shared.stats = PyDict_New();
+    if (shared.stats == NULL)
+        return -1;
+    shared.attribute_samples = PyDict_New();
+    if (shared.attribute_samples == NULL)
+        return -1;
 
     if (PyType_Ready(&ProxyType) < 0)
-        return MOD_ERROR_VAL;
+        return -1;
 
-    Py_INCREF(&ProxyType);
-    PyModule_AddObject(m, "ProxyBase", (PyObject *)&ProxyType);
+    shared.capi.proxytype = &ProxyType;
+    shared.capi.check = api_check;
+    shared.capi.create = api_create;
+    shared.capi.getobject = api_getobject;
+    shared.capi.callmethod = api_callmethod;
+    shared.capi.intern = api_intern;
+    shared.capi.wrapmany = api_wrapmany;
 
-    if (api_object == NULL) {
-        api_object = PyCapsule_New(&wrapper_capi, NULL, NULL);
-        if (api_object == NULL)
-        return MOD_ERROR_VAL;
-    }
-    Py_INCREF(api_object);
-    PyModule_AddObject(m, "_CAPI", api_object);
+    shared.initialized = 1;
+    return 0;
+}
+
+static int
+module_exec(PyObject *module)
+{
+    module_state *state = get_module_state(module);
+    PyObject *descriptor, *capsule;
+    int result;
+
+    if (shared_init() < 0)
+        return -1;
+
+    state->str_decorator_specs = PyUnicode_InternFromString(
+        "_zope_proxy_decorator_specs");
+    if (state->str_decorator_specs == NULL)
+        return -1;
+    state->str_data = PyUnicode_InternFromString("data");
+    if (state->str_data == NULL)
+        return -1;
+    state->str_setdefault = PyUnicode_InternFromString("setdefault");
+    if (state->str_setdefault == NULL)
+        return -1;
+
+    if (decorator_import(state) < 0)
+        return -1;
+
+    if (PyModule_AddType(module, &ProxyType) < 0)
+        return -1;
+
+    state->LazyProxyType = add_type(module, &LazyProxyType_spec,
+                                    &ProxyType);
+    if (state->LazyProxyType == NULL)
+        return -1;
+
+    state->BufferProxyType = add_type(module, &BufferProxyType_spec,
+                                      &ProxyType);
+    if (state->BufferProxyType == NULL)
+        return -1;
+
+    state->DecoratorSpecificationDescriptorType = add_type(
+        module, &DecoratorSpecificationDescriptorType_spec, NULL);
+    if (state->DecoratorSpecificationDescriptorType == NULL)
+        return -1;
+
+    state->SpecificationDecoratorType = add_type(
+        module, &SpecificationDecoratorType_spec, &ProxyType);
+    if (state->SpecificationDecoratorType == NULL)
+        return -1;
+
+    /* The type is immutable, so set the descriptor up directly. */
+    descriptor = PyObject_CallNoArgs(
+        (PyObject *)state->DecoratorSpecificationDescriptorType);
+    if (descriptor == NULL)
+        return -1;
+    result = PyDict_SetItemString(state->SpecificationDecoratorType->tp_dict,
+                                  "__providedBy__", descriptor);
+    Py_DECREF(descriptor);
+    if (result < 0)
+        return -1;
+    PyType_Modified(state->SpecificationDecoratorType);
+
+    capsule = PyCapsule_New(&shared.capi, NULL, NULL);
+    if (capsule == NULL)
+        return -1;
+    result = PyModule_AddObjectRef(module, "_CAPI", capsule);
+    Py_DECREF(capsule);
+    return result;
+}
+
+static PyModuleDef_Slot
+module_slots[] = {
+    {Py_mod_exec, module_exec},
+#ifdef Py_mod_multiple_interpreters
+    {Py_mod_multiple_interpreters, Py_MOD_MULTIPLE_INTERPRETERS_SUPPORTED},
+#endif
+#ifdef Py_mod_gil
+    {Py_mod_gil, Py_MOD_GIL_NOT_USED},
+#endif
+    {0, NULL},
+};
 
-    return MOD_SUCCESS_VAL(m);
+static struct PyModuleDef
+moduledef = {
+    PyModuleDef_HEAD_INIT,
+    "_zope_proxy_proxy",
+    module___doc__,
+    sizeof(module_state),
+    module_functions,
+    module_slots,
+    module_traverse,
+    module_clear,
+    module_free,
+};
 
+PyMODINIT_FUNC
+PyInit__zope_proxy_proxy(void)
+{
+    return PyModuleDef_Init(&moduledef);
 }
@@ -18,16 +18,52 @@ additional features.
 """
 __docformat__ = "reStructuredText"
 
+import weakref
+
 from zope.interface import providedBy
 from zope.interface.declarations import ObjectSpecification
 from zope.interface.declarations import ObjectSpecificationDescriptor
+from zope.interface.declarations import ProvidesClass
 from zope.interface.declarations import getObjectSpecification
 
 from zope.proxy import ProxyBase
+from zope.proxy import _c_available
 from zope.proxy import getProxiedObject
 
 
-class DecoratorSpecificationDescriptor(ObjectSpecificationDescriptor):
+# The specifications combining what a decorated object provides with
+# what its decorator class implements are cached in the dictionary of
+# the former, as ``{id(decorator class): specification}``.  Handing out
+# the same specification each time lets the lookup caches of adapter
+# registries work for decorators.  The specifications refer to the
+# decorator class, so the cache holds them only weakly and isn't keyed
+# by the class itself; otherwise it would keep every decorator class
+# alive as long as the decorated object's specification.  A live
+# specification keeps its class alive, so the id can't be reused while
+# the entry is valid.  Whoever needs the identity (such as the lookup
+# cache of a registry) keeps the specification alive.
+# They are created with ProvidesClass rather than ObjectSpecification,
+# which would also remember them in a global registry keyed (strongly)
+# by the decorated specification, keeping both alive forever.
+_SPEC_CACHE = '_zope_proxy_decorator_specs'
+
+
+def _getDecoratorSpecification(provided, cls):
+    try:
+        specs = provided.__dict__[_SPEC_CACHE]
+    except KeyError:
+        specs = provided.__dict__.setdefault(
+            _SPEC_CACHE, weakref.WeakValueDictionary())
+    except AttributeError:  # pragma: no cover
+        # Not a Declaration; don't cache.
+        return ObjectSpecification(provided, cls)
+    spec = specs.get(id(cls))
+    if spec is None:
+        spec = specs.setdefault(id(cls), ProvidesClass(cls, provided))
+    return spec
+
+
+class PyDecoratorSpecificationDescriptor(ObjectSpecificationDescriptor):
     """Support for interface declarations on decorators
     """
 
@@ -40,13 +76,21 @@ class DecoratorSpecificationDescriptor(ObjectSpecificationDescriptor):
             # Use type rather than __class__ because inst is a proxy and
             # will return the proxied object's class.
             cls = type(inst)
-            return ObjectSpecification(provided, cls)
+            return _getDecoratorSpecification(provided, cls)
 
     def __set__(self, inst, value):
         raise TypeError("Can't set __providedBy__ on a decorated object")
 
 
-class SpecificationDecoratorBase(ProxyBase):
+class PySpecificationDecoratorBase(ProxyBase):
     """Base class for a proxy that provides additional interfaces."""
 
-    __providedBy__ = DecoratorSpecificationDescriptor()
+    __providedBy__ = PyDecoratorSpecificationDescriptor()
+
+
+if _c_available:  # pragma: no cover
+    from zope.proxy._zope_proxy_proxy import DecoratorSpecificationDescriptor
+    from zope.proxy._zope_proxy_proxy import SpecificationDecoratorBase
+else:
+    DecoratorSpecificationDescriptor = PyDecoratorSpecificationDescriptor
+    SpecificationDecoratorBase = PySpecificationDecoratorBase
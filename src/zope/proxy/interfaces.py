@@ -52,6 +52,20 @@ class IProxyIntrospection(Interface):
         The returned object has no proxies.
         """
 
+    def removeAllProxiesMany(iterable):
+        """Get the proxied objects of an iterable with no proxies
+
+        Return a new list with the result of `removeAllProxies` for
+        each object in the iterable.
+        """
+
+    def removeAllProxiesInPlace(objects):
+        """Remove all proxies from the objects in a list
+
+        Replace each object in the list by the result of
+        `removeAllProxies`.  Raises TypeError if objects is not a list.
+        """
+
     def queryProxy(obj, proxytype, default=None):
         """Look for a proxy of the given type around the object
 
@@ -65,3 +79,100 @@ class IProxyIntrospection(Interface):
 
         If there is such a proxy, return the inner-most one.
         """
+
+    def callMethod(obj, name, /, *args, **kw):
+        """Call the method *name* of obj with the given arguments
+
+        This is equivalent to ``getattr(obj, name)(*args, **kw)``, but
+        may avoid creating a bound method when the method is provided
+        by the inner-most proxied object.
+        """
+
+    def internProxy(proxytype, obj):
+        """Return a proxy of the given type for obj
+
+        If a live proxy of exactly that type created by an earlier
+        call still refers to obj, return it instead of creating a new
+        one.  Instances of proxytype must support weak references.
+        """
+
+    def wrapMany(proxytype, iterable):
+        """Return a list of proxies of the given type
+
+        The list contains a new ``proxytype(obj)`` for each object in
+        the iterable.
+        """
+
+    def registerProxyReducer(proxytype, reducer):
+        """Make proxies of the given type picklable
+
+        Pickling (or copying) a proxy whose type is, or derives from,
+        proxytype calls ``reducer(proxy)``, which returns what
+        ``__reduce__`` would, for example
+        ``(proxytype, (getProxiedObject(proxy),))`` to pickle the
+        proxied object and wrap it again when unpickling.  Passing None
+        as the reducer removes the registration.
+        """
+
+    def enableStats(sample_interval=0, timing=False):
+        """Start counting calls to the slots of proxies
+
+        The calls are counted per proxy type and slot, using the names
+        of the slots of the C implementation (``getattro``,
+        ``richcompare``, ``add``, ``iadd`` and so on).  Setting the
+        ``ZOPE_PROXY_STATS`` environment variable to 1 enables counting
+        when ``zope.proxy`` is imported.  Not counting costs nothing.
+
+        If *sample_interval* is not 0, every *sample_interval*'th
+        attribute successfully looked up through a proxy is also
+        recorded, see `getAttributeSamples`.  If *timing* is true,
+        attribute access and calls through proxies are also timed, see
+        `getTimings`.
+        """
+
+    def disableStats():
+        """Stop counting calls to the slots of proxies
+
+        The counts are kept.
+        """
+
+    def getStats():
+        """Return a snapshot of the counts
+
+        The result is a dictionary of ``{proxy type: {slot name:
+        count}}`` that leaves out slots which were not called.
+        """
+
+    def getTimings():
+        """Return a snapshot of the times
+
+        The result is a dictionary of ``{proxy type: {slot name:
+        (nanoseconds, nanoseconds in the proxied object)}}`` for the
+        timed slots, ``getattro``, ``setattro`` and ``call``.  Those are
+        the slots that run code of the proxy class; the others only
+        forward to the proxied object.
+        """
+
+    def getOverhead(timings=None):
+        """Return the time spent in proxies per proxy type
+
+        The result is a dictionary of ``{proxy type: (nanoseconds of
+        overhead, nanoseconds in the proxied object)}``, adding up the
+        *timings*, which default to `getTimings`.  If a proxy wraps
+        another proxy, the time of the inner proxy is part of the time
+        in the object proxied by the outer one.
+        """
+
+    def getAttributeSamples():
+        """Return a snapshot of the attribute samples
+
+        The result is a dictionary of ``{(proxy type, attribute name,
+        resolution): count}``, where the resolution is ``'proxy'`` if
+        the proxy class provided the attribute and ``'wrapped'`` if the
+        proxied object did.  At most 1024 different samples are kept;
+        once that many are recorded, only those keep being counted.
+        """
+
+    def resetStats():
+        """Discard the counts, the times and the attribute samples
+        """
@@ -6,6 +6,9 @@ typedef struct {
     PyObject *proxy_object;
 } ProxyObject;
 
+/* Unlocked access; on free-threaded builds another thread may replace
+ * the object (see setProxiedObject()) while you use it.
+ */
 #define Proxy_GET_OBJECT(ob)   (((ProxyObject *)(ob))->proxy_object)
 
 typedef struct {
@@ -13,6 +16,11 @@ typedef struct {
     int (*check)(PyObject *obj);
     PyObject *(*create)(PyObject *obj);
     PyObject *(*getobject)(PyObject *proxy);
+    PyObject *(*callmethod)(PyObject *obj, PyObject *name,
+                            PyObject *const *args, Py_ssize_t nargs,
+                            PyObject *kwnames);
+    PyObject *(*intern)(PyTypeObject *proxytype, PyObject *obj);
+    PyObject *(*wrapmany)(PyTypeObject *proxytype, PyObject *iterable);
 } ProxyInterface;
 
 #ifndef PROXY_MODULE
@@ -47,6 +55,12 @@ Proxy_Import(void)
 #define Proxy_CheckExact(obj)   ((obj)->ob_type == ProxyType)
 #define Proxy_New(obj)          (_proxy_api->create((obj)))
 #define Proxy_GetObject(proxy)  (_proxy_api->getobject((proxy)))
+#define Proxy_CallMethod(obj, name, args, nargs, kwnames) \
+        (_proxy_api->callmethod((obj), (name), (args), (nargs), (kwnames)))
+#define Proxy_Intern(proxytype, obj) \
+        (_proxy_api->intern((proxytype), (obj)))
+#define Proxy_WrapMany(proxytype, iterable) \
+        (_proxy_api->wrapmany((proxytype), (iterable)))
 
 #endif /* PROXY_MODULE */
 
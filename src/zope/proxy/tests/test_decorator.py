@@ -16,11 +16,11 @@
 import unittest
 
 
-class DecoratorSpecificationDescriptorTests(unittest.TestCase):
+class PyDecoratorSpecificationDescriptorTests(unittest.TestCase):
 
     def _getTargetClass(self):
-        from zope.proxy.decorator import DecoratorSpecificationDescriptor
-        return DecoratorSpecificationDescriptor
+        from zope.proxy.decorator import PyDecoratorSpecificationDescriptor
+        return PyDecoratorSpecificationDescriptor
 
     def _makeOne(self):
         return self._getTargetClass()()
@@ -117,6 +117,127 @@ class DecoratorSpecificationDescriptorTests(unittest.TestCase):
         self.assertEqual(list(dsd.__get__(proxy, None)),
                          [IContext, IProxy])
 
+    def test___get___w_inst_reuses_specification(self):
+        from zope.interface import Interface
+        from zope.interface import implementer
+
+        from zope.proxy import ProxyBase
+
+        class IContext(Interface):
+            pass
+
+        @implementer(IContext)
+        class Context:
+            pass
+
+        class Proxy(ProxyBase):
+            pass
+        dsd = self._makeOne()
+        spec = dsd.__get__(Proxy(Context()), None)
+        self.assertIs(dsd.__get__(Proxy(Context()), None), spec)
+        self.assertIsNot(dsd.__get__(ProxyBase(Context()), None), spec)
+
+    def test___get___w_inst_sees_later_declarations(self):
+        from zope.interface import Interface
+        from zope.interface import classImplements
+        from zope.interface import directlyProvides
+        from zope.interface import implementer
+
+        from zope.proxy import ProxyBase
+
+        class IContext(Interface):
+            pass
+
+        class IProxy(Interface):
+            pass
+
+        class IDirect(Interface):
+            pass
+
+        @implementer(IContext)
+        class Context:
+            pass
+
+        class Proxy(ProxyBase):
+            pass
+        context = Context()
+        dsd = self._makeOne()
+        self.assertEqual(list(dsd.__get__(Proxy(context), None)),
+                         [IContext])
+        classImplements(Proxy, IProxy)
+        self.assertEqual(list(dsd.__get__(Proxy(context), None)),
+                         [IContext, IProxy])
+        directlyProvides(context, IDirect)
+        self.assertEqual(list(dsd.__get__(Proxy(context), None)),
+                         [IDirect, IContext, IProxy])
+
+    def test___get___w_inst_cache_does_not_keep_alive(self):
+        import gc
+        import weakref
+
+        from zope.interface import Interface
+        from zope.interface import directlyProvides
+
+        from zope.proxy import ProxyBase
+
+        class IDirect(Interface):
+            pass
+
+        class Context:
+            pass
+
+        class Proxy(ProxyBase):
+            pass
+        context = Context()
+        directlyProvides(context, IDirect)
+        dsd = self._makeOne()
+        spec = weakref.ref(dsd.__get__(Proxy(context), None))
+        provided = weakref.ref(context.__provides__)
+        del context
+        gc.collect()
+        self.assertIsNone(spec())
+        self.assertIsNone(provided())
+
+    def test___get___w_inst_cache_does_not_keep_decorators_alive(self):
+        import gc
+        import weakref
+
+        from zope.interface import Interface
+        from zope.interface import implementer
+        from zope.interface import providedBy
+
+        from zope.proxy import _c_available
+        from zope.proxy.decorator import _SPEC_CACHE
+        from zope.proxy.decorator import SpecificationDecoratorBase
+
+        class IContext(Interface):
+            pass
+
+        @implementer(IContext)
+        class Context:
+            pass
+        context = Context()
+        dsd = self._makeOne()
+        decorator_classes = []
+        for i in range(10):
+            class Decorator(SpecificationDecoratorBase):
+                pass
+            spec = dsd.__get__(Decorator(context), None)
+            # The same specification while it is in use...
+            self.assertIs(dsd.__get__(Decorator(context), None), spec)
+            decorator_classes.append(weakref.ref(Decorator))
+        del Decorator, spec
+        gc.collect()
+        # ...but the cache doesn't keep it or the decorator class alive.
+        self.assertEqual(len(providedBy(context).__dict__[_SPEC_CACHE]), 0)
+        if _c_available:
+            # (zope.interface itself keeps Python proxy classes alive.)
+            self.assertEqual([ref() for ref in decorator_classes],
+                             [None] * 10)
+        self.assertEqual(
+            list(dsd.__get__(SpecificationDecoratorBase(context), None)),
+            [IContext])
+
     def test___set___not_allowed(self):
         from zope.interface import Interface
         from zope.interface import implementer
@@ -132,11 +253,36 @@ class DecoratorSpecificationDescriptorTests(unittest.TestCase):
         self.assertRaises(TypeError, dsd.__set__, foo, object())
 
 
-class SpecificationDecoratorBaseTests(unittest.TestCase):
+class DecoratorSpecificationDescriptorTests(
+        PyDecoratorSpecificationDescriptorTests):
 
     def _getTargetClass(self):
-        from zope.proxy.decorator import SpecificationDecoratorBase
-        return SpecificationDecoratorBase
+        from zope.proxy.decorator import DecoratorSpecificationDescriptor
+        return DecoratorSpecificationDescriptor
+
+    def test_shares_cache_with_python_implementation(self):
+        from zope.interface import Interface
+        from zope.interface import implementer
+
+        from zope.proxy import ProxyBase
+        from zope.proxy.decorator import PyDecoratorSpecificationDescriptor
+
+        class IContext(Interface):
+            pass
+
+        @implementer(IContext)
+        class Context:
+            pass
+        proxy = ProxyBase(Context())
+        self.assertIs(self._makeOne().__get__(proxy, None),
+                      PyDecoratorSpecificationDescriptor().__get__(proxy))
+
+
+class PySpecificationDecoratorBaseTests(unittest.TestCase):
+
+    def _getTargetClass(self):
+        from zope.proxy.decorator import PySpecificationDecoratorBase
+        return PySpecificationDecoratorBase
 
     def _makeOne(self, wrapped):
         return self._getTargetClass()(wrapped)
@@ -183,11 +329,54 @@ class SpecificationDecoratorBaseTests(unittest.TestCase):
         self.assertEqual(proxy.from_foo, 1)
         self.assertEqual(list(providedBy(proxy)), [IFoo, IWrapper])
 
+    def test_class_provides(self):
+        from zope.interface import Interface
+        from zope.interface import providedBy
+        from zope.interface import provider
+
+        class IWrapperFactory(Interface):
+            pass
+
+        @provider(IWrapperFactory)
+        class Proxy(self._getTargetClass()):
+            pass
+
+        self.assertEqual(list(providedBy(Proxy)), [IWrapperFactory])
+
+    def test___providedBy___cannot_be_set_or_deleted(self):
+        proxy = self._makeOne(object())
+        with self.assertRaises(TypeError):
+            proxy.__providedBy__ = None
+        with self.assertRaises(AttributeError):
+            del proxy.__providedBy__
+
+    def test_behaves_like_proxy(self):
+        from zope.proxy import getProxiedObject
+        from zope.proxy import isProxy
+
+        foo = [1, 2]
+        proxy = self._makeOne(foo)
+        self.assertTrue(isProxy(proxy))
+        self.assertIs(getProxiedObject(proxy), foo)
+        self.assertEqual(proxy, [1, 2])
+        self.assertEqual(len(proxy), 2)
+
+
+class SpecificationDecoratorBaseTests(PySpecificationDecoratorBaseTests):
+
+    def _getTargetClass(self):
+        from zope.proxy.decorator import SpecificationDecoratorBase
+        return SpecificationDecoratorBase
+
 
 def test_suite():
     return unittest.TestSuite((
+        unittest.defaultTestLoader.loadTestsFromTestCase(
+            PyDecoratorSpecificationDescriptorTests),
         unittest.defaultTestLoader.loadTestsFromTestCase(
             DecoratorSpecificationDescriptorTests),
+        unittest.defaultTestLoader.loadTestsFromTestCase(
+            PySpecificationDecoratorBaseTests),
         unittest.defaultTestLoader.loadTestsFromTestCase(
             SpecificationDecoratorBaseTests),
     ))
@@ -14,6 +14,9 @@
 """Test base proxy class.
 """
 import pickle
+import sys
+import sysconfig
+import threading
 import unittest
 
 from .. import _c_available
@@ -27,6 +30,14 @@ else:
     _HAVE_ZOPE_SECURITY = True
     del zope.security
 
+try:
+    import _interpreters as _subinterpreters
+except ModuleNotFoundError:  # pragma: no cover
+    try:
+        import _xxsubinterpreters as _subinterpreters
+    except ModuleNotFoundError:
+        _subinterpreters = None
+
 
 class ModuleConformanceCase(unittest.TestCase):
 
@@ -37,6 +48,140 @@ class ModuleConformanceCase(unittest.TestCase):
         from zope.proxy.interfaces import IProxyIntrospection
         verifyObject(IProxyIntrospection, zope.proxy)
 
+    def test_ZOPE_PROXY_STATS_enables_stats(self):
+        import os
+        import subprocess
+        code = '; '.join([
+            'import zope.proxy',
+            'len(zope.proxy.ProxyBase([]))',
+            'print(zope.proxy.getStats()[zope.proxy.ProxyBase])',
+        ])
+        env = dict(os.environ, ZOPE_PROXY_STATS='1',
+                   PYTHONPATH=os.pathsep.join(sys.path))
+        output = subprocess.check_output([sys.executable, '-c', code],
+                                         env=env)
+        self.assertEqual(output.strip(), b"{'len': 1}")
+
+    @unittest.skipUnless(
+        _c_available and sysconfig.get_config_var('Py_GIL_DISABLED'),
+        'requires the C extension on a free-threaded build')
+    def test_C_extension_does_not_enable_GIL(self):  # pragma: no cover
+        import zope.proxy._zope_proxy_proxy  # noqa: F401 unused
+        self.assertFalse(sys._is_gil_enabled())
+
+    @unittest.skipUnless(_c_available, 'requires the C extension')
+    def test_C_extension_state_is_per_module(self):
+        import gc
+        import importlib.util
+        import weakref
+
+        import zope.proxy
+        spec = importlib.util.find_spec('zope.proxy._zope_proxy_proxy')
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        # ProxyBase is a static type that C extensions derive from, so
+        # there is only one; the newer types belong to each module.
+        self.assertIs(module.ProxyBase, zope.proxy.ProxyBase)
+        self.assertIsNot(module.LazyProxyBase, zope.proxy.LazyProxyBase)
+        proxy = module.LazyProxyBase(lambda: [1])
+        self.assertTrue(module.isProxy(proxy))
+        self.assertTrue(zope.proxy.isProxy(proxy))
+        self.assertEqual(proxy + [2], [1, 2])
+        # Nothing outside the module keeps it (and its types) alive.
+        ref = weakref.ref(module)
+        del module, proxy
+        gc.collect()
+        self.assertIsNone(ref())
+
+    def _run_in_subinterpreter(self, code, isolated):
+        if sys.version_info >= (3, 13):
+            interp = _subinterpreters.create(
+                'isolated' if isolated else 'legacy')
+        elif sys.version_info >= (3, 12):
+            interp = _subinterpreters.create(isolated=isolated)
+        else:
+            interp = _subinterpreters.create()
+        try:
+            return _subinterpreters.run_string(interp, code)
+        finally:
+            _subinterpreters.destroy(interp)
+
+    @unittest.skipUnless(
+        _c_available and _subinterpreters is not None,
+        'requires the C extension and subinterpreters')
+    def test_C_extension_loads_in_subinterpreter(self):
+        code = '\n'.join([
+            'import sys',
+            f'sys.path[:] = {sys.path!r}',
+            'import zope.proxy',
+            'from zope.proxy.decorator import SpecificationDecoratorBase',
+            'assert zope.proxy.ProxyBase is not zope.proxy.PyProxyBase',
+            'assert zope.proxy.ProxyBase(1) + 1 == 2',
+            'assert zope.proxy.isProxy(SpecificationDecoratorBase(1))',
+        ])
+        self.assertIsNone(self._run_in_subinterpreter(code, isolated=False))
+
+    @unittest.skipUnless(
+        _c_available and _subinterpreters is not None
+        and sys.version_info >= (3, 12),
+        'requires the C extension and isolated subinterpreters')
+    def test_C_extension_not_loaded_in_isolated_subinterpreter(self):
+        # ProxyBase is shared by all interpreters, so the extension
+        # can't be used by interpreters with their own GIL.
+        code = '\n'.join([
+            'import sys',
+            f'sys.path[:] = {sys.path!r}',
+            'import zope.proxy',
+            'assert zope.proxy.ProxyBase is zope.proxy.PyProxyBase',
+        ])
+        self.assertIsNone(self._run_in_subinterpreter(code, isolated=True))
+
+
+def _run_coroutine(coro):
+    """Run a coroutine that doesn't need an event loop."""
+    try:
+        coro.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise AssertionError('coroutine suspended')  # pragma: no cover
+
+
+def _sequence_api(name):
+    """Return the C API function ``PySequence_<name>``."""
+    import ctypes
+    pythonapi = getattr(ctypes, 'pythonapi', None)
+    if pythonapi is None:  # pragma: no cover
+        raise unittest.SkipTest('no ctypes.pythonapi')
+    obj, index = ctypes.py_object, ctypes.c_ssize_t
+    argtypes, restype = {
+        'Check': ([obj], ctypes.c_int),
+        'GetItem': ([obj, index], obj),
+        'SetItem': ([obj, index, obj], ctypes.c_int),
+        'DelItem': ([obj, index], ctypes.c_int),
+        'Repeat': ([obj, index], obj),
+        'InPlaceRepeat': ([obj, index], obj),
+    }[name]
+    func = getattr(pythonapi, 'PySequence_' + name)
+    func.argtypes = argtypes
+    func.restype = restype
+    return func
+
+
+def _run_in_threads(func, count=8):
+    """Call func(index) in count threads started together."""
+    barrier = threading.Barrier(count)
+
+    def run(index):
+        barrier.wait()
+        func(index)
+
+    threads = [threading.Thread(target=run, args=(index,))
+               for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
 
 class PyProxyBaseTestCase(unittest.TestCase):
 
@@ -44,6 +189,9 @@ class PyProxyBaseTestCase(unittest.TestCase):
     getslice = '__getitem__'
     setslice = '__setitem__'
 
+    # Whether the proxies forward the buffer protocol
+    has_buffer_protocol = False
+
     def _getTargetClass(self):
         from zope.proxy import PyProxyBase
         return PyProxyBase
@@ -125,6 +273,29 @@ class PyProxyBaseTestCase(unittest.TestCase):
         proxy = self._makeOne(_foo)
         self.assertEqual(proxy(), 'FOO')
 
+    def test___call___w_args_and_kwargs(self):
+        def _foo(*args, **kw):
+            return args, kw
+        proxy = self._makeOne(_foo)
+        self.assertEqual(proxy(1, 2, a=3), ((1, 2), {'a': 3}))
+        self.assertEqual(proxy(*(1, 2), **{'a': 3}), ((1, 2), {'a': 3}))
+
+    def test___call___overridden_in_subclass(self):
+        def _foo():
+            raise AssertionError("Not called")
+
+        class Proxy(self._getTargetClass()):
+            def __call__(self, *args):
+                return 'proxy', args
+
+        proxy = Proxy(_foo)
+        self.assertEqual(proxy(1), ('proxy', (1,)))
+
+        class Sub(self._getTargetClass()):
+            pass
+        Sub.__call__ = lambda self: 'late'
+        self.assertEqual(Sub(_foo)(), 'late')
+
     def test___repr__(self):
         def _foo():
             raise AssertionError("Not called")
@@ -483,16 +654,153 @@ class PyProxyBaseTestCase(unittest.TestCase):
             b.append(x)
         self.assertEqual(a, b)
 
-    # Python 2.7 won't let the C wrapper support __reversed__ :(
-    # def test___reversed__(self):
-    #    w = self._makeOne([0, 1, 2, 3])
-    #    self.assertEqual(list(reversed(w)), [3, 2, 1, 0])
+    def test___next__(self):
+        w = self._makeOne(iter([0, 1]))
+        self.assertEqual(next(w), 0)
+        self.assertEqual(w.__next__(), 1)
+        self.assertRaises(StopIteration, next, w)
+        self.assertEqual(next(w, 42), 42)
+
+    def test___next___not_an_iterator(self):
+        self.assertRaises(TypeError, next, self._makeOne(object()))
+
+    def test___reversed__(self):
+        w = self._makeOne([0, 1, 2, 3])
+        self.assertEqual(list(reversed(w)), [3, 2, 1, 0])
+        w = self._makeOne({'a': 1, 'b': 2})
+        self.assertEqual(list(reversed(w)), ['b', 'a'])
+
+    def test___reversed___not_reversible(self):
+        w = self._makeOne({1, 2})
+        self.assertRaises(TypeError, reversed, w)
+
+    def test___length_hint__(self):
+        import operator
+        w = self._makeOne(iter([0, 1, 2]))
+        self.assertEqual(operator.length_hint(w), 3)
+        self.assertEqual(list(w), [0, 1, 2])
+        self.assertEqual(operator.length_hint(w), 0)
+        w = self._makeOne(x for x in ())
+        self.assertEqual(operator.length_hint(w, 42), 42)
 
     def test___contains__(self):
         w = self._makeOne([0, 1, 2, 3])
         self.assertIn(1, w)
         self.assertNotIn(4, w)
 
+    def test_sequence_item(self):
+        import bisect
+        w = self._makeOne([1, 3, 5, 7])
+        self.assertEqual(bisect.bisect(w, 4), 2)
+        get_item = _sequence_api('GetItem')
+        self.assertEqual(get_item(w, 1), 3)
+        self.assertEqual(get_item(w, -1), 7)
+        self.assertRaises(IndexError, get_item, w, 4)
+
+    def test_sequence_check_of_mapping(self):
+        # Like the slots of the proxy class, PySequence_Check() can't
+        # depend on the proxied object.
+        w = self._makeOne({'a': 1})
+        self.assertEqual(_sequence_api('Check')(w), 1)
+        self.assertEqual(_sequence_api('Check')({}), 0)
+        self.assertEqual(w['a'], 1)
+
+    def test_sequence_ass_item(self):
+        a = [0, 1, 2]
+        w = self._makeOne(a)
+        _sequence_api('SetItem')(w, -1, 3)
+        self.assertEqual(a, [0, 1, 3])
+        _sequence_api('DelItem')(w, 0)
+        self.assertEqual(a, [1, 3])
+
+    def test_sequence_concat(self):
+        import operator
+        a = [0, 1]
+        w = self._makeOne(a)
+        self.assertEqual(operator.concat(w, [2]), [0, 1, 2])
+        self.assertIs(operator.iconcat(w, [2]), w)
+        self.assertEqual(a, [0, 1, 2])
+        w = self._makeOne((0, 1))
+        self.assertEqual(operator.iconcat(w, (2,)), (0, 1, 2))
+
+    def test_sequence_repeat(self):
+        a = [0, 1]
+        w = self._makeOne(a)
+        self.assertEqual(_sequence_api('Repeat')(w, 2), [0, 1, 0, 1])
+        self.assertIs(_sequence_api('InPlaceRepeat')(w, 2), w)
+        self.assertEqual(a, [0, 1, 0, 1])
+
+    def test___await__(self):
+        async def inner():
+            return 42
+
+        async def outer():
+            return await self._makeOne(inner())
+        self.assertEqual(_run_coroutine(outer()), 42)
+
+    def test___await___not_awaitable(self):
+        async def outer():
+            await self._makeOne(1)
+        self.assertRaises(TypeError, _run_coroutine, outer())
+
+    def test___aiter__(self):
+        async def agen():
+            for i in range(3):
+                yield i
+
+        async def outer():
+            return [i async for i in self._makeOne(agen())]
+        self.assertEqual(_run_coroutine(outer()), [0, 1, 2])
+
+    def test___aiter___not_async_iterable(self):
+        async def outer():
+            async for i in self._makeOne([]):
+                pass  # pragma: no cover
+        self.assertRaises(TypeError, _run_coroutine, outer())
+
+    def test___anext__(self):
+        async def agen():
+            yield 1
+
+        async def outer():
+            it = self._makeOne(agen())
+            first = await anext(it)
+            return first, await anext(it, 'done')
+        self.assertEqual(_run_coroutine(outer()), (1, 'done'))
+
+    def test___anext___not_async_iterator(self):
+        async def outer():
+            await anext(self._makeOne(iter([])))
+        self.assertRaises(TypeError, _run_coroutine, outer())
+
+    def test_buffer_not_forwarded(self):
+        if self.has_buffer_protocol:
+            self.skipTest('forwards the buffer protocol')
+        self.assertRaises(TypeError, memoryview, self._makeOne(b'abc'))
+
+    def test_bytearray_of_iterable(self):
+        if self.has_buffer_protocol:
+            self.skipTest('forwards the buffer protocol')
+        self.assertEqual(bytearray(self._makeOne([1, 2, 3])),
+                         bytearray(b'\x01\x02\x03'))
+
+    def test___format__(self):
+        w = self._makeOne(3.14159)
+        self.assertEqual(format(w), '3.14159')
+        self.assertEqual(f'{w:.2f}', '3.14')
+        self.assertEqual('{:>5}'.format(self._makeOne('a')), '    a')
+        self.assertRaises(ValueError, format, w, 'invalid')
+
+    def test___bytes__(self):
+        class Bytes:
+            def __bytes__(self):
+                return b'bytes'
+        self.assertEqual(bytes(self._makeOne(Bytes())), b'bytes')
+        self.assertEqual(bytes(self._makeOne(b'abc')), b'abc')
+        self.assertEqual(bytes(self._makeOne([1, 2])), b'\x01\x02')
+        self.assertEqual(bytes(self._makeOne(2)), b'\x00\x00')
+        self.assertRaises(TypeError, bytes, self._makeOne(object()))
+
     def test___index__(self):
         import operator
         w = self._makeOne(42)
@@ -545,6 +853,25 @@ class PyProxyBaseTestCase(unittest.TestCase):
                         msg = f'x={x!r}; y={y!r}; expr={expr!r}'
                         self.assertEqual(eval(expr), z, msg)
 
+    def test_matmul(self):
+        a = MatMul(2)
+        for x, y in [(self._makeOne(a), 3), (3, self._makeOne(a)),
+                     (self._makeOne(a), self._makeOne(3))]:
+            result = x @ y
+            self.assertIs(type(result), MatMul)
+            self.assertEqual(result.value, 6)
+
+    def test_imatmul(self):
+        a = MatMul(2)
+        pa = qa = self._makeOne(a)
+        pa @= 3
+        self.assertIs(pa, qa)
+        self.assertEqual(a.value, 6)
+
+    def test_complex(self):
+        self.assertEqual(complex(self._makeOne(1 + 2j)), 1 + 2j)
+        self.assertEqual(complex(self._makeOne('1+2j')), 1 + 2j)
+
     def test_pow_w_modulus(self):
         x = self._makeOne(2)
         # Can't coerce 2nd / 3rd args in pure Python, because we can't
@@ -598,6 +925,18 @@ class PyProxyBaseTestCase(unittest.TestCase):
         w = self._makeOne(o)
         self.assertIs(w.__class__, o.__class__)
 
+    def test___class___not_interned(self):
+        # Names built at runtime are not interned, but must still be
+        # recognized.
+        name = ''.join(['__cl', 'ass__'])
+
+        class Proxy(self._getTargetClass()):
+            pass
+
+        o = object()
+        w = Proxy(o)
+        self.assertIs(getattr(w, name), o.__class__)
+
     def test_descriptor__set___only_in_proxy_subclass(self):
 
         class Descriptor:
@@ -717,7 +1056,7 @@ class PyProxyBaseTestCase(unittest.TestCase):
         # the pure-python version
         if hasattr(Proxy, '__implemented__'):  # pragma: no cover
             from zope.proxy import PyProxyBase
-            self.assertIs(self._getTargetClass(), PyProxyBase)
+            self.assertTrue(issubclass(self._getTargetClass(), PyProxyBase))
 
     def test_wrapping_builtin_with_subclass_returns_correct_provided_by(self):
         self._check_wrapping_builtin_with_subclass_returns_correct_provided_by(
@@ -739,6 +1078,143 @@ class PyProxyBaseTestCase(unittest.TestCase):
         proxy = self._makeOne("14")
         self.assertEqual(14, int(proxy))
 
+    def test_proxy_subclass_modified_after_lookup(self):
+        class Wrapped:
+            attr = 'wrapped'
+
+        class Base(self._getTargetClass()):
+            pass
+
+        class Proxy(Base):
+            pass
+
+        proxy = Proxy(Wrapped())
+        self.assertEqual(proxy.attr, 'wrapped')
+
+        # Adding a data descriptor to a base class takes effect at once
+        Base.attr = property(lambda self: 'descriptor')
+        self.assertEqual(proxy.attr, 'descriptor')
+
+        # And so does removing it again
+        del Base.attr
+        self.assertEqual(proxy.attr, 'wrapped')
+
+        Proxy.attr = property(lambda self: 'subclass')
+        self.assertEqual(proxy.attr, 'subclass')
+        del Proxy.attr
+        self.assertEqual(proxy.attr, 'wrapped')
+
+    def test_proxy_subclass_mixin_modified_after_lookup(self):
+        class Wrapped:
+            attr = 'wrapped'
+
+        class Mixin:
+            pass
+
+        class Proxy(self._getTargetClass(), Mixin):
+            pass
+
+        proxy = Proxy(Wrapped())
+        self.assertEqual(proxy.attr, 'wrapped')
+
+        Mixin.attr = property(lambda self: 'mixin')
+        self.assertEqual(proxy.attr, 'mixin')
+
+        del Mixin.attr
+        self.assertEqual(proxy.attr, 'wrapped')
+
+    def test_lookup_cache_not_visible(self):
+        class Wrapped:
+            _zope_proxy_lookup_cache = 'wrapped'
+
+        class Proxy(self._getTargetClass()):
+            pass
+
+        proxy = Proxy(Wrapped())
+        proxy.attr = 1
+        self.assertEqual(proxy._zope_proxy_lookup_cache, 'wrapped')
+        self.assertEqual(self._makeOne(Wrapped())._zope_proxy_lookup_cache,
+                         'wrapped')
+        self.assertNotIn('_zope_proxy_lookup_cache', Proxy.__dict__)
+
+    def test_lookup_cache_discarded_with_class(self):
+        import gc
+
+        import zope.proxy
+        if not issubclass(self._getTargetClass(),
+                          zope.proxy.AbstractPyProxyBase):
+            self.skipTest('no Python lookup cache')
+
+        class Proxy(self._getTargetClass()):
+            pass
+
+        Proxy(object()).__doc__
+        key = id(Proxy)
+        self.assertIn(key, zope.proxy._lookup_caches)
+        del Proxy
+        gc.collect()
+        self.assertNotIn(key, zope.proxy._lookup_caches)
+        self.assertNotIn(key, zope.proxy._lookup_cache_refs)
+
+    def test_lookup_cache_bounded(self):
+        import zope.proxy
+        if not issubclass(self._getTargetClass(),
+                          zope.proxy.AbstractPyProxyBase):
+            self.skipTest('no Python lookup cache')
+
+        class Wrapped:
+            attr = 'wrapped'
+
+        class Proxy(self._getTargetClass()):
+            @property
+            def prop(self):
+                return 'prop'
+
+        proxy = Proxy(Wrapped())
+        size = zope.proxy._LOOKUP_CACHE_SIZE
+        for i in range(size * 2):
+            self.assertIsNone(getattr(proxy, 'missing%d' % i, None))
+            self.assertEqual(proxy.attr, 'wrapped')
+            self.assertEqual(proxy.prop, 'prop')
+        self.assertLessEqual(len(zope.proxy._lookup_caches[id(Proxy)]), size)
+
+    def test_lookup_cache_class_changed_meanwhile(self):
+        import zope.proxy
+        if not issubclass(self._getTargetClass(),
+                          zope.proxy.AbstractPyProxyBase):
+            self.skipTest('no Python lookup cache')
+
+        class Wrapped:
+            attr = 'wrapped'
+
+        class Proxy(self._getTargetClass()):
+            attr = 'proxy'
+
+        proxy = Proxy(Wrapped())
+        self.assertEqual(proxy.attr, 'proxy')
+        # As another thread could do between looking up the cache and
+        # the class.
+        type.__delattr__(Proxy, 'attr')
+        self.assertEqual(proxy.attr, 'wrapped')
+
+    def test_lookup_cache_does_not_keep_descriptors_alive(self):
+        import gc
+        import weakref
+
+        def make_proxy_class():
+            class Proxy(self._getTargetClass()):
+                def method(self):
+                    return super().method()
+
+            proxy = Proxy(object())
+            proxy.method
+            proxy.method
+            return weakref.ref(Proxy.__dict__['method'])
+
+        ref = make_proxy_class()
+        gc.collect()
+        self.assertIsNone(ref())
+
 
 # When the C extension is not available the target class will be the same as
 # the Python implementation class. No need to run tests twice in that case.
@@ -749,6 +1225,62 @@ class ProxyBaseTestCase(PyProxyBaseTestCase):
         from zope.proxy import ProxyBase
         return ProxyBase
 
+    def test_sequence_item_of_mapping(self):
+        # Python subclasses of ProxyBase get slots that call __getitem__
+        # and __setitem__ instead.
+        from zope.proxy import ProxyBase
+
+        class Dict(dict):
+            def __getitem__(self, key):
+                raise AssertionError('not called')
+
+            def __setitem__(self, key, value):
+                raise AssertionError('not called')
+
+        get_item = _sequence_api('GetItem')
+        set_item = _sequence_api('SetItem')
+        del_item = _sequence_api('DelItem')
+        for mapping in ({0: 'a'}, Dict()):
+            w = ProxyBase(mapping)
+            self.assertRaises(TypeError, get_item, w, 0)
+            self.assertRaises(TypeError, set_item, w, 0, 'b')
+            self.assertRaises(TypeError, del_item, w, 0)
+
+    def test_asyncio_task(self):
+        # The C Task sends to the coroutine with PyIter_Send().
+        import asyncio
+
+        async def inner():
+            await asyncio.sleep(0)
+            return 42
+
+        async def outer():
+            return await asyncio.ensure_future(self._makeOne(inner()))
+        self.assertEqual(asyncio.run(outer()), 42)
+
+    def test___next___steps_coroutine(self):
+        # For PyIter_Send(), which falls back to tp_iternext in
+        # subclasses.
+        async def coro(value):
+            await asyncio.sleep(0)
+            return value
+        import asyncio
+        proxy = self._makeOne(coro(42))
+        self.assertIsNone(next(proxy))
+        with self.assertRaises(StopIteration) as exc:
+            next(proxy)
+        self.assertEqual(exc.exception.value, 42)
+
+        proxy = self._makeOne(coro(None))
+        next(proxy)
+        self.assertRaises(StopIteration, next, proxy)
+
+        proxy = self._makeOne(coro((1, 2)))
+        next(proxy)
+        with self.assertRaises(StopIteration) as exc:
+            next(proxy)
+        self.assertEqual(exc.exception.value, (1, 2))
+
     def test__reduce__raises(self):
         # With the C extension available the call to __reduce__
         # is delegated to copyreg._reduce_ex from the standard library.
@@ -768,6 +1300,304 @@ class ProxyBaseTestCase(PyProxyBaseTestCase):
             proxy.__reduce_ex__(0)
 
 
+class PyWeakrefableProxyBaseTestCase(PyProxyBaseTestCase):
+
+    def _getTargetClass(self):
+        from zope.proxy import PyWeakrefableProxyBase
+        return PyWeakrefableProxyBase
+
+    def test_weakref(self):
+        import gc
+        import weakref
+
+        class C:
+            pass
+        c = C()
+        proxy = self._makeOne(c)
+        ref = weakref.ref(proxy)
+        self.assertIs(ref(), proxy)
+        del proxy
+        gc.collect()
+        self.assertIsNone(ref())
+        # The proxied object is unaffected
+        self.assertIsNotNone(weakref.ref(c)())
+
+    def test_weak_value_dictionary(self):
+        import gc
+        import weakref
+
+        cache = weakref.WeakValueDictionary()
+        proxy = self._makeOne(object())
+        cache['key'] = proxy
+        self.assertIs(cache['key'], proxy)
+        del proxy
+        gc.collect()
+        self.assertNotIn('key', cache)
+
+    def test_subclass_with_slots(self):
+        import weakref
+
+        class Proxy(self._getTargetClass()):
+            __slots__ = ('extra', )
+
+        proxy = Proxy(object())
+        self.assertIs(weakref.ref(proxy)(), proxy)
+
+
+@unittest.skipUnless(_c_available, 'C extension not available')
+class WeakrefableProxyBaseTestCase(PyWeakrefableProxyBaseTestCase,
+                                   ProxyBaseTestCase):
+
+    def _getTargetClass(self):
+        from zope.proxy import WeakrefableProxyBase
+        return WeakrefableProxyBase
+
+    def test___doc___forwarded(self):
+        class C:
+            """The proxied object's documentation."""
+
+        proxy = self._makeOne(C())
+        self.assertEqual(proxy.__doc__, C.__doc__)
+        self.assertEqual(self._makeOne(proxy).__doc__, C.__doc__)
+
+    def test___weakref___forwarded(self):
+        import weakref
+
+        class C:
+            pass
+        c = C()
+        proxy = self._makeOne(c)
+        ref = weakref.ref(proxy)
+        self.assertIsNone(proxy.__weakref__)
+        c_ref = weakref.ref(c)
+        self.assertIs(proxy.__weakref__, c_ref)
+        self.assertIs(ref(), proxy)
+
+
+class PyBufferProxyBaseTestCase(PyProxyBaseTestCase):
+
+    # Python classes can only provide buffers as of PEP 688
+    has_buffer_protocol = sys.version_info >= (3, 12)
+
+    def _getTargetClass(self):
+        from zope.proxy import PyBufferProxyBase
+        return PyBufferProxyBase
+
+    def test_buffer_readonly(self):
+        import hashlib
+        if not self.has_buffer_protocol:
+            self.skipTest('no buffer protocol')
+        w = self._makeOne(b'abc')
+        with memoryview(w) as view:
+            self.assertTrue(view.readonly)
+            self.assertEqual(view.tobytes(), b'abc')
+        self.assertEqual(hashlib.sha1(w).digest(),
+                         hashlib.sha1(b'abc').digest())
+
+    def test_buffer_writable(self):
+        if not self.has_buffer_protocol:
+            self.skipTest('no buffer protocol')
+        data = bytearray(b'abc')
+        w = self._makeOne(data)
+        with memoryview(w) as view:
+            self.assertFalse(view.readonly)
+            view[0] = ord('x')
+            # The export is held by the proxied object until released.
+            self.assertRaises(BufferError, data.append, 1)
+        self.assertEqual(data, b'xbc')
+        data.append(1)
+
+    def test_buffer_not_supported(self):
+        if not self.has_buffer_protocol:
+            self.skipTest('no buffer protocol')
+        w = self._makeOne([1, 2])
+        self.assertRaises(TypeError, memoryview, w)
+        # bytearray() uses the buffer protocol if there is one.
+        self.assertRaises(TypeError, bytearray, w)
+
+
+@unittest.skipUnless(_c_available, 'C extension not available')
+class BufferProxyBaseTestCase(PyBufferProxyBaseTestCase,
+                              ProxyBaseTestCase):
+
+    has_buffer_protocol = True
+
+    def _getTargetClass(self):
+        from zope.proxy import BufferProxyBase
+        return BufferProxyBase
+
+
+def _eagerly_constructed(lazy_proxy_class):
+    # Lazy proxies take a factory; let the inherited tests (and their
+    # subclasses) pass the object to proxy.
+    class Proxy(lazy_proxy_class):
+        __slots__ = ()
+
+        def __new__(cls, obj):
+            return super().__new__(cls, lambda: obj)
+
+        def __init__(self, obj):
+            super().__init__(lambda: obj)
+    return Proxy
+
+
+class PyLazyProxyBaseTestCase(PyProxyBaseTestCase):
+
+    def _getLazyClass(self):
+        from zope.proxy import PyLazyProxyBase
+        return PyLazyProxyBase
+
+    def _getTargetClass(self):
+        return _eagerly_constructed(self._getLazyClass())
+
+    def _getProxiedObject(self, proxy):
+        from zope.proxy import py_getProxiedObject
+        return py_getProxiedObject(proxy)
+
+    def _removeAllProxies(self, proxy):
+        from zope.proxy import py_removeAllProxies
+        return py_removeAllProxies(proxy)
+
+    def _sameProxiedObjects(self, lhs, rhs):
+        from zope.proxy import py_sameProxiedObjects
+        return py_sameProxiedObjects(lhs, rhs)
+
+    def _setProxiedObject(self, proxy, obj):
+        from zope.proxy import py_setProxiedObject
+        return py_setProxiedObject(proxy, obj)
+
+    def _makeLazy(self, obj=None):
+        calls = []
+
+        def factory():
+            calls.append(obj)
+            return obj
+        return self._getLazyClass()(factory), calls
+
+    def test_factory_not_called_until_needed(self):
+        proxy, calls = self._makeLazy([1, 2])
+        self.assertEqual(calls, [])
+        self.assertEqual(len(proxy), 2)
+        self.assertEqual(proxy[1], 2)
+        self.assertEqual(calls, [[1, 2]])
+
+    def test_factory_not_callable(self):
+        self.assertRaises(TypeError, self._getLazyClass(), object())
+
+    def test_factory_error_propagates_and_retries(self):
+        results = [ValueError('first'), 'second']
+
+        def factory():
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return result
+        proxy = self._getLazyClass()(factory)
+        self.assertRaises(ValueError, len, proxy)
+        self.assertEqual(proxy.upper(), 'SECOND')
+        self.assertEqual(results, [])
+
+    def test_data_descriptor_in_proxy_subclass_does_not_materialize(self):
+        class Proxy(self._getLazyClass()):
+            @property
+            def loaded(self):
+                return 'loaded'
+
+            def method(self):
+                return 'method'
+        calls = []
+        proxy = Proxy(lambda: calls.append(1))
+        self.assertEqual(proxy.loaded, 'loaded')
+        self.assertEqual(calls, [])
+        # Non-data descriptors are looked up on the proxied object first.
+        self.assertEqual(proxy.method(), 'method')
+        self.assertEqual(calls, [1])
+
+    def test_getProxiedObject_materializes(self):
+        obj = object()
+        proxy, calls = self._makeLazy(obj)
+        self.assertIs(self._getProxiedObject(proxy), obj)
+        self.assertIs(self._getProxiedObject(proxy), obj)
+        self.assertEqual(calls, [obj])
+
+    def test_removeAllProxies_materializes(self):
+        obj = object()
+        proxy, calls = self._makeLazy(obj)
+        self.assertIs(self._removeAllProxies(proxy), obj)
+        self.assertEqual(calls, [obj])
+
+    def test_sameProxiedObjects_materializes(self):
+        obj = object()
+        proxy, calls = self._makeLazy(obj)
+        self.assertTrue(self._sameProxiedObjects(proxy, obj))
+        self.assertTrue(self._sameProxiedObjects(obj, proxy))
+        self.assertEqual(calls, [obj])
+
+    def test_setProxiedObject_before_materialization(self):
+        obj = object()
+        other = object()
+        proxy, calls = self._makeLazy(obj)
+        self.assertIs(self._setProxiedObject(proxy, other), obj)
+        self.assertIs(self._getProxiedObject(proxy), other)
+        self.assertEqual(calls, [obj])
+
+    def test_nested_lazy_proxies(self):
+        obj = object()
+        inner, calls = self._makeLazy(obj)
+        outer = self._getLazyClass()(lambda: inner)
+        self.assertIs(self._removeAllProxies(outer), obj)
+        self.assertEqual(calls, [obj])
+
+    def test___init___replaces_factory(self):
+        proxy, calls = self._makeLazy('first')
+        type(proxy).__init__(proxy, lambda: 'second')
+        self.assertEqual(proxy, 'second')
+        self.assertEqual(calls, [])
+
+
+class LazyProxyBaseTestCase(PyLazyProxyBaseTestCase, ProxyBaseTestCase):
+
+    def _getLazyClass(self):
+        from zope.proxy import LazyProxyBase
+        return LazyProxyBase
+
+    def _getProxiedObject(self, proxy):
+        from zope.proxy import getProxiedObject
+        return getProxiedObject(proxy)
+
+    def _removeAllProxies(self, proxy):
+        from zope.proxy import removeAllProxies
+        return removeAllProxies(proxy)
+
+    def _sameProxiedObjects(self, lhs, rhs):
+        from zope.proxy import sameProxiedObjects
+        return sameProxiedObjects(lhs, rhs)
+
+    def _setProxiedObject(self, proxy, obj):
+        from zope.proxy import setProxiedObject
+        return setProxiedObject(proxy, obj)
+
+    def test_concurrent_materialization_agrees(self):
+        calls = []
+
+        def factory():
+            obj = object()
+            calls.append(obj)
+            return obj
+
+        proxy = self._getLazyClass()(factory)
+        seen = [None] * 8
+
+        def materialize(index):
+            seen[index] = self._getProxiedObject(proxy)
+
+        _run_in_threads(materialize, len(seen))
+        # The factory may run more than once, but the first object
+        # stored is the one everybody gets.
+        self.assertIn(seen[0], calls)
+        self.assertEqual(seen, [seen[0]] * len(seen))
+
+
 class Test_py__module(unittest.TestCase):
     # Historically, proxying __module__ has been troublesome,
     # especially when subclasses of the proxy class are involved;
@@ -954,6 +1784,24 @@ class Test_setProxiedObject(Test_py_setProxiedObject):
         from zope.proxy import ProxyBase
         return ProxyBase(obj)
 
+    def test_concurrent_swaps_are_atomic(self):
+        first = object()
+        proxy = self._makeProxy(first)
+        replaced = [[] for _ in range(8)]
+
+        def swap(index):
+            for _ in range(1000):
+                replaced[index].append(self._callFUT(proxy, object()))
+
+        _run_in_threads(swap, len(replaced))
+        # Every object stored was replaced exactly once, except the
+        # last one, which is still there.
+        olds = [id(old) for olds in replaced for old in olds]
+        self.assertEqual(len(set(olds)), len(olds))
+        self.assertIn(id(first), olds)
+        from zope.proxy import getProxiedObject
+        self.assertNotIn(id(getProxiedObject(proxy)), olds)
+
 
 class Test_py_isProxy(unittest.TestCase):
 
@@ -1353,6 +2201,947 @@ class Test_removeAllProxies(Test_py_removeAllProxies):
         return Proxy(obj, checker)
 
 
+class Test_py_removeAllProxiesMany(unittest.TestCase):
+
+    def _callFUT(self, *args):
+        from zope.proxy import py_removeAllProxiesMany
+        return py_removeAllProxiesMany(*args)
+
+    def _makeProxy(self, obj):
+        from zope.proxy import PyProxyBase
+        return PyProxyBase(obj)
+
+    def test_empty(self):
+        self.assertEqual(self._callFUT(()), [])
+
+    def test_mixed(self):
+        class C:
+            pass
+        c1, c2, c3 = C(), C(), C()
+        objects = (c1, self._makeProxy(c2),
+                   self._makeProxy(self._makeProxy(c3)))
+        result = self._callFUT(objects)
+        self.assertIsInstance(result, list)
+        self.assertEqual(len(result), 3)
+        for expected, obj in zip((c1, c2, c3), result):
+            self.assertIs(obj, expected)
+
+    def test_iterator(self):
+        class C:
+            pass
+        cs = [C() for i in range(5)]
+        result = self._callFUT(self._makeProxy(c) for c in cs)
+        self.assertEqual(len(result), 5)
+        for expected, obj in zip(cs, result):
+            self.assertIs(obj, expected)
+
+    def test_list_is_copied(self):
+        class C:
+            pass
+        c = C()
+        proxy = self._makeProxy(c)
+        objects = [proxy]
+        result = self._callFUT(objects)
+        self.assertIsNot(result, objects)
+        self.assertIs(objects[0], proxy)
+        self.assertIs(result[0], c)
+
+    def test_not_iterable(self):
+        self.assertRaises(TypeError, self._callFUT, 42)
+
+
+class Test_removeAllProxiesMany(Test_py_removeAllProxiesMany):
+
+    def _callFUT(self, *args):
+        from zope.proxy import removeAllProxiesMany
+        return removeAllProxiesMany(*args)
+
+    def _makeProxy(self, obj):
+        from zope.proxy import ProxyBase
+        return ProxyBase(obj)
+
+
+class Test_py_removeAllProxiesInPlace(unittest.TestCase):
+
+    def _callFUT(self, *args):
+        from zope.proxy import py_removeAllProxiesInPlace
+        return py_removeAllProxiesInPlace(*args)
+
+    def _makeProxy(self, obj):
+        from zope.proxy import PyProxyBase
+        return PyProxyBase(obj)
+
+    def test_mixed(self):
+        class C:
+            pass
+        c1, c2, c3 = C(), C(), C()
+        objects = [c1, self._makeProxy(c2),
+                   self._makeProxy(self._makeProxy(c3))]
+        self.assertIsNone(self._callFUT(objects))
+        self.assertEqual(len(objects), 3)
+        for expected, obj in zip((c1, c2, c3), objects):
+            self.assertIs(obj, expected)
+
+    def test_not_a_list(self):
+        proxy = self._makeProxy(object())
+        self.assertRaises(TypeError, self._callFUT, (proxy,))
+
+
+class Test_removeAllProxiesInPlace(Test_py_removeAllProxiesInPlace):
+
+    def _callFUT(self, *args):
+        from zope.proxy import removeAllProxiesInPlace
+        return removeAllProxiesInPlace(*args)
+
+    def _makeProxy(self, obj):
+        from zope.proxy import ProxyBase
+        return ProxyBase(obj)
+
+
+class Test_py_callMethod(unittest.TestCase):
+
+    def _callFUT(self, *args, **kw):
+        from zope.proxy import py_callMethod
+        return py_callMethod(*args, **kw)
+
+    def _getProxyClass(self):
+        from zope.proxy import PyProxyBase
+        return PyProxyBase
+
+    def _makeProxy(self, obj):
+        return self._getProxyClass()(obj)
+
+    def _makeOne(self):
+        class C:
+            def method(self, *args, **kw):
+                return self, args, kw
+        return C()
+
+    def test_no_proxy(self):
+        c = self._makeOne()
+        self.assertEqual(self._callFUT(c, 'method', 1, 2, a=3),
+                         (c, (1, 2), {'a': 3}))
+
+    def test_simple_proxy(self):
+        c = self._makeOne()
+        proxy = self._makeProxy(c)
+        self.assertEqual(self._callFUT(proxy, 'method'), (c, (), {}))
+        self.assertEqual(self._callFUT(proxy, 'method', 1, obj=2, name=3),
+                         (c, (1,), {'obj': 2, 'name': 3}))
+
+    def test_nested_proxy(self):
+        c = self._makeOne()
+        proxy = self._makeProxy(self._makeProxy(c))
+        self.assertEqual(self._callFUT(proxy, 'method', *range(10)),
+                         (c, tuple(range(10)), {}))
+
+    def test_builtin_method(self):
+        proxy = self._makeProxy([3, 1, 2])
+        self.assertIsNone(self._callFUT(proxy, 'sort', reverse=True))
+        self.assertEqual(proxy, [3, 2, 1])
+
+    def test_method_in_proxy_class(self):
+        from zope.proxy import non_overridable
+
+        class Proxy(self._getProxyClass()):
+            def method(self):
+                raise AssertionError("Not called")
+
+            @non_overridable
+            def other(self, arg):
+                return 'proxy', arg
+
+        c = self._makeOne()
+        c.other = None
+        proxy = Proxy(c)
+        # Regular methods of the proxied object win...
+        self.assertEqual(self._callFUT(proxy, 'method'), (c, (), {}))
+        # ...unless the proxy class insists
+        self.assertEqual(self._callFUT(proxy, 'other', 1), ('proxy', 1))
+
+    def test_proxy_class_guards_attributes(self):
+        class Forbidden(Exception):
+            pass
+
+        class Guard(self._getProxyClass()):
+            def __getattribute__(self, name):
+                if name == 'delete':
+                    raise Forbidden(name)
+                return super().__getattribute__(name)
+
+        class C:
+            def delete(self):
+                return 'deleted!'
+
+            def method(self):
+                return 'called'
+
+        proxy = Guard(self._makeProxy(C()))
+        self.assertRaises(Forbidden, self._callFUT, proxy, 'delete')
+        self.assertEqual(self._callFUT(proxy, 'method'), 'called')
+
+    def test_missing_method(self):
+        proxy = self._makeProxy(object())
+        self.assertRaises(AttributeError, self._callFUT, proxy, 'missing')
+
+    def test_bad_name(self):
+        proxy = self._makeProxy(object())
+        self.assertRaises(TypeError, self._callFUT, proxy, 42)
+
+
+class Test_callMethod(Test_py_callMethod):
+
+    def _callFUT(self, *args, **kw):
+        from zope.proxy import callMethod
+        return callMethod(*args, **kw)
+
+    def _getProxyClass(self):
+        from zope.proxy import ProxyBase
+        return ProxyBase
+
+    def test_too_few_arguments(self):
+        self.assertRaises(TypeError, self._callFUT, object())
+
+
+class Test_py_internProxy(unittest.TestCase):
+
+    def _callFUT(self, *args):
+        from zope.proxy import py_internProxy
+        return py_internProxy(*args)
+
+    def _getProxyClass(self):
+        from zope.proxy import PyWeakrefableProxyBase
+        return PyWeakrefableProxyBase
+
+    def _getNonWeakrefableProxyClass(self):
+        from zope.proxy import PyProxyBase
+        return PyProxyBase
+
+    def _getProxiedObject(self, proxy):
+        from zope.proxy import py_getProxiedObject
+        return py_getProxiedObject(proxy)
+
+    def _setProxiedObject(self, proxy, obj):
+        from zope.proxy import py_setProxiedObject
+        return py_setProxiedObject(proxy, obj)
+
+    def test_same_object_same_proxy(self):
+        class C:
+            pass
+        c = C()
+        proxy = self._callFUT(self._getProxyClass(), c)
+        self.assertIsInstance(proxy, self._getProxyClass())
+        self.assertIs(self._getProxiedObject(proxy), c)
+        self.assertIs(self._callFUT(self._getProxyClass(), c), proxy)
+
+    def test_different_objects(self):
+        proxy1 = self._callFUT(self._getProxyClass(), [])
+        proxy2 = self._callFUT(self._getProxyClass(), [])
+        self.assertIsNot(proxy1, proxy2)
+
+    def test_different_proxy_classes(self):
+        class Proxy(self._getProxyClass()):
+            pass
+        c = object()
+        proxy1 = self._callFUT(self._getProxyClass(), c)
+        proxy2 = self._callFUT(Proxy, c)
+        self.assertIsNot(proxy1, proxy2)
+        self.assertIsInstance(proxy2, Proxy)
+
+    def test_dead_proxy_replaced(self):
+        import gc
+        import weakref
+        c = object()
+        proxy = self._callFUT(self._getProxyClass(), c)
+        ref = weakref.ref(proxy)
+        del proxy
+        gc.collect()
+        self.assertIsNone(ref())
+        proxy = self._callFUT(self._getProxyClass(), c)
+        self.assertIs(self._getProxiedObject(proxy), c)
+
+    def test_repointed_proxy_not_reused(self):
+        c1 = object()
+        c2 = object()
+        proxy = self._callFUT(self._getProxyClass(), c1)
+        self._setProxiedObject(proxy, c2)
+        proxy1 = self._callFUT(self._getProxyClass(), c1)
+        self.assertIsNot(proxy1, proxy)
+        self.assertIs(self._getProxiedObject(proxy1), c1)
+        self.assertIs(self._callFUT(self._getProxyClass(), c1), proxy1)
+
+    def test_not_weakrefable(self):
+        self.assertRaises(TypeError, self._callFUT,
+                          self._getNonWeakrefableProxyClass(), object())
+
+    def test_not_a_proxy_class(self):
+        self.assertRaises(TypeError, self._callFUT, list, object())
+        self.assertRaises(TypeError, self._callFUT, None, object())
+
+    def test_wrong_number_of_arguments(self):
+        self.assertRaises(TypeError, self._callFUT, self._getProxyClass())
+
+
+class Test_internProxy(Test_py_internProxy):
+
+    def _callFUT(self, *args):
+        from zope.proxy import internProxy
+        return internProxy(*args)
+
+    def _getProxyClass(self):
+        from zope.proxy import WeakrefableProxyBase
+        return WeakrefableProxyBase
+
+    def _getNonWeakrefableProxyClass(self):
+        from zope.proxy import ProxyBase
+        return ProxyBase
+
+    def _getProxiedObject(self, proxy):
+        from zope.proxy import getProxiedObject
+        return getProxiedObject(proxy)
+
+    def _setProxiedObject(self, proxy, obj):
+        from zope.proxy import setProxiedObject
+        return setProxiedObject(proxy, obj)
+
+
+class Test_py_wrapMany(unittest.TestCase):
+
+    def _callFUT(self, *args):
+        from zope.proxy import py_wrapMany
+        return py_wrapMany(*args)
+
+    def _getProxyClass(self):
+        from zope.proxy import PyProxyBase
+        return PyProxyBase
+
+    def _getProxiedObject(self, proxy):
+        from zope.proxy import py_getProxiedObject
+        return py_getProxiedObject(proxy)
+
+    def test_empty(self):
+        self.assertEqual(self._callFUT(self._getProxyClass(), ()), [])
+
+    def test_w_list(self):
+        objects = [object(), object(), object()]
+        proxies = self._callFUT(self._getProxyClass(), objects)
+        self.assertIsInstance(proxies, list)
+        self.assertEqual(len(proxies), 3)
+        for proxy, obj in zip(proxies, objects):
+            self.assertIs(type(proxy), self._getProxyClass())
+            self.assertIs(self._getProxiedObject(proxy), obj)
+
+    def test_w_generator(self):
+        objects = [object(), object()]
+        proxies = self._callFUT(self._getProxyClass(),
+                                (obj for obj in objects))
+        self.assertEqual([self._getProxiedObject(p) for p in proxies],
+                         objects)
+
+    def test_w_subclass(self):
+        class Proxy(self._getProxyClass()):
+            pass
+        proxies = self._callFUT(Proxy, [1, 2])
+        self.assertEqual([type(p) for p in proxies], [Proxy, Proxy])
+        self.assertEqual(proxies, [1, 2])
+        self.assertEqual(proxies[0] + 1, 2)
+
+    def test_w_subclass_w_custom_init(self):
+        class Proxy(self._getProxyClass()):
+            __slots__ = ('extra',)
+
+            def __init__(self, obj):
+                super().__init__(obj)
+                self.extra = obj * 2
+        proxies = self._callFUT(Proxy, [1, 2])
+        self.assertEqual([p.extra for p in proxies], [2, 4])
+
+    def test_w_subclass_w_custom_new(self):
+        created = []
+
+        class Proxy(self._getProxyClass()):
+            def __new__(cls, obj):
+                created.append(obj)
+                return super().__new__(cls, obj)
+        proxies = self._callFUT(Proxy, [1, 2])
+        self.assertEqual(created, [1, 2])
+        self.assertEqual([self._getProxiedObject(p) for p in proxies],
+                         [1, 2])
+
+    def test_error_in_init_propagates(self):
+        class Proxy(self._getProxyClass()):
+            def __init__(self, obj):
+                raise ValueError(obj)
+        self.assertRaises(ValueError, self._callFUT, Proxy, [1])
+
+    def test_not_iterable(self):
+        self.assertRaises(TypeError, self._callFUT,
+                          self._getProxyClass(), object())
+
+    def test_not_a_proxy_class(self):
+        self.assertRaises(TypeError, self._callFUT, list, [1])
+        self.assertRaises(TypeError, self._callFUT, None, [1])
+
+
+class Test_wrapMany(Test_py_wrapMany):
+
+    def _callFUT(self, *args):
+        from zope.proxy import wrapMany
+        return wrapMany(*args)
+
+    def _getProxyClass(self):
+        from zope.proxy import ProxyBase
+        return ProxyBase
+
+    def _getProxiedObject(self, proxy):
+        from zope.proxy import getProxiedObject
+        return getProxiedObject(proxy)
+
+    def test_proxies_are_callable(self):
+        proxy, = self._callFUT(self._getProxyClass(), [len])
+        self.assertEqual(proxy('abc'), 3)
+
+    def test_wrong_number_of_arguments(self):
+        self.assertRaises(TypeError, self._callFUT, self._getProxyClass())
+
+
+class Test_py_registerProxyReducer(unittest.TestCase):
+
+    def _callFUT(self, *args):
+        from zope.proxy import py_registerProxyReducer
+        return py_registerProxyReducer(*args)
+
+    def _getProxyClass(self):
+        from zope.proxy import PyProxyBase
+        return PyProxyBase
+
+    def _getProxiedObject(self, proxy):
+        from zope.proxy import py_getProxiedObject
+        return py_getProxiedObject(proxy)
+
+    def _register(self, proxytype, reducer):
+        self._callFUT(proxytype, reducer)
+        self.addCleanup(self._callFUT, proxytype, None)
+
+    def _rewrap(self, proxy):
+        return (self._getProxyClass(), (self._getProxiedObject(proxy),))
+
+    def test_pickle_round_trip(self):
+        self._register(self._getProxyClass(), self._rewrap)
+        proxy = self._getProxyClass()([1, 2])
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            unpickled = pickle.loads(pickle.dumps(proxy, protocol))
+            self.assertIs(type(unpickled), self._getProxyClass())
+            self.assertEqual(self._getProxiedObject(unpickled), [1, 2])
+
+    def test_copy(self):
+        import copy
+        self._register(self._getProxyClass(), self._rewrap)
+        proxy = self._getProxyClass()([[1]])
+        shallow = copy.copy(proxy)
+        deep = copy.deepcopy(proxy)
+        self.assertIs(type(shallow), self._getProxyClass())
+        self.assertIs(self._getProxiedObject(shallow)[0],
+                      self._getProxiedObject(proxy)[0])
+        self.assertIs(type(deep), self._getProxyClass())
+        self.assertEqual(deep, [[1]])
+        self.assertIsNot(self._getProxiedObject(deep)[0],
+                         self._getProxiedObject(proxy)[0])
+
+    def test_reducer_called_with_proxy(self):
+        called = []
+
+        def reducer(proxy):
+            called.append(proxy)
+            return 'reduced'
+        self._register(self._getProxyClass(), reducer)
+        proxy = self._getProxyClass()(1)
+        self.assertEqual(proxy.__reduce__(), 'reduced')
+        self.assertEqual(proxy.__reduce_ex__(2), 'reduced')
+        self.assertEqual(len(called), 2)
+        self.assertIs(called[0], proxy)
+
+    def test_subclass_uses_reducer_of_base(self):
+        class Proxy(self._getProxyClass()):
+            pass
+        self._register(self._getProxyClass(), self._rewrap)
+        unpickled = pickle.loads(pickle.dumps(Proxy('abc')))
+        self.assertIs(type(unpickled), self._getProxyClass())
+        self.assertEqual(unpickled, 'abc')
+
+    def test_subclass_reducer_wins(self):
+        class Proxy(self._getProxyClass()):
+            pass
+        self._register(self._getProxyClass(), lambda proxy: 'base')
+        self._register(Proxy, lambda proxy: 'sub')
+        self.assertEqual(Proxy(1).__reduce_ex__(2), 'sub')
+        self.assertEqual(self._getProxyClass()(1).__reduce_ex__(2), 'base')
+
+    def test_error_in_reducer_propagates(self):
+        def reducer(proxy):
+            raise ValueError(proxy)
+        self._register(self._getProxyClass(), reducer)
+        self.assertRaises(ValueError, pickle.dumps, self._getProxyClass()(1))
+
+    def test_unregister(self):
+        class Proxy(self._getProxyClass()):
+            pass
+        self._callFUT(Proxy, lambda proxy: 'reduced')
+        self._callFUT(Proxy, None)
+        self.assertRaises((pickle.PicklingError, TypeError),
+                          Proxy(1).__reduce__)
+        # Removing it again is fine
+        self._callFUT(Proxy, None)
+
+    def test_not_a_proxy_class(self):
+        self.assertRaises(TypeError, self._callFUT, list, self._rewrap)
+        self.assertRaises(TypeError, self._callFUT, None, self._rewrap)
+
+    def test_not_callable(self):
+        self.assertRaises(TypeError, self._callFUT,
+                          self._getProxyClass(), 'reducer')
+
+
+class Test_registerProxyReducer(Test_py_registerProxyReducer):
+
+    def _callFUT(self, *args):
+        from zope.proxy import registerProxyReducer
+        return registerProxyReducer(*args)
+
+    def _getProxyClass(self):
+        from zope.proxy import ProxyBase
+        return ProxyBase
+
+    def _getProxiedObject(self, proxy):
+        from zope.proxy import getProxiedObject
+        return getProxiedObject(proxy)
+
+    def test_lazy_proxy(self):
+        from zope.proxy import LazyProxyBase
+        self._register(LazyProxyBase,
+                       lambda proxy: (list, (list(proxy),)))
+        self.assertEqual(pickle.loads(pickle.dumps(LazyProxyBase(list))), [])
+
+    def test_wrong_number_of_arguments(self):
+        self.assertRaises(TypeError, self._callFUT, self._getProxyClass())
+
+
+class Test_py_stats(unittest.TestCase):
+
+    # Whether counting is switched on by replacing methods.
+    replaces_methods = True
+
+    def _getFUTs(self):
+        from zope.proxy import py_disableStats
+        from zope.proxy import py_enableStats
+        from zope.proxy import py_getStats
+        from zope.proxy import py_resetStats
+        return py_enableStats, py_disableStats, py_getStats, py_resetStats
+
+    def _getProxyClass(self):
+        from zope.proxy import PyProxyBase
+        return PyProxyBase
+
+    def setUp(self):
+        enable, disable, get, reset = self._getFUTs()
+        self.getStats = get
+        reset()
+        self.addCleanup(reset)
+        self.addCleanup(disable)
+
+    def _enable(self):
+        self._getFUTs()[0]()
+
+    def _disable(self):
+        self._getFUTs()[1]()
+
+    def test_not_counting_by_default(self):
+        proxy = self._getProxyClass()([1])
+        len(proxy)
+        self.assertEqual(self.getStats(), {})
+
+    def test_counts_per_type(self):
+        class Proxy(self._getProxyClass()):
+            pass
+        base = self._getProxyClass()([1, 2])
+        sub = Proxy(1)
+        self._enable()
+        len(base)
+        base[0]
+        base.append
+        for x in base:
+            pass
+        sub < 2
+        hash(sub)
+        self.assertEqual(self.getStats(), {
+            self._getProxyClass(): {
+                'len': 1, 'getitem': 1, 'getattro': 1, 'iter': 1},
+            Proxy: {'richcompare': 1, 'hash': 1},
+        })
+
+    def test_setattro_and_call(self):
+        class Object:
+            pass
+        proxy = self._getProxyClass()(Object())
+        func = self._getProxyClass()(len)
+        self._enable()
+        proxy.attr = 1
+        del proxy.attr
+        func([])
+        func([1])
+        stats = self.getStats()
+        self.assertEqual(stats[self._getProxyClass()],
+                         {'setattro': 2, 'call': 2})
+
+    def test_numeric_ops_count_the_proxy(self):
+        proxy = self._getProxyClass()(2)
+        self._enable()
+        proxy + 1
+        1 + proxy
+        -proxy
+        pow(proxy, 2)
+        pow(2, proxy)
+        target = proxy
+        target += 1
+        self.assertEqual(self.getStats(), {
+            self._getProxyClass(): {'add': 2, 'neg': 1, 'pow': 2, 'iadd': 1},
+        })
+
+    def test_async_slots(self):
+        async def agen():
+            yield 1
+
+        proxy = self._getProxyClass()(agen())
+        self._enable()
+        aiter(proxy)
+        anext(proxy).close()
+        self.assertEqual(self.getStats(), {
+            self._getProxyClass(): {'aiter': 1, 'anext': 1},
+        })
+
+    def test_disable_keeps_counts(self):
+        proxy = self._getProxyClass()([1])
+        self._enable()
+        len(proxy)
+        self._disable()
+        len(proxy)
+        self.assertEqual(self.getStats(),
+                         {self._getProxyClass(): {'len': 1}})
+
+    def test_enable_twice(self):
+        proxy = self._getProxyClass()([1])
+        self._enable()
+        self._enable()
+        len(proxy)
+        self.assertEqual(self.getStats(),
+                         {self._getProxyClass(): {'len': 1}})
+
+    def test_reset(self):
+        proxy = self._getProxyClass()([1])
+        self._enable()
+        len(proxy)
+        self._getFUTs()[3]()
+        self.assertEqual(self.getStats(), {})
+        len(proxy)
+        self.assertEqual(self.getStats(),
+                         {self._getProxyClass(): {'len': 1}})
+
+    def test_snapshot_is_a_copy(self):
+        proxy = self._getProxyClass()([1])
+        self._enable()
+        len(proxy)
+        stats = self.getStats()
+        len(proxy)
+        self.assertEqual(stats, {self._getProxyClass(): {'len': 1}})
+
+    def test_disable_restores_methods(self):
+        from zope.proxy import AbstractPyProxyBase
+        if not self.replaces_methods:
+            self.skipTest('counting is switched on by a flag')
+        methods = dict(AbstractPyProxyBase.__dict__)
+        self._enable()
+        self.assertIsNot(AbstractPyProxyBase.__dict__['__len__'],
+                         methods['__len__'])
+        self._disable()
+        self.assertEqual(dict(AbstractPyProxyBase.__dict__), methods)
+
+    def test_disable_restores_forwarding(self):
+        import zope.proxy
+        if not self.replaces_methods:
+            self.skipTest('timing is switched on by a flag')
+        methods = dict(zope.proxy.AbstractPyProxyBase.__dict__)
+        self._getFUTs()[0](timing=True)
+        self.assertIsNot(zope.proxy._forward_getattr, getattr)
+        self._disable()
+        self.assertIs(zope.proxy._forward_getattr, getattr)
+        self.assertIs(zope.proxy._forward_setattr, setattr)
+        self.assertIs(zope.proxy._forward_delattr, delattr)
+        self.assertEqual(dict(zope.proxy.AbstractPyProxyBase.__dict__),
+                         methods)
+
+    def _getTimings(self):
+        from zope.proxy import py_getTimings
+        return py_getTimings()
+
+    def test_not_timing_by_default(self):
+        class Object:
+            pass
+        proxy = self._getProxyClass()(Object())
+        self._enable()
+        proxy.attr = 1
+        proxy.attr
+        self.assertEqual(self._getTimings(), {})
+
+    def test_timing_separates_wrapped_time(self):
+        import time
+
+        class Object:
+            @property
+            def slow(self):
+                time.sleep(0.002)
+                return 1
+
+        class Proxy(self._getProxyClass()):
+            @property
+            def own(self):
+                time.sleep(0.001)
+                return 2
+
+        proxy = Proxy(Object())
+        self._getFUTs()[0](timing=True)
+        self.assertEqual(proxy.slow, 1)
+        timings = self._getTimings()
+        elapsed, in_wrapped = timings[Proxy]['getattro']
+        self.assertGreaterEqual(in_wrapped, 2000000)
+        self.assertGreaterEqual(elapsed, in_wrapped)
+        self.assertEqual(proxy.own, 2)
+        elapsed, in_wrapped = self._getTimings()[Proxy]['getattro']
+        self.assertGreaterEqual(elapsed - in_wrapped, 1000000)
+        self.assertEqual(self.getStats(), {Proxy: {'getattro': 2}})
+
+    def test_timing_setattro_and_call(self):
+        import time
+
+        class Object:
+            pass
+
+        proxy = self._getProxyClass()(Object())
+        func = self._getProxyClass()(time.sleep)
+        self._getFUTs()[0](timing=True)
+        proxy.attr = 1
+        del proxy.attr
+        func(0.001)
+        timings = self._getTimings()[self._getProxyClass()]
+        self.assertEqual(sorted(timings), ['call', 'setattro'])
+        elapsed, in_wrapped = timings['call']
+        self.assertGreaterEqual(in_wrapped, 1000000)
+        self.assertGreaterEqual(elapsed, in_wrapped)
+
+    def test_timing_keeps_exceptions(self):
+        class Object:
+            @property
+            def broken(self):
+                raise ValueError()
+
+        proxy = self._getProxyClass()(Object())
+        self._getFUTs()[0](timing=True)
+        self.assertRaises(ValueError, getattr, proxy, 'broken')
+        self.assertIn('getattro', self._getTimings()[self._getProxyClass()])
+
+    def test_timing_nested_proxies(self):
+        import time
+
+        class Object:
+            @property
+            def slow(self):
+                time.sleep(0.001)
+                return 1
+
+        class Outer(self._getProxyClass()):
+            pass
+
+        inner = self._getProxyClass()(Object())
+        outer = Outer(inner)
+        self._getFUTs()[0](timing=True)
+        self.assertEqual(outer.slow, 1)
+        timings = self._getTimings()
+        inner_elapsed = timings[self._getProxyClass()]['getattro'][0]
+        self.assertGreaterEqual(inner_elapsed, 1000000)
+        self.assertGreaterEqual(timings[Outer]['getattro'][1],
+                                inner_elapsed)
+
+    def test_disable_stops_timing(self):
+        proxy = self._getProxyClass()([1])
+        self._getFUTs()[0](timing=True)
+        proxy.append
+        timings = self._getTimings()
+        self._disable()
+        proxy.append
+        self._enable()
+        proxy.append
+        self.assertEqual(self._getTimings(), timings)
+
+    def test_reset_discards_timings(self):
+        proxy = self._getProxyClass()([1])
+        self._getFUTs()[0](timing=True)
+        proxy.append
+        self._getFUTs()[3]()
+        self.assertEqual(self._getTimings(), {})
+
+    def test_getOverhead(self):
+        from zope.proxy import getOverhead
+        proxy = self._getProxyClass()([1])
+        self._getFUTs()[0](timing=True)
+        proxy.append
+        timings = self._getTimings()
+        elapsed, in_wrapped = timings[self._getProxyClass()]['getattro']
+        self.assertEqual(getOverhead(timings), {
+            self._getProxyClass(): (elapsed - in_wrapped, in_wrapped),
+        })
+        self.assertEqual(getOverhead({
+            int: {'getattro': (5, 2), 'call': (10, 7)},
+        }), {int: (6, 9)})
+
+    def _getAttributeSamples(self):
+        from zope.proxy import py_getAttributeSamples
+        return py_getAttributeSamples()
+
+    def test_no_samples_by_default(self):
+        proxy = self._getProxyClass()([1])
+        self._enable()
+        proxy.append
+        self.assertEqual(self._getAttributeSamples(), {})
+
+    def test_negative_sample_interval(self):
+        self.assertRaises(ValueError, self._getFUTs()[0], -1)
+        self.assertEqual(self.getStats(), {})
+
+    def test_samples_every_nth_access(self):
+        proxy = self._getProxyClass()([1])
+        self._getFUTs()[0](sample_interval=3)
+        for i in range(7):
+            proxy.append
+        self.assertRaises(AttributeError, getattr, proxy, 'nonesuch')
+        self.assertEqual(self._getAttributeSamples(), {
+            (self._getProxyClass(), 'append', 'wrapped'): 3,
+        })
+
+    def test_sample_resolution(self):
+        class Object:
+            def shared(self):
+                raise AssertionError('not called')
+
+        class Proxy(self._getProxyClass()):
+            def method(self):
+                raise AssertionError('not called')
+
+            def shared(self):
+                raise AssertionError('not called')
+
+            @property
+            def prop(self):
+                return 1
+
+        proxy = Proxy(Object())
+        self._getFUTs()[0](sample_interval=1)
+        proxy.method
+        proxy.shared
+        proxy.prop
+        proxy.__class__
+        self.assertEqual(self._getAttributeSamples(), {
+            (Proxy, 'method', 'proxy'): 1,
+            (Proxy, 'shared', 'wrapped'): 1,
+            (Proxy, 'prop', 'proxy'): 1,
+            (Proxy, '__class__', 'wrapped'): 1,
+        })
+
+    def test_samples_are_bounded(self):
+        class Object:
+            def __getattr__(self, name):
+                return name
+
+        proxy = self._getProxyClass()(Object())
+        self._getFUTs()[0](sample_interval=1)
+        for i in range(1100):
+            getattr(proxy, 'attr%d' % i)
+        proxy.attr0
+        samples = self._getAttributeSamples()
+        self.assertEqual(len(samples), 1024)
+        self.assertEqual(
+            samples[self._getProxyClass(), 'attr0', 'wrapped'], 2)
+
+    def test_reset_discards_samples(self):
+        proxy = self._getProxyClass()([1])
+        self._getFUTs()[0](sample_interval=2)
+        proxy.append
+        proxy.append
+        self._getFUTs()[3]()
+        self.assertEqual(self._getAttributeSamples(), {})
+        proxy.append
+        self.assertEqual(self._getAttributeSamples(), {
+            (self._getProxyClass(), 'append', 'wrapped'): 1,
+        })
+
+
+class Test_stats(Test_py_stats):
+
+    replaces_methods = False
+
+    def _getFUTs(self):
+        from zope.proxy import disableStats
+        from zope.proxy import enableStats
+        from zope.proxy import getStats
+        from zope.proxy import resetStats
+        return enableStats, disableStats, getStats, resetStats
+
+    def _getAttributeSamples(self):
+        from zope.proxy import getAttributeSamples
+        return getAttributeSamples()
+
+    def _getTimings(self):
+        from zope.proxy import getTimings
+        return getTimings()
+
+    def _getProxyClass(self):
+        from zope.proxy import ProxyBase
+        return ProxyBase
+
+    def test_lazy_proxy(self):
+        from zope.proxy import LazyProxyBase
+        proxy = LazyProxyBase(lambda: [1])
+        self._enable()
+        len(proxy)
+        self.assertEqual(self.getStats(), {LazyProxyBase: {'len': 1}})
+
+    @unittest.skipUnless(_c_available, 'C extension not available')
+    def test_sequence_slots(self):
+        import operator
+        proxy = self._getProxyClass()([1, 2])
+        self._enable()
+        _sequence_api('GetItem')(proxy, 0)
+        _sequence_api('SetItem')(proxy, 0, 1)
+        _sequence_api('DelItem')(proxy, 1)
+        _sequence_api('Repeat')(proxy, 2)
+        _sequence_api('InPlaceRepeat')(proxy, 1)
+        operator.concat(proxy, [3])
+        operator.iconcat(proxy, [3])
+        stats = self.getStats()[self._getProxyClass()]
+        # ctypes looks attributes of the arguments up.
+        stats.pop('getattro', None)
+        self.assertEqual(stats, {
+            'item': 1, 'ass_item': 2, 'repeat': 1, 'irepeat': 1,
+            'concat': 1, 'iconcat': 1})
+
+    @unittest.skipUnless(_c_available, 'C extension not available')
+    def test_buffer(self):
+        from zope.proxy import BufferProxyBase
+        proxy = BufferProxyBase(b'abc')
+        self._enable()
+        memoryview(proxy).release()
+        self.assertEqual(self.getStats(),
+                         {BufferProxyBase: {'getbuffer': 1}})
+
+
 class Test_ProxyIterator(unittest.TestCase):
 
     def _callFUT(self, *args):
@@ -1442,6 +3231,21 @@ class TestEmptyInterfaceDescriptor(unittest.TestCase):
         self.assertEqual([], list(feature))
 
 
+class MatMul:
+
+    def __init__(self, value):
+        self.value = value
+
+    def __matmul__(self, other):
+        return MatMul(self.value * other)
+
+    __rmatmul__ = __matmul__
+
+    def __imatmul__(self, other):
+        self.value *= other
+        return self
+
+
 class Comparable:
     def __init__(self, value):
         self.value = value